@@ -1,19 +1,14 @@
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Count, Sum, Q
-from django.db.models.functions import TruncWeek
-from django.http import JsonResponse
+from django.utils import timezone
 from datetime import date, timedelta
-import json
-from datetime import date, timedelta
-import json
 
 from .models import Employee
 from candidates.models import Application
-from candidates.models import Application as CandidateApplication
-from jobs.models import JobPosting
+from candidates import analytics
+from candidates.analytics_cache import cached_analytics
 from .serializers import EmployeeSerializer
 
 
@@ -30,26 +25,27 @@ def employees_list(request):
 # 📌 ANALYTICS OVERVIEW
 # ===========================
 @api_view(["GET"])
+@cached_analytics("analytics_overview")
 def analytics_overview(request):
-    total_apps = CandidateApplication.objects.count()
-    hired = CandidateApplication.objects.filter(status__in=["OFFER", "HIRED"]).count()
-    rejected = CandidateApplication.objects.filter(status="REJECTED").count()
+    summary = analytics.summary_counts(analytics.stats_queryset())
+    total_apps = summary["total"]
+    hired = summary["offer_or_hired"]
+    month_start = timezone.localdate().replace(day=1)
+    hired_this_month = analytics.entered_count(analytics.transitions_queryset(), analytics.HIRED_STATUSES, month_start)
     
     # Job Stats
-    total_jobs = JobPosting.objects.count()
-    active_jobs = JobPosting.objects.filter(is_active=True).count()
+    total_jobs, active_jobs = analytics.job_counts()
 
     # 'calls' not yet available in new model, setting to 0 or legacy
     total_calls = 0 
-    conversion = round((hired / total_apps * 100), 1) if total_apps else 0
 
     return Response({
         "total_applications": total_apps,
         "total_hired": hired,
-        "rejected_count": rejected,
-        "hired_this_month": hired, # Keep for backward compatibility
+        "rejected_count": summary["rejected"],
+        "hired_this_month": hired_this_month,
         "total_calls_today": total_calls,
-        "conversion_rate": conversion,
+        "conversion_rate": analytics.percentage(hired, total_apps),
         "total_jobs": total_jobs,
         "active_jobs": active_jobs,
     })
@@ -59,89 +55,62 @@ def analytics_overview(request):
 # 📌 WEEKLY TREND (LAST 4 WEEKS)
 # ===========================
 @api_view(["GET"])
+@cached_analytics("weekly_trend")
 def weekly_trend(request):
-    today = date.today()
-    start = today - timedelta(days=28)
-
-    qs = (
-        CandidateApplication.objects
-        .filter(applied_at__gte=start)
-        .annotate(week=TruncWeek("applied_at"))
-        .values("week")
-        .annotate(
-            count=Count("id"),
-            hired=Count("id", filter=Q(status="OFFER") | Q(status="HIRED"))
-        )
-        .order_by("week")
-    )
-
-    result = []
-    for i in range(4):
-        week_start = start + timedelta(days=7 * i)
-
-        match = next((x for x in qs if x["week"].date() == week_start), None)
+    # The 4 calendar weeks (Monday-based) ending with the current one
+    first_week = timezone.localdate() - timedelta(weeks=3)
+    weeks = analytics.weekly_counts(analytics.stats_queryset(), first_week, 4)
 
-        result.append({
+    return Response([
+        {
             "week": f"Week {i + 1}",
-            "applications": match["count"] if match else 0,
-            "hired": match["hired"] if match else 0
-        })
-
-    return Response(result)
+            "applications": total,
+            "hired": hired
+        }
+        for i, (_, total, hired) in enumerate(weeks)
+    ])
 
 
 # ===========================
 # 📌 PIPELINE STATUS DISTRIBUTION
 # ===========================
 @api_view(["GET"])
+@cached_analytics("pipeline_distribution")
 def pipeline_distribution(request):
-    qs = CandidateApplication.objects.values("status").annotate(count=Count("id"))
-    return Response({item["status"]: item["count"] for item in qs})
+    rows = analytics.counts_by(analytics.stats_queryset(), "status")
+    return Response({item["status"]: item["count"] for item in rows})
 
 
 # ===========================
 # 📌 DAILY APPLICATION COUNT (LAST 7 DAYS)
 # ===========================
 @api_view(["GET"])
+@cached_analytics("daily_applications")
 def daily_applications(request):
-    today = date.today()
-    output = []
+    first_day = timezone.localdate() - timedelta(days=6)
+    days = analytics.daily_counts(analytics.stats_queryset(), first_day, 7)
 
-    for i in range(6, -1, -1):
-        d = today - timedelta(days=i)
-        count = CandidateApplication.objects.filter(applied_at__date=d).count()
-        output.append({
+    return Response([
+        {
             "day": d.strftime("%a"),
             "count": count
-        })
-
-    return Response(output)
+        }
+        for d, count in days
+    ])
 
 
 # ===========================
 # 📌 PLATFORM PERFORMANCE (LinkedIn / Indeed / Website etc.)
 # ===========================
 @api_view(["GET"])
+@cached_analytics("platform_performance")
 def platform_performance(request):
-    qs = (
-        CandidateApplication.objects
-        .values("platform")
-        .annotate(
-            count=Count("id"),
-            hired=Count("id", filter=Q(status="OFFER") | Q(status="HIRED"))
-        )
-    )
-
     result = []
-    for x in qs:
-        count = x["count"] or 0
-        hired = x["hired"] or 0
-        conversion = round((hired / count) * 100, 1) if count > 0 else 0
-
+    for x in analytics.platform_counts(analytics.stats_queryset()):
         result.append({
             "platform": x["platform"] or "Unknown",
-            "count": count,
-            "conversion": conversion,
+            "count": x["count"],
+            "conversion": analytics.percentage(x["hired"], x["count"]),
         })
 
     return Response(result)
@@ -151,47 +120,24 @@ def platform_performance(request):
 # 📌 HR TEAM PERFORMANCE
 # ===========================
 @api_view(["GET"])
+@cached_analytics("hr_team_performance")
 def hr_team_performance(request):
-    # Using CandidateApplication linked to JobPosting -> Recruiter (Employee)
-    queryset = (
-        CandidateApplication.objects
-        .values(
-            "job__recruiter__id",
-            "job__recruiter__first_name",
-            "job__recruiter__last_name",
-            "job__recruiter__email"
-        )
-        .annotate(
-            shortlisted=Count("id", filter=Q(status__in=["INTERVIEW", "SCREENED"])),
-            rejected=Count("id", filter=Q(status="REJECTED")),
-            hired=Count("id", filter=Q(status__in=["OFFER", "HIRED"])),
-        )
-    )
-
+    # Applications linked to JobPosting -> Recruiter (Employee)
     result = []
-    for row in queryset:
+    for row in analytics.recruiter_counts(analytics.stats_queryset()):
         # Avoid division by zero
         total_decisions = row["shortlisted"] + row["rejected"] + row["hired"]
-        total = total_decisions if total_decisions > 0 else 1
-        
-        conversion = round((row["hired"] / total) * 100, 1)
-
-        first_name = row['job__recruiter__first_name'] or ''
-        last_name = row['job__recruiter__last_name'] or ''
-        name = f"{first_name} {last_name}".strip()
-        
-        if not name:
-            name = row['job__recruiter__email'] or "Unknown Recruiter"
 
         result.append({
             "hr_id": row["job__recruiter__id"],
-            "name": name,
+            # Employee model only has email
+            "name": row["job__recruiter__email"] or "Unknown Recruiter",
             "email": row["job__recruiter__email"],
             "calls_today": 0, # Metric not currently tracked
             "shortlisted": row["shortlisted"],
             "rejected": row["rejected"],
             "hired": row["hired"],
-            "conversion": conversion,
+            "conversion": analytics.percentage(row["hired"], total_decisions or 1),
         })
 
     return Response(result)
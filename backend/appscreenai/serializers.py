@@ -1,10 +1,11 @@
 from rest_framework import serializers
-from .models import Employee, Application
+from .models import Employee
+from candidates.models import Application
 
 class EmployeeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
-        fields = ["id","email","first_name","last_name"]
+        fields = ["id","email","is_admin"]
 
 class ApplicationSerializer(serializers.ModelSerializer):
     class Meta:
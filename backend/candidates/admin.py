@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Candidate, Application
+from .models import Candidate, Application, ParseJob, ParsedResume, ParsedWorkExperience, RescoreTask, Skill
 
 @admin.register(Candidate)
 class CandidateAdmin(admin.ModelAdmin):
@@ -11,3 +11,29 @@ class ApplicationAdmin(admin.ModelAdmin):
     list_display = ('candidate', 'job', 'status', 'applied_at')
     list_filter = ('status', 'job')
     search_fields = ('candidate__name', 'candidate__email', 'job__title')
+
+@admin.register(ParseJob)
+class ParseJobAdmin(admin.ModelAdmin):
+    list_display = ('application', 'status', 'attempts', 'run_after', 'finished_at')
+    list_filter = ('status', 'batchable')
+
+@admin.register(RescoreTask)
+class RescoreTaskAdmin(admin.ModelAdmin):
+    list_display = ('job', 'first_application_id', 'last_application_id', 'status', 'attempts', 'finished_at')
+    list_filter = ('status',)
+
+class ParsedWorkExperienceInline(admin.TabularInline):
+    model = ParsedWorkExperience
+    extra = 0
+
+@admin.register(ParsedResume)
+class ParsedResumeAdmin(admin.ModelAdmin):
+    list_display = ('application', 'candidate_name', 'total_years_experience', 'extraction_tier', 'parsed_at')
+    list_filter = ('extraction_tier',)
+    search_fields = ('candidate_name', 'email')
+    inlines = [ParsedWorkExperienceInline]
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('display_name', 'name')
+    search_fields = ('name', 'display_name')
@@ -0,0 +1,183 @@
+"""
+Shared aggregations behind the dashboard and analytics endpoints.
+
+Counts read the ApplicationDailyStat rollup (see candidates/rollup.py); "when did it
+happen" numbers (hires per month, funnel, time in stage) read the status history
+(ApplicationStatusTransition, see candidates/history.py) by (to_status, changed_at).
+Each function computes one response section with a single query, using conditional
+aggregates (Sum(..., filter=Q(...))) instead of one count() per number. Days or weeks
+with no applications are filled in from a dict, so a response costs a fixed number
+of queries whatever the range or the data.
+"""
+import datetime
+
+from django.db.models import Avg, Count, F, Q, Sum
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from jobs.models import JobPosting
+from .models import Application, ApplicationDailyStat, ApplicationStatusTransition
+
+HIRED_STATUSES = ['OFFER', 'HIRED']
+SHORTLISTED_STATUSES = ['INTERVIEW', 'SCREENED']
+
+
+def rollup_sum(condition=None):
+    """Number of applications in a group of ApplicationDailyStat rows (0, never None)."""
+    return Coalesce(Sum('applications', filter=condition), 0)
+
+
+def percentage(part, whole):
+    return round(part / whole * 100, 1) if whole > 0 else 0
+
+
+def stats_queryset(recruiter_id=None):
+    stats = ApplicationDailyStat.objects.filter(applications__gt=0)
+    if recruiter_id:
+        stats = stats.filter(job__recruiter_id=recruiter_id)
+    return stats
+
+
+def summary_counts(stats, today=None):
+    """Totals by current status plus today's applications, in one query."""
+    today = today or timezone.localdate()
+    return stats.aggregate(
+        total=rollup_sum(),
+        hired=rollup_sum(Q(status='HIRED')),
+        offer_or_hired=rollup_sum(Q(status__in=HIRED_STATUSES)),
+        rejected=rollup_sum(Q(status='REJECTED')),
+        today=rollup_sum(Q(day=today)),
+    )
+
+
+def job_counts():
+    """(total jobs, active jobs) in one query."""
+    counts = JobPosting.objects.aggregate(total=Count('id'), active=Count('id', filter=Q(is_active=True)))
+    return counts['total'], counts['active']
+
+
+def counts_by(stats, field):
+    """[{field: value, 'count': n}] for each value of a rollup field."""
+    return list(stats.values(field).annotate(count=rollup_sum()).order_by())
+
+
+def platform_counts(stats):
+    """[{'platform', 'count', 'hired'}] per platform."""
+    return list(
+        stats.values('platform')
+        .annotate(count=rollup_sum(), hired=rollup_sum(Q(status__in=HIRED_STATUSES)))
+        .order_by()
+    )
+
+
+def recruiter_counts(stats):
+    """Shortlisted/rejected/hired per recruiter (job__recruiter), one row per recruiter."""
+    return list(
+        stats.values('job__recruiter__id', 'job__recruiter__email')
+        .annotate(
+            shortlisted=rollup_sum(Q(status__in=SHORTLISTED_STATUSES)),
+            rejected=rollup_sum(Q(status='REJECTED')),
+            hired=rollup_sum(Q(status__in=HIRED_STATUSES)),
+        )
+        .order_by()
+    )
+
+
+def daily_counts(stats, first_day, days):
+    """[(date, count)] for `days` consecutive days from first_day, zero-filled."""
+    rows = (
+        stats.filter(day__gte=first_day, day__lt=first_day + datetime.timedelta(days=days))
+        .values('day').annotate(count=rollup_sum()).order_by()
+    )
+    by_day = {row['day']: row['count'] for row in rows}
+    return [
+        (day, by_day.get(day, 0))
+        for day in (first_day + datetime.timedelta(days=i) for i in range(days))
+    ]
+
+
+PERIODS = {
+    'day': F('day'),
+    'week': TruncWeek('day'),
+    'month': TruncMonth('day'),
+}
+
+
+def trend(stats, start, period):
+    """[{'period', 'total', 'hired'}] per day/week/month since start, oldest first (periods with data only)."""
+    return list(
+        stats.filter(day__gte=start)
+        .annotate(period=PERIODS[period]).values('period')
+        .annotate(total=rollup_sum(), hired=rollup_sum(Q(status__in=HIRED_STATUSES)))
+        .order_by('period')
+    )
+
+
+def weekly_counts(stats, first_week, weeks):
+    """[(week start, total, hired)] for `weeks` consecutive weeks from first_week's Monday, zero-filled."""
+    monday = first_week - datetime.timedelta(days=first_week.weekday())
+    by_week = {row['period']: row for row in trend(stats, monday, 'week')}
+    result = []
+    for i in range(weeks):
+        week = monday + datetime.timedelta(weeks=i)
+        row = by_week.get(week, {'total': 0, 'hired': 0})
+        result.append((week, row['total'], row['hired']))
+    return result
+
+
+# ------------ STATUS HISTORY ------------
+def day_start(day):
+    """Aware midnight for a date, so changed_at filters are plain index ranges."""
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+# Listing every status lets changed_at ranges use the (to_status, changed_at) index
+ALL_STATUSES = [status for status, _ in Application.STATUS_CHOICES]
+
+
+def transitions_queryset(recruiter_id=None):
+    transitions = ApplicationStatusTransition.objects.all()
+    if recruiter_id:
+        transitions = transitions.filter(job__recruiter_id=recruiter_id)
+    return transitions
+
+
+def entered_count(transitions, statuses, since):
+    """Applications that moved into one of statuses since the given date (e.g. hired this month)."""
+    return transitions.filter(to_status__in=statuses, changed_at__gte=day_start(since)).aggregate(
+        n=Count('application', distinct=True),
+    )['n']
+
+
+def funnel(transitions, since):
+    """[{'status', 'applications'}] reaching each status since the given date, in pipeline order."""
+    rows = (
+        transitions.filter(to_status__in=ALL_STATUSES, changed_at__gte=day_start(since))
+        .values('to_status').annotate(applications=Count('application', distinct=True)).order_by()
+    )
+    by_status = {row['to_status']: row['applications'] for row in rows}
+    return [
+        {'status': status, 'applications': by_status.get(status, 0)}
+        for status in ALL_STATUSES
+    ]
+
+
+def stage_velocity(transitions, since):
+    """[{'status', 'transitions', 'avg_days'}]: average time spent in a status before leaving it since the given date."""
+    rows = (
+        transitions.filter(to_status__in=ALL_STATUSES, changed_at__gte=day_start(since),
+                           seconds_in_previous_status__isnull=False)
+        .exclude(from_status='')
+        .values('from_status')
+        .annotate(transitions=Count('id'), avg_seconds=Avg('seconds_in_previous_status'))
+        .order_by()
+    )
+    by_status = {row['from_status']: row for row in rows}
+    return [
+        {
+            'status': status,
+            'transitions': by_status[status]['transitions'],
+            'avg_days': round(by_status[status]['avg_seconds'] / 86400, 1),
+        }
+        for status in ALL_STATUSES if status in by_status
+    ]
@@ -0,0 +1,128 @@
+"""
+Response cache for the analytics/dashboard endpoints.
+
+Every write to an application, job or employee bumps one version number. A response is identified by (endpoint, version, employee, range, day),
+which is also its strong ETag. A client polling with If-None-Match therefore gets
+a 304 from a single cache read, and a miss is computed once per version and shared
+by every client with the same scope.
+
+The version lives in the Django cache when that cache is shared (REDIS_URL), and
+otherwise in the AnalyticsVersion row (ANALYTICS_VERSION_STORE): a per-process
+LocMem version would never see the writes made by the other processes. Cached
+responses may stay per process, since they are keyed by the version.
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpRequest
+from django.utils import timezone
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from appscreenai.models import Employee
+from jobs.models import JobPosting
+from .models import AnalyticsVersion, Application
+
+VERSION_KEY = 'analytics:version'
+
+
+def analytics_version():
+    if settings.ANALYTICS_VERSION_STORE == 'db':
+        version = AnalyticsVersion.objects.filter(pk=1).values_list('value', flat=True).first()
+        if version is None:
+            version = AnalyticsVersion.objects.get_or_create(pk=1, defaults={'value': time.time_ns()})[0].value
+        return version
+
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock, so a cache restart never reuses a version clients already hold
+        cache.add(VERSION_KEY, time.time_ns())
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_analytics():
+    if settings.ANALYTICS_VERSION_STORE == 'db':
+        # Other processes only see the bump once it commits, and bumping inside the
+        # transaction would hold the row lock against every other writer until then
+        transaction.on_commit(_bump_db_version)
+        return
+
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Not in the cache (expired/evicted): start a fresh version
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def _bump_db_version():
+    if not AnalyticsVersion.objects.filter(pk=1).update(value=F('value') + 1):
+        AnalyticsVersion.objects.get_or_create(pk=1, defaults={'value': time.time_ns()})
+
+
+def response_etag(endpoint, request):
+    scope = '|'.join([
+        endpoint,
+        str(analytics_version()),
+        request.headers.get('X-Employee-Id', ''),
+        request.query_params.get('range', '') if hasattr(request, 'query_params') else request.GET.get('range', ''),
+        # Day-relative numbers ("today", "this month") change at midnight without any write
+        timezone.localdate().isoformat(),
+    ])
+    return '"' + hashlib.sha256(scope.encode()).hexdigest()[:32] + '"'
+
+
+def cached_analytics(endpoint):
+    """
+    Caches a GET handler's 200 responses per (employee, range) until the next write,
+    and answers matching If-None-Match requests with 304 Not Modified.
+    Works on APIView methods and @api_view functions (place it under @api_view).
+    """
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            request = next(arg for arg in args if isinstance(arg, (Request, HttpRequest)))
+            etag = response_etag(endpoint, request)
+            headers = {
+                'ETag': etag,
+                # Let browsers keep the body but revalidate on every poll
+                'Cache-Control': 'private, no-cache',
+                'Vary': 'X-Employee-Id, Authorization',
+            }
+
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            cache_key = f'analytics:response:{etag}'
+            data = cache.get(cache_key)
+            if data is None:
+                response = handler(*args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                data = response.data
+                cache.set(cache_key, data, settings.ANALYTICS_CACHE_TIMEOUT)
+            return Response(data, headers=headers)
+        return wrapper
+    return decorator
+
+
+# ------------ INVALIDATION (connected in CandidatesConfig.ready) ------------
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=JobPosting)
+@receiver(post_delete, sender=JobPosting)
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def invalidate_on_write(sender, **kwargs):
+    invalidate_analytics()
+    # Again after commit: a request that read the old rows in between must not stay cached
+    transaction.on_commit(invalidate_analytics)
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CandidatesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'candidates'
+
+    def ready(self):
+        # Keeps the ApplicationDailyStat analytics rollup, the analytics response cache,
+        # the status history, the skill index, the stored match scores, the job embeddings and
+        # the dashboard push events in sync with writes
+        from . import analytics_cache, embeddings, events, history, rollup, scoring, skill_index  # noqa: F401
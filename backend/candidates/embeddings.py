@@ -0,0 +1,184 @@
+"""
+Offline text embeddings for semantic candidate retrieval.
+
+Keyword overlap (AIScreener, the skill index) misses a candidate who writes "k8s" for
+a job asking for Kubernetes, or "Postgres" for PostgreSQL. Each parsed resume and
+each JobPosting description gets one vector instead, stored as packed float32 bytes
+(ApplicationEmbedding / JobEmbedding); candidates/vector_index.py searches them.
+
+The embedder is pluggable through settings.EMBEDDING_BACKEND (dotted path to a class
+with `name`, `dimensions` and `embed(texts)` returning unit-length vectors). The
+default, HashedNgramEmbedder, needs no model download or network: words, word pairs
+and character trigrams are hashed into signed buckets, and skills found by the resume
+parser's taxonomy add a canonical feature, so synonyms land on the same dimensions.
+A small CPU sentence model can be dropped in the same way; vectors are tagged with
+the embedder's name, so `manage.py rebuild_embeddings` is needed after switching.
+"""
+import math
+import re
+import sys
+import zlib
+from array import array
+from collections import Counter
+
+from django.conf import settings
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from jobs.models import JobPosting
+from screenai.services.resume_parser.skills import get_skill_matcher
+from .models import ApplicationEmbedding, ApplicationSearchDocument, JobEmbedding
+
+MAX_TEXT_CHARS = 20000
+
+WORD_RE = re.compile(r"[\w#+]+(?:\.[\w#+]+)*")
+
+
+# ------------ EMBEDDERS ------------
+class HashedNgramEmbedder:
+    """
+    Signed feature hashing (the "hashing trick") with sublinear term frequency,
+    L2-normalised so a dot product is the cosine similarity.
+    """
+    SKILL_WEIGHT = 3.0
+    TRIGRAM_WEIGHT = 0.5
+
+    def __init__(self, dimensions=None):
+        self.dimensions = dimensions or settings.EMBEDDING_DIMENSIONS
+        self.name = f"hashed-ngram-{self.dimensions}"
+
+    def features(self, text):
+        """Counter of weighted features for a text."""
+        text = text[:MAX_TEXT_CHARS]
+        words = WORD_RE.findall(text.casefold())
+        features = Counter()
+        for word in words:
+            features['w:' + word] += 1
+            padded = f"<{word}>"
+            for start in range(len(padded) - 2):
+                features['c:' + padded[start:start + 3]] += self.TRIGRAM_WEIGHT
+        for first, second in zip(words, words[1:]):
+            features[f'b:{first} {second}'] += 1
+        for skill in get_skill_matcher().find_skills(text):
+            features['s:' + skill.casefold()] += self.SKILL_WEIGHT
+        return features
+
+    def embed_one(self, text):
+        vector = [0.0] * self.dimensions
+        for feature, count in self.features(text).items():
+            bucket = zlib.crc32(feature.encode())
+            sign = -1.0 if bucket & 0x80000000 else 1.0
+            weight = 1.0 + math.log(count) if count > 1 else count
+            vector[bucket % self.dimensions] += sign * weight
+        norm = math.sqrt(sum(value * value for value in vector))
+        return [value / norm for value in vector] if norm else vector
+
+    def embed(self, texts):
+        return [self.embed_one(text) for text in texts]
+
+
+_embedder = None
+
+
+def get_embedder():
+    """Process-wide embedder from settings.EMBEDDING_BACKEND."""
+    global _embedder
+    if _embedder is None:
+        _embedder = import_string(settings.EMBEDDING_BACKEND)()
+    return _embedder
+
+
+# ------------ STORAGE ------------
+def pack(vector):
+    """float32 little-endian bytes (4 bytes per dimension)."""
+    packed = array('f', vector)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack(data):
+    vector = array('f')
+    vector.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        vector.byteswap()
+    return vector
+
+
+def application_text(document):
+    """What a candidate's vector is computed from: the search document minus the name."""
+    return '\n'.join(part for part in (
+        document.skills, document.experience, document.education, document.body,
+    ) if part)
+
+
+def job_text(job):
+    return '\n'.join(str(part) for part in (
+        job.title,
+        ', '.join(str(skill) for skill in job.required_skills or []),
+        ', '.join(str(role) for role in job.previous_roles or []),
+        job.description,
+    ) if part)
+
+
+def embed_applications(documents):
+    """Computes and stores the vectors of ApplicationSearchDocuments (one embed() call)."""
+    documents = list(documents)
+    if not documents:
+        return 0
+    embedder = get_embedder()
+    vectors = embedder.embed([application_text(document) for document in documents])
+    ApplicationEmbedding.objects.bulk_create(
+        [
+            ApplicationEmbedding(application_id=document.application_id, model=embedder.name, vector=pack(vector))
+            for document, vector in zip(documents, vectors)
+        ],
+        update_conflicts=True,
+        unique_fields=['application'],
+        update_fields=['model', 'vector', 'updated_at'],
+    )
+    return len(documents)
+
+
+def embed_application(application):
+    """Refreshes one application's vector from its search document (written by search.index_application)."""
+    document = ApplicationSearchDocument.objects.filter(application=application).first()
+    return embed_applications([document] if document else [])
+
+
+def embed_job(job):
+    embedder = get_embedder()
+    vector = embedder.embed([job_text(job)])[0]
+    JobEmbedding.objects.update_or_create(job=job, defaults={'model': embedder.name, 'vector': pack(vector)})
+    return vector
+
+
+def job_vector(job):
+    """The job's stored vector, computed now if it is missing or from another embedder."""
+    stored = JobEmbedding.objects.filter(job=job, model=get_embedder().name).values_list('vector', flat=True).first()
+    return unpack(stored) if stored is not None else embed_job(job)
+
+
+# ------------ SIGNALS (connected in CandidatesConfig.ready) ------------
+JOB_TEXT_FIELDS = ('title', 'description', 'required_skills', 'previous_roles')
+
+
+def _job_text_fields(instance):
+    return tuple(instance.__dict__.get(field) for field in JOB_TEXT_FIELDS)
+
+
+@receiver(post_init, sender=JobPosting)
+def remember_job_text(sender, instance, **kwargs):
+    values = _job_text_fields(instance)
+    # Copies: the skill and role lists can be edited in place
+    instance._stored_job_text = tuple(list(value) if isinstance(value, list) else value for value in values)
+
+
+@receiver(post_save, sender=JobPosting)
+def embed_job_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw or 'description' not in instance.__dict__:
+        return
+    if created or _job_text_fields(instance) != instance._stored_job_text:
+        embed_job(instance)
+        remember_job_text(sender, instance)
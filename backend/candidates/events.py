@@ -0,0 +1,119 @@
+"""
+Dashboard push events.
+
+Writes the dashboard cares about append a DashboardEvent row once their transaction
+commits: an application was created, its status changed, or a background parse
+finished. DashboardEventStreamView tails the table by id for the connected recruiter
+and sends new rows as Server-Sent Events, so the web processes and `parse_worker`
+all publish through the database, without a message broker.
+
+Each open stream costs one indexed "id > last seen" query per poll interval, which
+replaces the full analytics request the dashboard used to make every 30 seconds.
+Old rows are removed with `manage.py prune_dashboard_events`.
+"""
+import asyncio
+import json
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+
+from jobs.models import JobPosting
+from .history import status_changed
+from .models import Application, DashboardEvent
+
+APPLICATION_CREATED = 'application.created'
+STATUS_CHANGED = 'application.status_changed'
+PARSE_FINISHED = 'parse.finished'
+
+
+def publish(kind, application_id, payload, recruiter_id=None):
+    """Appends an event once the current transaction commits (immediately in autocommit)."""
+    def create():
+        DashboardEvent.objects.create(
+            kind=kind,
+            recruiter_id=recruiter_id,
+            application_id=application_id,
+            payload=payload,
+        )
+    transaction.on_commit(create)
+
+
+def recruiters_for(job_ids, instance=None):
+    """{job_id: recruiter_id}, from the instance's loaded job when there is one."""
+    if instance is not None and Application.job.is_cached(instance):
+        return {instance.job_id: instance.job.recruiter_id}
+    return dict(JobPosting.objects.filter(pk__in=set(job_ids)).values_list('id', 'recruiter_id'))
+
+
+def parse_finished(job):
+    """Called by the parse queue when a job is DONE or has FAILED for good."""
+    recruiter_id = (
+        Application.objects.filter(pk=job.application_id)
+        .values_list('job__recruiter_id', flat=True).first()
+    )
+    publish(PARSE_FINISHED, job.application_id, {
+        'parse_job_id': job.id,
+        'status': job.status,
+        'error': job.last_error,
+    }, recruiter_id=recruiter_id)
+
+
+# ------------ SIGNALS (connected in CandidatesConfig.ready) ------------
+@receiver(status_changed, sender=Application)
+def publish_status_events(sender, changes, instance=None, **kwargs):
+    recruiters = recruiters_for([change.job_id for change in changes], instance)
+    for change in changes:
+        if not change.from_status:
+            publish(APPLICATION_CREATED, change.application_id, {
+                'job_id': change.job_id,
+                'status': change.to_status,
+                'platform': instance.platform if instance is not None else None,
+            }, recruiter_id=recruiters.get(change.job_id))
+        else:
+            publish(STATUS_CHANGED, change.application_id, {
+                'job_id': change.job_id,
+                'from': change.from_status,
+                'to': change.to_status,
+            }, recruiter_id=recruiters.get(change.job_id))
+
+
+# ------------ STREAM ------------
+def format_event(event):
+    data = dict(event.payload, application_id=event.application_id, created_at=event.created_at.isoformat())
+    return f"id: {event.id}\nevent: {event.kind}\ndata: {json.dumps(data)}\n\n"
+
+
+async def latest_event_id():
+    return await DashboardEvent.objects.order_by('-id').values_list('id', flat=True).afirst() or 0
+
+
+async def event_stream(scope, last_id, duration, retry_ms):
+    """
+    Yields SSE messages for events after last_id matching scope (queryset filter kwargs)
+    for `duration` seconds, then ends; EventSource reconnects after retry_ms with the
+    Last-Event-ID header, so nothing is lost between connections.
+    """
+    poll = settings.DASHBOARD_EVENTS_POLL_SECONDS
+    heartbeat = settings.DASHBOARD_EVENTS_HEARTBEAT_SECONDS
+    started = last_sent = time.monotonic()
+    # The id line sets the browser's Last-Event-ID even when no event follows, so a
+    # reconnect resumes here instead of at whatever is newest by then
+    yield f"retry: {retry_ms}\nid: {last_id}\n\n"
+
+    while True:
+        events = DashboardEvent.objects.filter(id__gt=last_id, **scope).order_by('id')[:100]
+        async for event in events:
+            yield format_event(event)
+            last_id = event.id
+            last_sent = time.monotonic()
+
+        now = time.monotonic()
+        if now - started >= duration:
+            return
+        if now - last_sent >= heartbeat:
+            # Comment line: keeps proxies from closing an idle connection
+            yield ": ping\n\n"
+            last_sent = now
+        await asyncio.sleep(poll)
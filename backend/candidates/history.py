@@ -0,0 +1,137 @@
+"""
+Application status history.
+
+Every status change appends an ApplicationStatusTransition row, so funnel, velocity
+and "hired this month" numbers are range queries on (to_status, changed_at) instead
+of guesses from applied_at. Model saves are caught by the signals below. Bulk
+QuerySet.update(status=...) calls go through ApplicationQuerySet.update ->
+bulk_status_update, which also moves the changed rows in the analytics rollup.
+
+Both paths send `status_changed` with the list of changes; the dashboard push
+events (candidates/events.py) listen to it.
+"""
+from collections import Counter, namedtuple
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.signals import post_init, post_save, pre_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from . import rollup
+from .analytics_cache import invalidate_analytics
+from .models import Application, ApplicationStatusTransition
+
+StatusChange = namedtuple('StatusChange', 'application_id job_id from_status to_status changed_at')
+
+# Sent with sender=Application, changes=[StatusChange, ...] and instance (None for bulk updates).
+# from_status is '' for a newly created application.
+status_changed = Signal()
+
+CHUNK_SIZE = 500
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def last_change_times(application_ids):
+    """{application_id: changed_at of its latest transition}"""
+    latest = {}
+    for chunk in _chunks(application_ids):
+        rows = (
+            ApplicationStatusTransition.objects.filter(application_id__in=chunk)
+            .values('application_id').annotate(last=Max('changed_at')).order_by()
+        )
+        latest.update((row['application_id'], row['last']) for row in rows)
+    return latest
+
+
+def record(changes, previous=None):
+    """Writes the transitions for a list of StatusChange. previous maps application_id -> last change time."""
+    previous = previous or {}
+    ApplicationStatusTransition.objects.bulk_create([
+        ApplicationStatusTransition(
+            application_id=change.application_id,
+            job_id=change.job_id,
+            from_status=change.from_status,
+            to_status=change.to_status,
+            changed_at=change.changed_at,
+            seconds_in_previous_status=(
+                int((change.changed_at - previous[change.application_id]).total_seconds())
+                if change.application_id in previous else None
+            ),
+        )
+        for change in changes
+    ], batch_size=1000)
+
+
+def bulk_status_update(queryset, values, update):
+    """
+    Runs queryset.update(**values) (through `update`, the unpatched QuerySet.update)
+    and records a transition for every row whose status actually changed.
+    """
+    fields = ('id',) + rollup.ROLLUP_FIELDS
+    with transaction.atomic(using=queryset.db):
+        before = {row['id']: row for row in queryset.select_for_update().values(*fields)}
+        count = update(**values)
+        if not before:
+            return count
+
+        now = timezone.now()
+        changes, deltas = [], Counter()
+        for chunk in _chunks(before):
+            for row in Application.objects.filter(pk__in=chunk).values(*fields):
+                old = before[row['id']]
+                old_key, new_key = rollup.rollup_key(old), rollup.rollup_key(row)
+                if old_key != new_key:
+                    deltas[old_key] -= 1
+                    deltas[new_key] += 1
+                if old['status'] != row['status']:
+                    changes.append(StatusChange(row['id'], row['job_id'], old['status'], row['status'], now))
+
+        rollup.apply_deltas(deltas)
+        if changes:
+            record(changes, last_change_times(change.application_id for change in changes))
+            status_changed.send(sender=Application, changes=changes, instance=None)
+    invalidate_analytics()
+    transaction.on_commit(invalidate_analytics)
+    return count
+
+
+# ------------ SIGNALS (connected in CandidatesConfig.ready) ------------
+@receiver(post_init, sender=Application)
+def remember_status(sender, instance, **kwargs):
+    # Raw attribute: reading a deferred status here would cost a query per row
+    instance._stored_status = instance.__dict__.get('status')
+
+
+@receiver(pre_save, sender=Application)
+def load_status(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or instance._stored_status is not None or instance.pk is None:
+        return
+    if 'status' not in instance.__dict__:
+        return
+    # Loaded with status deferred and then assigned: read what is stored before it changes
+    instance._stored_status = Application.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=Application)
+def record_status_change(sender, instance, created, raw=False, **kwargs):
+    new_status = instance.__dict__.get('status')
+    if raw or new_status is None:
+        return
+    old_status = '' if created else instance._stored_status
+    instance._stored_status = new_status
+    if old_status is None or old_status == new_status:
+        return
+
+    if created:
+        change = StatusChange(instance.pk, instance.job_id, '', new_status, instance.applied_at or timezone.now())
+        record([change])
+    else:
+        change = StatusChange(instance.pk, instance.job_id, old_status, new_status, timezone.now())
+        record([change], last_change_times([instance.pk]))
+    status_changed.send(sender=Application, changes=[change], instance=instance)
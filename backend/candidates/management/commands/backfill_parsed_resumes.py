@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from candidates.models import Application
+from candidates.parsing import save_parsed_resume
+
+
+class Command(BaseCommand):
+    help = 'Copies the parse results stored as JSON in Application.resume_text into ParsedResume rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Applications per transaction')
+        parser.add_argument('--all', action='store_true',
+                            help='Rebuild every row, not only applications without a ParsedResume')
+
+    def handle(self, *args, **kwargs):
+        chunk_size = max(1, kwargs['chunk_size'])
+        apps_query = Application.objects.filter(resume_text__isnull=False).exclude(resume_text='')
+        if not kwargs['all']:
+            apps_query = apps_query.filter(parsed_resume__isnull=True)
+
+        # Walk by primary key so each chunk is a cheap indexed range scan and
+        # rows committed by earlier chunks don't shift the window
+        last_id = 0
+        created = skipped = 0
+        while True:
+            chunk = list(
+                apps_query.filter(id__gt=last_id).order_by('id').only('id', 'resume_text')[:chunk_size]
+            )
+            if not chunk:
+                break
+            with transaction.atomic():
+                for application in chunk:
+                    try:
+                        parsed_data = json.loads(application.resume_text)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    if not isinstance(parsed_data, dict):
+                        skipped += 1
+                        continue
+                    save_parsed_resume(application, parsed_data)
+                    created += 1
+            last_id = chunk[-1].id
+            self.stdout.write(f'Processed up to App ID {last_id} ({created} saved, {skipped} skipped)')
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {created} parsed resume(s), skipped {skipped} unreadable.'))
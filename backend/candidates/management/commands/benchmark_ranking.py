@@ -0,0 +1,91 @@
+import random
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from candidates.models import Application, ApplicationSkill, Candidate, Experience
+from candidates.scoring import ENGINES, available_engine, rank_applications
+from candidates.skill_index import skill_ids, skill_keys
+from jobs.models import JobPosting
+
+SKILLS = [
+    'Python', 'Django', 'React', 'Kafka', 'PostgreSQL', 'Docker', 'Kubernetes', 'AWS',
+    'Go', 'Java', 'TypeScript', 'Redis', 'GraphQL', 'Terraform', 'Spark', 'Airflow',
+]
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark Industries']
+ROLES = ['Backend Engineer', 'Data Engineer', 'Frontend Developer', 'SRE', 'QA Engineer']
+
+
+class Command(BaseCommand):
+    help = 'Times rank_applications on a synthetic job with N applicants (created in a transaction that is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applicants', type=int, default=50000, help='Synthetic applications for the job')
+        parser.add_argument('--engine', action='append', choices=ENGINES,
+                            help='Scoring engine to time (repeatable, default: the fastest available)')
+        parser.add_argument('--repeat', type=int, default=5, help='Rankings per engine, median is reported')
+        parser.add_argument('--budget', type=float, default=1.0, help='Seconds a ranking should stay under')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **kwargs):
+        engines = kwargs['engine'] or [available_engine()]
+        if 'numpy' in engines and available_engine() != 'numpy':
+            raise CommandError("NumPy is not installed, use --engine python")
+
+        with transaction.atomic():
+            job = self.create_job(max(1, kwargs['applicants']), random.Random(kwargs['seed']))
+            for engine in engines:
+                runs = [rank_applications(job, limit=50, engine=engine) for _ in range(max(1, kwargs['repeat']))]
+                median = statistics.median(run.seconds for run in runs)
+                report = f"{engine}: ranked {runs[0].scored} applicant(s) in {median:.3f}s (median of {len(runs)})"
+                if median <= kwargs['budget']:
+                    self.stdout.write(self.style.SUCCESS(report))
+                else:
+                    self.stdout.write(self.style.WARNING(f"{report}, over the {kwargs['budget']}s budget"))
+            # Nothing the benchmark created is kept
+            transaction.set_rollback(True)
+
+    def create_job(self, count, rng):
+        job = JobPosting.objects.create(
+            title='Ranking benchmark', description='Synthetic', location='Remote',
+            required_skills=SKILLS[:6], previous_companies=COMPANIES[:2], previous_roles=ROLES[:2],
+            min_experience=4, expected_ctc_limit=25, notice_period_days=30,
+        )
+        self.stdout.write(f"Creating {count} synthetic application(s)...")
+
+        # bulk_create skips the model signals, so the skill links are written directly
+        candidates = Candidate.objects.bulk_create(
+            [Candidate(name=f'Benchmark {i}', email=f'benchmark-{i}@example.invalid') for i in range(count)],
+            batch_size=2000,
+        )
+        applications = Application.objects.bulk_create(
+            [
+                Application(
+                    job=job, candidate=candidate, resume='resumes/benchmark.pdf',
+                    skills=rng.sample(SKILLS, rng.randint(2, 8)),
+                    experience_years=rng.choice([None, *range(0, 15)]),
+                    expected_ctc=rng.choice([None, *range(5, 50)]),
+                    notice_period=rng.choice([None, 0, 15, 30, 60, 90]),
+                )
+                for candidate in candidates
+            ],
+            batch_size=2000,
+        )
+        ids = skill_ids(skill_keys(SKILLS), create=True)
+        ApplicationSkill.objects.bulk_create(
+            (
+                ApplicationSkill(application_id=application.id, skill_id=skill_id)
+                for application in applications
+                for skill_id in {ids[key] for key in skill_keys(application.skills)}
+            ),
+            batch_size=5000,
+        )
+        Experience.objects.bulk_create(
+            [
+                Experience(application=application, company=rng.choice(COMPANIES), role=rng.choice(ROLES))
+                for application in applications
+            ],
+            batch_size=2000,
+        )
+        return job
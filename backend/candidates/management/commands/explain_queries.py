@@ -0,0 +1,212 @@
+import datetime
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncWeek
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from candidates import analytics, rollup
+from candidates.models import Application, ApplicationDailyStat, ApplicationStatusTransition, Candidate
+from candidates.views import ApplicationListCreateView
+from jobs.models import JobPosting
+
+TABLE = Application._meta.db_table
+
+PLATFORMS = ['Website', 'LinkedIn', 'Indeed', 'Naukri', 'Referral']
+
+
+class Rollback(Exception):
+    pass
+
+
+def list_view_queryset(params):
+    """The page query ApplicationListCreateView runs for the given query params."""
+    view = ApplicationListCreateView()
+    view.request = Request(APIRequestFactory().get('/', params))
+    view.format_kwarg = None
+    pagination = view.pagination_class()
+    return view.get_queryset().order_by(*pagination.get_ordering(view.request))[:pagination.page_size + 1]
+
+
+# What counts as a failure for each kind of query:
+#   page      - full scan, or a sort of the filtered rows instead of reading them in index order
+#   filter    - full scan
+#   aggregate - nothing; whole-table aggregates read every row by definition
+#               (an index-only scan is the best case there)
+PAGE, FILTER, AGGREGATE = 'page', 'filter', 'aggregate'
+
+
+def main_queries():
+    """(name, queryset, kind) for the main ORM queries of the list, analytics and dashboard views."""
+    today = datetime.date.today()
+    stats = ApplicationDailyStat.objects.filter(applications__gt=0)
+    job = JobPosting.objects.order_by('id').values_list('id', 'recruiter_id').first() or (0, None)
+    transitions = ApplicationStatusTransition.objects.all()
+    month_start = analytics.day_start(today.replace(day=1))
+    return [
+        ('list: first page', list_view_queryset({}), PAGE),
+        ('list: job filter', list_view_queryset({'job': job[0]}), PAGE),
+        ('list: status filter', list_view_queryset({'status': 'INTERVIEW'}), PAGE),
+        ('list: platform filter', list_view_queryset({'platform': 'LinkedIn'}), PAGE),
+        ('list: job + status filter', list_view_queryset({'job': job[0], 'status': 'NEW'}), PAGE),
+        ('list: best match first', list_view_queryset({'ordering': '-match_score'}), PAGE),
+        ('list: job, best match first', list_view_queryset({'job': job[0], 'ordering': '-match_score'}), PAGE),
+        # Dashboard/analytics read the day x job x platform x status rollup
+        ('dashboard: today', stats.filter(day=today).values('id'), FILTER),
+        ('analytics: hired this month', stats.filter(
+            day__gte=today.replace(day=1), status__in=['OFFER', 'HIRED']).values('id'), FILTER),
+        ('analytics: trend', stats.filter(day__gte=today - datetime.timedelta(weeks=4))
+            .annotate(period=TruncWeek('day')).values('period')
+            .annotate(total=Sum('applications'), hired=Sum('applications', filter=Q(status__in=['OFFER', 'HIRED']))), FILTER),
+        ('analytics: daily', stats.filter(day__gte=today - datetime.timedelta(days=7))
+            .values('day').annotate(count=Sum('applications')), FILTER),
+        ('analytics: recruiter filter', stats.filter(job__recruiter_id=job[1]).values('id'), FILTER),
+        ('analytics: status totals', stats.values('status').annotate(count=Sum('applications')), AGGREGATE),
+        ('analytics: platform totals', stats.values('platform').annotate(count=Sum('applications')), AGGREGATE),
+        # Dated metrics read the status history by (to_status, changed_at)
+        ('history: hired this month', transitions.filter(
+            to_status__in=analytics.HIRED_STATUSES, changed_at__gte=month_start).values('application_id'), FILTER),
+        ('history: funnel', transitions.filter(
+            to_status__in=analytics.ALL_STATUSES, changed_at__gte=month_start).values('to_status', 'application_id'), FILTER),
+        ('history: job hires', transitions.filter(
+            job_id=job[0], to_status='HIRED', changed_at__gte=month_start).values('id'), FILTER),
+        ('analytics: recruiter totals', stats.values('job__recruiter__id').annotate(count=Sum('applications')), AGGREGATE),
+    ]
+
+
+def explain(queryset):
+    """Returns (plan lines, tables read with a full scan, whether rows are sorted after reading)."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            lines = [row[-1] for row in cursor.fetchall()]
+            # "SCAN t" is a full table scan; "SCAN t USING (COVERING) INDEX i" walks an index
+            full_scans = [line.split()[1] for line in lines
+                          if line.startswith('SCAN ') and ' INDEX ' not in line and len(line.split()) > 1]
+            return lines, full_scans, any('TEMP B-TREE FOR ORDER BY' in line for line in lines)
+
+        if connection.vendor == 'postgresql':
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            lines, full_scans, sorts = [], [], []
+
+            def walk(node, depth=0):
+                relation = node.get('Relation Name', '')
+                lines.append(f"{'  ' * depth}{node['Node Type']} {relation}".rstrip())
+                if node['Node Type'] == 'Seq Scan':
+                    full_scans.append(relation)
+                if node['Node Type'] == 'Sort':
+                    sorts.append(node)
+                for child in node.get('Plans', []):
+                    walk(child, depth + 1)
+
+            walk(plan[0]['Plan'])
+            return lines, full_scans, bool(sorts)
+
+    raise CommandError(f"EXPLAIN checks support SQLite and PostgreSQL, not {connection.vendor}")
+
+
+def seed(count, jobs=50):
+    """Bulk inserts count synthetic applications spread over the last year."""
+    rng = random.Random(42)
+    statuses = [choice for choice, _ in Application.STATUS_CHOICES]
+    job_ids = [
+        JobPosting.objects.create(title=f"Seed job {i}", location="Remote").id
+        for i in range(jobs)
+    ]
+    candidates = Candidate.objects.bulk_create(
+        [Candidate(name=f"Seed {i}", email=f"seed-{i}@explain.invalid") for i in range(count)],
+        batch_size=1000,
+    )
+    first_id = Application.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    Application.objects.bulk_create([
+        Application(
+            job_id=rng.choice(job_ids),
+            candidate=candidate,
+            resume='resumes/seed.pdf',
+            status=rng.choice(statuses),
+            platform=rng.choice(PLATFORMS),
+            match_score=round(rng.uniform(0, 100), 1),
+        )
+        for candidate in candidates
+    ], batch_size=1000)
+    # applied_at is auto_now_add, so spread the seeded dates afterwards
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f"UPDATE {TABLE} SET applied_at = datetime(applied_at, '-' || (abs(random()) %% 365) || ' days') "
+                f"WHERE id > %s", [first_id]
+            )
+        else:
+            cursor.execute(
+                f"UPDATE {TABLE} SET applied_at = applied_at - (random() * interval '365 days') WHERE id > %s",
+                [first_id],
+            )
+    # bulk_create and raw UPDATEs skip the rollup and status history signals
+    rollup.rebuild()
+    ApplicationStatusTransition.objects.bulk_create([
+        ApplicationStatusTransition(application_id=pk, job_id=job_id, to_status=status, changed_at=applied_at)
+        for pk, job_id, status, applied_at in Application.objects.filter(id__gt=first_id)
+        .values_list('id', 'job_id', 'status', 'applied_at').iterator()
+    ], batch_size=1000)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('ANALYZE')
+        else:
+            cursor.execute(f'ANALYZE {TABLE}')
+            cursor.execute(f'ANALYZE {ApplicationDailyStat._meta.db_table}')
+            cursor.execute(f'ANALYZE {ApplicationStatusTransition._meta.db_table}')
+
+
+class Command(BaseCommand):
+    help = 'EXPLAINs the main application queries and fails if one falls back to a full table scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=20000,
+                            help='Synthetic applications to insert first (rolled back afterwards, 0 = use current data)')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print every plan, not only failures')
+
+    def handle(self, *args, **kwargs):
+        failures = []
+        try:
+            with transaction.atomic():
+                if kwargs['seed']:
+                    self.stdout.write(f"Seeding {kwargs['seed']} applications (rolled back afterwards)...")
+                    seed(kwargs['seed'])
+                failures = self.check_queries(kwargs['verbose_plans'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"Full table scan or sort in: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('No full table scans in the checked queries.'))
+
+    def check_queries(self, verbose):
+        failures = []
+        for name, queryset, kind in main_queries():
+            lines, full_scans, sorted_rows = explain(queryset)
+            scanned = queryset.model._meta.db_table in full_scans
+            problem = None
+            if scanned and kind != AGGREGATE:
+                problem = 'FULL SCAN'
+            elif sorted_rows and kind == PAGE:
+                problem = 'SORTS ROWS'
+
+            if problem:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"{problem:<17}{name}"))
+            else:
+                label = 'scan (aggregate)' if scanned else 'ok'
+                self.stdout.write(f"{label:<17}{name}")
+            if verbose or problem:
+                for line in lines:
+                    self.stdout.write(f"    {line}")
+        return failures
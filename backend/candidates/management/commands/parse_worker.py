@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from candidates.parsing import claim_next_job, heartbeat_jobs, requeue_stale_jobs, run_parse_job, run_parse_jobs_batch
+
+
+class Command(BaseCommand):
+    help = 'Runs queued resume parse jobs with bounded concurrency and retries'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.PARSE_WORKER_CONCURRENCY,
+                            help='Maximum number of resumes parsed at the same time')
+        parser.add_argument('--backoff', type=int, default=settings.PARSE_JOB_BACKOFF_SECONDS,
+                            help='Base retry delay in seconds (doubles on every failed attempt)')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--lease', type=int, default=settings.PARSE_JOB_LEASE_SECONDS,
+                            help='Seconds after which a RUNNING job is considered abandoned and requeued')
+        parser.add_argument('--batch-size', type=int, default=settings.PARSE_WORKER_BATCH_SIZE,
+                            help='Bulk (reparse_applications) resumes packed into one LLM request (1 = one request per resume)')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is drained instead of polling forever')
+
+    def handle(self, *args, **kwargs):
+        concurrency = max(1, kwargs['concurrency'])
+        backoff = kwargs['backoff']
+        poll_interval = kwargs['poll_interval']
+        lease = kwargs['lease']
+        batch_size = max(1, kwargs['batch_size'])
+
+        requeued = requeue_stale_jobs(lease)
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} abandoned parse job(s).'))
+        self.stdout.write(f'Parse worker started (concurrency={concurrency}, batch_size={batch_size}).')
+
+        # future -> the jobs it is running
+        in_flight = {}
+        last_lease_check = last_heartbeat = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                while True:
+                    # Fill free slots from the queue (one slot = one LLM request)
+                    while len(in_flight) < concurrency:
+                        jobs = self._claim(batch_size)
+                        if not jobs:
+                            break
+                        in_flight[pool.submit(self._run, jobs, backoff)] = jobs
+
+                    if not in_flight:
+                        if kwargs['once']:
+                            break
+                        time.sleep(poll_interval)
+                    else:
+                        done = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED).done
+                        for future in done:
+                            del in_flight[future]
+
+                    # Renew the lease of running jobs, so a slow parse (e.g. the serial model/key
+                    # fallback) is not requeued and parsed twice by this or another worker
+                    if in_flight and time.monotonic() - last_heartbeat > lease / 3:
+                        heartbeat_jobs([job.id for jobs in in_flight.values() for job in jobs])
+                        last_heartbeat = time.monotonic()
+
+                    if time.monotonic() - last_lease_check > lease:
+                        requeue_stale_jobs(lease)
+                        last_lease_check = time.monotonic()
+            except KeyboardInterrupt:
+                self.stdout.write('Stopping parse worker, waiting for running jobs...')
+
+        self.stdout.write(self.style.SUCCESS('Parse worker stopped.'))
+
+    def _claim(self, batch_size):
+        job = claim_next_job()
+        if job is None:
+            return []
+        jobs = [job]
+        # Uploads are parsed on their own for latency; bulk jobs share LLM requests
+        while job.batchable and len(jobs) < batch_size:
+            job = claim_next_job(batchable=True)
+            if job is None:
+                break
+            jobs.append(job)
+        return jobs
+
+    def _run(self, jobs, backoff):
+        try:
+            if len(jobs) == 1:
+                return run_parse_job(jobs[0], backoff_seconds=backoff)
+            return run_parse_jobs_batch(jobs, backoff_seconds=backoff)
+        finally:
+            # Each pool thread has its own DB connection; don't leak them
+            close_old_connections()
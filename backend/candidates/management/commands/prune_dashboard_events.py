@@ -0,0 +1,20 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from candidates.models import DashboardEvent
+
+
+class Command(BaseCommand):
+    help = 'Deletes dashboard push events older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=settings.DASHBOARD_EVENTS_RETENTION_HOURS,
+                            help='Keep events from the last N hours')
+
+    def handle(self, *args, **kwargs):
+        cutoff = timezone.now() - datetime.timedelta(hours=kwargs['hours'])
+        deleted, _ = DashboardEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} dashboard event(s) older than {kwargs["hours"]}h.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from candidates.rollup import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the ApplicationDailyStat analytics rollup from all applications'
+
+    def handle(self, *args, **kwargs):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt analytics rollup: {rows} row(s).'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from candidates.embeddings import embed_applications, embed_job, get_embedder
+from candidates.models import Application, ApplicationSearchDocument
+from candidates.search import index_application
+from jobs.models import JobPosting
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the semantic search vectors of every application and job with the configured embedder'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=200, help='Applications embedded per transaction')
+
+    def handle(self, *args, **kwargs):
+        chunk_size = max(1, kwargs['chunk_size'])
+        self.stdout.write(f"Embedder: {get_embedder().name}")
+
+        # Vectors are computed from the search documents; index applications that have none yet
+        missing = (
+            Application.objects.filter(search_document__isnull=True)
+            .select_related('candidate', 'parsed_resume')
+            .prefetch_related('parsed_resume__work_experience')
+            .defer('resume_text')
+        )
+        indexed = 0
+        for application in missing.iterator(chunk_size=chunk_size):
+            index_application(application)
+            indexed += 1
+        if indexed:
+            self.stdout.write(f"Indexed {indexed} application(s) without a search document.")
+
+        embedded = last_id = 0
+        # Walk by primary key, as rebuild_search_index does
+        while True:
+            chunk = list(ApplicationSearchDocument.objects.filter(application_id__gt=last_id).order_by('application_id')[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                embedded += embed_applications(chunk)
+            last_id = chunk[-1].application_id
+            self.stdout.write(f"Embedded {embedded} application(s)...")
+
+        jobs = 0
+        for job in JobPosting.objects.order_by('id').iterator():
+            embed_job(job)
+            jobs += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Done: {embedded} application(s) and {jobs} job(s) embedded.'))
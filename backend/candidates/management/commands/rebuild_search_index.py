@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from candidates.models import Application
+from candidates.search import extracted_text, index_application
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search documents (name, skills, experience, education, resume text) for applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=200, help='Applications indexed per transaction')
+        parser.add_argument('--skip-resume-text', action='store_true',
+                            help='Only index the parsed fields, keep the stored resume text (no file reads)')
+
+    def handle(self, *args, **kwargs):
+        chunk_size = max(1, kwargs['chunk_size'])
+        indexed = last_id = 0
+
+        # Walk by primary key, as backfill_parsed_resumes does
+        while True:
+            chunk = list(
+                Application.objects.filter(id__gt=last_id).order_by('id')
+                .select_related('candidate', 'parsed_resume')
+                .prefetch_related('parsed_resume__work_experience')
+                .defer('resume_text')[:chunk_size]
+            )
+            if not chunk:
+                break
+
+            with transaction.atomic():
+                for application in chunk:
+                    text = None if kwargs['skip_resume_text'] else extracted_text(application)
+                    index_application(application, text)
+            indexed += len(chunk)
+            last_id = chunk[-1].id
+            self.stdout.write(f"Indexed {indexed} application(s)...")
+
+        self.stdout.write(self.style.SUCCESS(f'Done: {indexed} application(s) indexed.'))
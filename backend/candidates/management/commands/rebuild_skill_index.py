@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from candidates.models import Application, Skill
+from candidates.skill_index import sync_skills
+
+
+class Command(BaseCommand):
+    help = 'Rewrites the normalized skill links (ApplicationSkill) from every application\'s skills list'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Applications synced per transaction')
+        parser.add_argument('--prune', action='store_true', help='Also delete skills no application links to')
+
+    def handle(self, *args, **kwargs):
+        chunk_size = max(1, kwargs['chunk_size'])
+        synced = added = removed = last_id = 0
+
+        # Walk by primary key, as rebuild_search_index does
+        while True:
+            rows = dict(
+                Application.objects.filter(id__gt=last_id).order_by('id')
+                .values_list('id', 'skills')[:chunk_size]
+            )
+            if not rows:
+                break
+
+            with transaction.atomic():
+                chunk_added, chunk_removed = sync_skills(list(rows), rows)
+            synced += len(rows)
+            added += chunk_added
+            removed += chunk_removed
+            last_id = max(rows)
+            self.stdout.write(f"Synced {synced} application(s)...")
+
+        pruned = 0
+        if kwargs['prune']:
+            pruned, _ = Skill.objects.filter(application_links__isnull=True).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {synced} application(s), {added} link(s) added, {removed} removed, {pruned} unused skill(s) pruned.'
+        ))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from candidates.models import Application, ParseJob
+
+
+class Command(BaseCommand):
+    help = 'Queues resume parse jobs in bulk; parse_worker packs them PARSE_WORKER_BATCH_SIZE to an LLM request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, help='Only applications to this job posting')
+        parser.add_argument('--all', action='store_true',
+                            help='Reparse every application, not only those without a ParsedResume')
+
+    def handle(self, *args, **kwargs):
+        apps_query = Application.objects.exclude(resume='')
+        if kwargs['job']:
+            apps_query = apps_query.filter(job_id=kwargs['job'])
+        if not kwargs['all']:
+            apps_query = apps_query.filter(parsed_resume__isnull=True)
+
+        # Don't double-queue applications that already have a job waiting or running
+        apps_query = apps_query.exclude(parse_jobs__status__in=['QUEUED', 'RUNNING'])
+
+        jobs = [
+            ParseJob(application_id=app_id, max_attempts=settings.PARSE_JOB_MAX_ATTEMPTS, batchable=True)
+            for app_id in apps_query.values_list('id', flat=True).iterator()
+        ]
+        ParseJob.objects.bulk_create(jobs, batch_size=1000)
+        self.stdout.write(self.style.SUCCESS(f'Queued {len(jobs)} application(s) for parsing.'))
@@ -0,0 +1,78 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections, connection
+
+from candidates.scoring import claim_next_task, enqueue_rescore, heartbeat_tasks, requeue_stale_tasks, run_rescore_task
+from jobs.models import JobPosting
+
+
+class Command(BaseCommand):
+    help = 'Recomputes stored match scores queued by job criteria changes (RescoreTask)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--lease', type=int, default=settings.RESCORE_TASK_LEASE_SECONDS,
+                            help='Seconds after which a RUNNING task is considered abandoned and requeued')
+        parser.add_argument('--all-jobs', action='store_true',
+                            help='First queue a rescore of every job (e.g. after a scoring or taxonomy change)')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit once the queue is drained instead of polling forever')
+
+    def handle(self, *args, **kwargs):
+        lease = kwargs['lease']
+        if kwargs['all_jobs']:
+            queued = sum(len(enqueue_rescore(job)) for job in JobPosting.objects.order_by('id'))
+            self.stdout.write(f'Queued {queued} rescore task(s).')
+
+        requeued = requeue_stale_tasks(lease)
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'Requeued {requeued} abandoned rescore task(s).'))
+        self.stdout.write('Rescore worker started.')
+
+        done = 0
+        last_lease_check = time.monotonic()
+        try:
+            while True:
+                task = claim_next_task()
+                if task is None:
+                    if kwargs['once']:
+                        break
+                    close_old_connections()
+                    time.sleep(kwargs['poll_interval'])
+                else:
+                    done += self._run(task, lease)
+
+                if time.monotonic() - last_lease_check > lease:
+                    requeue_stale_tasks(lease)
+                    last_lease_check = time.monotonic()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping rescore worker...')
+
+        self.stdout.write(self.style.SUCCESS(f'Rescore worker stopped ({done} task(s) done).'))
+
+    def _run(self, task, lease):
+        # A slow chunk must not look abandoned: renew its lease from a side thread while
+        # run_rescore_task holds this thread (and its transaction)
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task.id, lease / 3, stop), daemon=True)
+        heartbeat.start()
+        try:
+            return run_rescore_task(task)
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def _heartbeat(self, task_id, interval, stop):
+        try:
+            while not stop.wait(interval):
+                try:
+                    heartbeat_tasks([task_id])
+                except DatabaseError as e:
+                    self.stdout.write(self.style.WARNING(f'Rescore heartbeat failed: {e}'))
+        finally:
+            # The thread's own connection
+            connection.close()
@@ -0,0 +1,96 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a process pays for each part of the app, measured after django.setup()
+SUBSYSTEMS = {
+    'django': [],
+    'web': ['screenai.urls'],
+    'parse_queue': ['candidates.parsing'],
+    'resume_parser': ['screenai.services.resume_parser.parser'],
+    'pdf': ['pypdf', 'pdfplumber'],
+    'docx': ['docx'],
+    'llm_client': ['langchain_google_genai'],
+}
+
+# Modules a web worker should never load just by booting
+HEAVY_MODULES = ['langchain_google_genai', 'langchain_core', 'pdfplumber', 'docx', 'pypdf']
+
+# Runs in a fresh interpreter so every measurement is a cold start
+PROBE = r'''
+import importlib, json, os, sys, time
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+        usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return usage // 1024 if sys.platform == "darwin" else usage
+
+import django
+django.setup()
+heavy = json.loads(sys.argv[2])
+before_rss = rss_kb()
+start = time.perf_counter()
+for name in json.loads(sys.argv[1]):
+    importlib.import_module(name)
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "rss_kb": rss_kb() - before_rss,
+    "total_rss_kb": rss_kb(),
+    "heavy_loaded": [m for m in heavy if m in sys.modules],
+}))
+'''
+
+
+def probe(modules):
+    """Imports modules in a new process and returns its timing/memory report."""
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'screenai.settings'))
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE, json.dumps(modules), json.dumps(HEAVY_MODULES)],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise CommandError(f"Probe failed for {modules}: {result.stderr.strip().splitlines()[-1:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class Command(BaseCommand):
+    help = 'Reports cold-start import time and resident memory per subsystem'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subsystem', action='append', choices=sorted(SUBSYSTEMS),
+                            help='Subsystem to measure (repeatable, default: all)')
+        parser.add_argument('--repeat', type=int, default=3, help='Cold starts per subsystem, median is reported')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **kwargs):
+        names = kwargs['subsystem'] or list(SUBSYSTEMS)
+        report = {}
+        for name in names:
+            runs = [probe(SUBSYSTEMS[name]) for _ in range(max(1, kwargs['repeat']))]
+            report[name] = {
+                'modules': SUBSYSTEMS[name],
+                'import_ms': round(statistics.median(r['seconds'] for r in runs) * 1000, 1),
+                'rss_mb': round(statistics.median(r['rss_kb'] for r in runs) / 1024, 1),
+                'total_rss_mb': round(statistics.median(r['total_rss_kb'] for r in runs) / 1024, 1),
+                'heavy_loaded': runs[-1]['heavy_loaded'],
+            }
+
+        if kwargs['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"{'subsystem':<15}{'import ms':>11}{'+rss MB':>10}{'rss MB':>9}  heavy modules loaded")
+        for name, row in report.items():
+            heavy = ', '.join(row['heavy_loaded']) or '-'
+            self.stdout.write(f"{name:<15}{row['import_ms']:>11}{row['rss_mb']:>10}{row['total_rss_mb']:>9}  {heavy}")
+        if report.get('web', {}).get('heavy_loaded'):
+            self.stdout.write(self.style.WARNING('The web app imports the parsing stack at startup.'))
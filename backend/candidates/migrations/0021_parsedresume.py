@@ -0,0 +1,44 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0020_parsejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ParsedResume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate_name', models.CharField(blank=True, default='', max_length=255)),
+                ('email', models.CharField(blank=True, default='', max_length=255)),
+                ('phone', models.CharField(blank=True, default='', max_length=50)),
+                ('total_years_experience', models.FloatField(blank=True, null=True)),
+                ('skills', models.JSONField(blank=True, default=list)),
+                ('education', models.JSONField(blank=True, default=list)),
+                ('certifications', models.JSONField(blank=True, default=list)),
+                ('screening_answers', models.JSONField(blank=True, default=list)),
+                ('parsed_at', models.DateTimeField(auto_now=True)),
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='parsed_resume', to='candidates.application')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ParsedWorkExperience',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0, help_text='Order in the resume')),
+                ('company_name', models.CharField(blank=True, default='', max_length=255)),
+                ('job_role', models.CharField(blank=True, default='', max_length=255)),
+                ('duration', models.CharField(blank=True, default='', max_length=100)),
+                ('parsed_resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='work_experience', to='candidates.parsedresume')),
+            ],
+            options={
+                'ordering': ['position'],
+            },
+        ),
+    ]
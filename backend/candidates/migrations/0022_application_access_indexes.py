@@ -0,0 +1,30 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0021_parsedresume'),
+        ('jobs', '0010_jobposting_interview_rounds'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-applied_at', '-id'], name='app_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-applied_at', '-id'], name='app_job_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['status', '-applied_at', '-id'], name='app_status_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['platform', '-applied_at', '-id'], name='app_platform_applied_idx'),
+        ),
+    ]
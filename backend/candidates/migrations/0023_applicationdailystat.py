@@ -0,0 +1,45 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def build_rollup(apps, schema_editor):
+    Application = apps.get_model('candidates', 'Application')
+    ApplicationDailyStat = apps.get_model('candidates', 'ApplicationDailyStat')
+    rows = (
+        Application.objects.annotate(day=TruncDate('applied_at'))
+        .values('day', 'job_id', 'platform', 'status')
+        .annotate(applications=Count('id'))
+        .order_by()
+    )
+    ApplicationDailyStat.objects.bulk_create([ApplicationDailyStat(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0022_application_access_indexes'),
+        ('jobs', '0010_jobposting_interview_rounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Day the applications were submitted (applied_at)')),
+                ('platform', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('NEW', 'New Applied'), ('SCREENED', 'AI Screened'), ('INTERVIEW', 'Interview Scheduled'), ('OFFER', 'Offer Sent'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected')], max_length=20)),
+                ('applications', models.IntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.jobposting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='dailystat_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'job', 'platform', 'status'), name='dailystat_unique_key')],
+            },
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appscreenai', '0006_remove_employee_first_name_remove_employee_last_name_and_more'),
+        ('candidates', '0023_applicationdailystat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('application.created', 'Application created'), ('application.status_changed', 'Application status changed'), ('parse.finished', 'Resume parse finished')], max_length=40)),
+                ('application_id', models.IntegerField(blank=True, null=True)),
+                ('payload', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('recruiter', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_events', to='appscreenai.employee')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='dashboardevent_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:15
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_transitions(apps, schema_editor):
+    # No history exists yet: record each application's current status as of applied_at
+    Application = apps.get_model('candidates', 'Application')
+    ApplicationStatusTransition = apps.get_model('candidates', 'ApplicationStatusTransition')
+    rows = Application.objects.values_list('id', 'job_id', 'status', 'applied_at').order_by('id')
+    ApplicationStatusTransition.objects.bulk_create(
+        (
+            ApplicationStatusTransition(application_id=pk, job_id=job_id, from_status='', to_status=status, changed_at=applied_at)
+            for pk, job_id, status, applied_at in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0024_dashboardevent'),
+        ('jobs', '0010_jobposting_interview_rounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('NEW', 'New Applied'), ('SCREENED', 'AI Screened'), ('INTERVIEW', 'Interview Scheduled'), ('OFFER', 'Offer Sent'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected')], default='', max_length=20)),
+                ('to_status', models.CharField(choices=[('NEW', 'New Applied'), ('SCREENED', 'AI Screened'), ('INTERVIEW', 'Interview Scheduled'), ('OFFER', 'Offer Sent'), ('HIRED', 'Hired'), ('REJECTED', 'Rejected')], max_length=20)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('seconds_in_previous_status', models.BigIntegerField(blank=True, null=True)),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='candidates.application')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='jobs.jobposting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job', 'to_status', 'changed_at'], name='transition_job_status_idx'), models.Index(fields=['to_status', 'changed_at'], name='transition_status_idx'), models.Index(fields=['application', 'changed_at'], name='transition_app_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_transitions, migrations.RunPython.noop),
+    ]
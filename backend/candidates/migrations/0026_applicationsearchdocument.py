@@ -0,0 +1,107 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+DOCUMENTS = 'candidates_applicationsearchdocument'
+COLUMNS = 'candidate_name, skills, experience, education, body'
+
+SQLITE_SQL = [
+    # External-content FTS5 table: the text lives in DOCUMENTS, the triggers keep the index in step
+    f"""CREATE VIRTUAL TABLE candidates_search_fts USING fts5(
+        {COLUMNS}, content='{DOCUMENTS}', content_rowid='application_id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER candidates_search_ai AFTER INSERT ON {DOCUMENTS} BEGIN
+        INSERT INTO candidates_search_fts(rowid, {COLUMNS})
+        VALUES (new.application_id, new.candidate_name, new.skills, new.experience, new.education, new.body);
+    END""",
+    f"""CREATE TRIGGER candidates_search_ad AFTER DELETE ON {DOCUMENTS} BEGIN
+        INSERT INTO candidates_search_fts(candidates_search_fts, rowid, {COLUMNS})
+        VALUES ('delete', old.application_id, old.candidate_name, old.skills, old.experience, old.education, old.body);
+    END""",
+    f"""CREATE TRIGGER candidates_search_au AFTER UPDATE ON {DOCUMENTS} BEGIN
+        INSERT INTO candidates_search_fts(candidates_search_fts, rowid, {COLUMNS})
+        VALUES ('delete', old.application_id, old.candidate_name, old.skills, old.experience, old.education, old.body);
+        INSERT INTO candidates_search_fts(rowid, {COLUMNS})
+        VALUES (new.application_id, new.candidate_name, new.skills, new.experience, new.education, new.body);
+    END""",
+]
+
+POSTGRES_SQL = [
+    # Weighted like the FTS5 bm25 weights: name and skills first, resume body last
+    f"""ALTER TABLE {DOCUMENTS} ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(candidate_name, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(skills, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(experience, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(education, '')), 'C') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(body, '')), 'D')
+    ) STORED""",
+    f"CREATE INDEX candidates_search_vector_idx ON {DOCUMENTS} USING GIN (search_vector)",
+]
+
+
+def create_search_index(apps, schema_editor):
+    statements = {'sqlite': SQLITE_SQL, 'postgresql': POSTGRES_SQL}.get(schema_editor.connection.vendor, [])
+    if statements is SQLITE_SQL:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                # Without FTS5, candidates.search falls back to a plain scan
+                return
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS candidates_search_{trigger}")
+        schema_editor.execute("DROP TABLE IF EXISTS candidates_search_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute(f"ALTER TABLE {DOCUMENTS} DROP COLUMN IF EXISTS search_vector")
+
+
+def build_documents(apps, schema_editor):
+    # Parsed fields only; the resume body is added by `manage.py rebuild_search_index`
+    Application = apps.get_model('candidates', 'Application')
+    ApplicationSearchDocument = apps.get_model('candidates', 'ApplicationSearchDocument')
+    ParsedWorkExperience = apps.get_model('candidates', 'ParsedWorkExperience')
+    experience = {}
+    for row in ParsedWorkExperience.objects.values('parsed_resume__application_id', 'job_role', 'company_name').order_by('position'):
+        experience.setdefault(row['parsed_resume__application_id'], []).append(f"{row['job_role']} {row['company_name']}")
+    documents = (
+        ApplicationSearchDocument(
+            application_id=application.id,
+            candidate_name=application.candidate.name,
+            skills=', '.join(str(skill) for skill in application.skills or []),
+            experience='\n'.join(experience.get(application.id, [])),
+            education='\n'.join(str(item) for item in (application.education or []) + (application.certifications or [])),
+        )
+        for application in Application.objects.select_related('candidate').iterator()
+    )
+    ApplicationSearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0025_applicationstatustransition'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSearchDocument',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='candidates.application')),
+                ('candidate_name', models.TextField(blank=True, default='')),
+                ('skills', models.TextField(blank=True, default='')),
+                ('experience', models.TextField(blank=True, default='')),
+                ('education', models.TextField(blank=True, default='')),
+                ('body', models.TextField(blank=True, default='', help_text='Text extracted from the resume file')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(build_documents, migrations.RunPython.noop),
+    ]
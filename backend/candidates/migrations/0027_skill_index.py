@@ -0,0 +1,67 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_links(apps, schema_editor):
+    # Names go through the same normalization as the live index (candidates/skill_index.py)
+    from candidates.skill_index import skill_key
+
+    Application = apps.get_model('candidates', 'Application')
+    Skill = apps.get_model('candidates', 'Skill')
+    ApplicationSkill = apps.get_model('candidates', 'ApplicationSkill')
+
+    keys_by_application = {}
+    names = {}
+    for pk, skills in Application.objects.values_list('id', 'skills').order_by('id').iterator():
+        keys = set()
+        for term in skills or []:
+            resolved = skill_key(term)
+            if resolved:
+                names.setdefault(*resolved)
+                keys.add(resolved[0])
+        keys_by_application[pk] = keys
+
+    Skill.objects.bulk_create(
+        [Skill(name=key, display_name=display) for key, display in names.items()],
+        batch_size=1000,
+    )
+    ids = dict(Skill.objects.values_list('name', 'id'))
+    ApplicationSkill.objects.bulk_create(
+        (
+            ApplicationSkill(application_id=pk, skill_id=ids[key])
+            for pk, keys in keys_by_application.items() for key in keys
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0026_applicationsearchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('display_name', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApplicationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='candidates.application')),
+                ('skill', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='application_links', to='candidates.skill')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('skill', 'application'), name='appskill_skill_application_uniq')],
+            },
+        ),
+        migrations.RunPython(build_links, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def queue_backfill(apps, schema_editor):
+    # Existing applications are scored in the background: one rescore task per 1000 of each job's
+    # applications, run by `manage.py rescore_worker`
+    Application = apps.get_model('candidates', 'Application')
+    RescoreTask = apps.get_model('candidates', 'RescoreTask')
+    by_job = {}
+    for pk, job_id in Application.objects.order_by('job_id', 'id').values_list('id', 'job_id').iterator():
+        by_job.setdefault(job_id, []).append(pk)
+    RescoreTask.objects.bulk_create(
+        (
+            RescoreTask(job_id=job_id, first_application_id=ids[start], last_application_id=ids[min(start + 1000, len(ids)) - 1])
+            for job_id, ids in by_job.items()
+            for start in range(0, len(ids), 1000)
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0027_skill_index'),
+        ('jobs', '0010_jobposting_interview_rounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RescoreTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_application_id', models.IntegerField()),
+                ('last_application_id', models.IntegerField()),
+                ('status', models.CharField(choices=[('QUEUED', 'Queued'), ('RUNNING', 'Running'), ('DONE', 'Done'), ('FAILED', 'Failed')], default='QUEUED', max_length=20)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='match_score',
+            field=models.FloatField(default=0, help_text="Match score out of 100 against the job's criteria"),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='score_breakdown',
+            field=models.JSONField(blank=True, default=dict, help_text='Points per criterion and missing skills behind match_score'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['-match_score', '-id'], name='app_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', '-match_score', '-id'], name='app_job_score_idx'),
+        ),
+        migrations.AddField(
+            model_name='rescoretask',
+            name='job',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rescore_tasks', to='jobs.jobposting'),
+        ),
+        migrations.AddIndex(
+            model_name='rescoretask',
+            index=models.Index(fields=['status', 'id'], name='rescoretask_status_idx'),
+        ),
+        migrations.RunPython(queue_backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0028_match_score'),
+        ('jobs', '0010_jobposting_interview_rounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobEmbedding',
+            fields=[
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='jobs.jobposting')),
+                ('model', models.CharField(max_length=100)),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApplicationEmbedding',
+            fields=[
+                ('application', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='candidates.application')),
+                ('model', models.CharField(help_text='Embedder that produced the vector', max_length=100)),
+                ('vector', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['model', 'updated_at'], name='appembedding_model_updated_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0029_embeddings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parsejob',
+            name='batchable',
+            field=models.BooleanField(default=False, help_text='Bulk job (reparse_applications) that may share an LLM request with other batchable jobs'),
+        ),
+    ]
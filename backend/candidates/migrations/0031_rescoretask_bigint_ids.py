@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0030_parsejob_batchable'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='rescoretask',
+            name='first_application_id',
+            field=models.BigIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='rescoretask',
+            name='last_application_id',
+            field=models.BigIntegerField(),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 20:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0031_rescoretask_bigint_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rescoretask',
+            name='attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='rescoretask',
+            name='max_attempts',
+            field=models.IntegerField(default=3),
+        ),
+        migrations.AlterField(
+            model_name='rescoretask',
+            name='started_at',
+            field=models.DateTimeField(blank=True, help_text="Claim time, renewed by the worker's heartbeat (the lease)", null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0032_rescoretask_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parsedresume',
+            name='extraction_tier',
+            field=models.CharField(blank=True, db_index=True, default='', help_text='Text extractor that served the file: text_layer, layout, ocr or docx', max_length=20),
+        ),
+    ]
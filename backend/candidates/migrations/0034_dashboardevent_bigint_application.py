@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 20:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0033_parsedresume_extraction_tier'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dashboardevent',
+            name='application_id',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 20:14
+
+import time
+
+from django.db import migrations, models
+
+
+def seed_version(apps, schema_editor):
+    AnalyticsVersion = apps.get_model('candidates', 'AnalyticsVersion')
+    AnalyticsVersion.objects.get_or_create(pk=1, defaults={'value': time.time_ns()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0034_dashboardevent_bigint_application'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField()),
+            ],
+        ),
+        migrations.RunPython(seed_version, migrations.RunPython.noop),
+    ]
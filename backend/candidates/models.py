@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from jobs.models import JobPosting
+from appscreenai.models import Employee
 
 class Candidate(models.Model):
     name = models.CharField(max_length=255)
@@ -10,6 +12,34 @@ class Candidate(models.Model):
     def __str__(self):
         return self.name
 
+class ApplicationQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        # Bulk updates skip model signals: keep the status history (candidates/history.py),
+        # the skill index (candidates/skill_index.py) and the stored match scores
+        # (candidates/scoring.py) in step here
+        from .scoring import SCORED_FIELDS
+
+        rescore = any(field in kwargs for field in SCORED_FIELDS + ('job',))
+        if 'skills' in kwargs or rescore:
+            with transaction.atomic(using=self.db):
+                application_ids = list(self.values_list('pk', flat=True))
+                count = self._update_status(kwargs)
+                if 'skills' in kwargs:
+                    from .skill_index import sync_skills
+                    sync_skills(application_ids)
+                if rescore:
+                    from .scoring import schedule_rescore
+                    schedule_rescore(application_ids)
+            return count
+        return self._update_status(kwargs)
+
+    def _update_status(self, kwargs):
+        if 'status' not in kwargs:
+            return super().update(**kwargs)
+        from .history import bulk_status_update
+        return bulk_status_update(self, kwargs, super().update)
+
+
 class Application(models.Model):
     STATUS_CHOICES = [
         ('NEW', 'New Applied'),
@@ -50,7 +80,27 @@ class Application(models.Model):
 
     education = models.JSONField(default=list, blank=True)
     certifications = models.JSONField(default=list, blank=True)
+    # Legacy: JSON of parses made before ParsedResume existed (see backfill_parsed_resumes)
     resume_text = models.TextField(null=True, blank=True)
+
+    # Fit against the job's criteria, kept up to date by candidates/scoring.py
+    match_score = models.FloatField(default=0, help_text="Match score out of 100 against the job's criteria")
+    score_breakdown = models.JSONField(default=dict, blank=True, help_text="Points per criterion and missing skills behind match_score")
+
+    objects = ApplicationQuerySet.as_manager()
+
+    class Meta:
+        # List filters (job/status/platform) + keyset order (newest or best match first), and
+        # applied_at ranges for analytics.
+        # Leading status/platform columns also serve the GROUP BY status/platform counts.
+        indexes = [
+            models.Index(fields=['-applied_at', '-id'], name='app_applied_idx'),
+            models.Index(fields=['job', '-applied_at', '-id'], name='app_job_applied_idx'),
+            models.Index(fields=['status', '-applied_at', '-id'], name='app_status_applied_idx'),
+            models.Index(fields=['platform', '-applied_at', '-id'], name='app_platform_applied_idx'),
+            models.Index(fields=['-match_score', '-id'], name='app_score_idx'),
+            models.Index(fields=['job', '-match_score', '-id'], name='app_job_score_idx'),
+        ]
     
     def __str__(self):
         return f"{self.candidate.name} - {self.job.title}"
@@ -64,6 +114,78 @@ class Experience(models.Model):
     def __str__(self):
         return f"{self.role} at {self.company}"
 
+class ParsedResume(models.Model):
+    """Typed copy of the parse_resume() output for an application (one row per application)."""
+    application = models.OneToOneField(Application, on_delete=models.CASCADE, related_name='parsed_resume')
+    candidate_name = models.CharField(max_length=255, blank=True, default='')
+    email = models.CharField(max_length=255, blank=True, default='')
+    phone = models.CharField(max_length=50, blank=True, default='')
+    total_years_experience = models.FloatField(null=True, blank=True)
+    skills = models.JSONField(default=list, blank=True)
+    education = models.JSONField(default=list, blank=True)
+    certifications = models.JSONField(default=list, blank=True)
+    screening_answers = models.JSONField(default=list, blank=True)
+    extraction_tier = models.CharField(max_length=20, blank=True, default='', db_index=True,
+                                       help_text="Text extractor that served the file: text_layer, layout, ocr or docx")
+    parsed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Parsed resume for App {self.application_id}"
+
+class ParsedWorkExperience(models.Model):
+    parsed_resume = models.ForeignKey(ParsedResume, on_delete=models.CASCADE, related_name='work_experience')
+    position = models.PositiveSmallIntegerField(default=0, help_text="Order in the resume")
+    company_name = models.CharField(max_length=255, blank=True, default='')
+    job_role = models.CharField(max_length=255, blank=True, default='')
+    duration = models.CharField(max_length=100, blank=True, default='')
+
+    class Meta:
+        ordering = ['position']
+
+    def __str__(self):
+        return f"{self.job_role} at {self.company_name}"
+
+class Skill(models.Model):
+    """One row per normalized skill: the case-folded canonical name (see candidates/skill_index.py)."""
+    name = models.CharField(max_length=100, unique=True)
+    display_name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.display_name
+
+class ApplicationSkill(models.Model):
+    """
+    Inverted index from skills to applications, mirrored from Application.skills.
+    The (skill, application) constraint is the posting list used by the skill filters.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='application_links', db_index=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'application'], name='appskill_skill_application_uniq'),
+        ]
+
+    def __str__(self):
+        return f"App {self.application_id}: skill {self.skill_id}"
+
+class ApplicationSearchDocument(models.Model):
+    """
+    Searchable text of an application, rebuilt when its resume is parsed (candidates/search.py).
+    The full-text index over it lives outside the ORM: an FTS5 table kept in sync by triggers
+    on SQLite, a generated tsvector column with a GIN index on PostgreSQL (migration 0026).
+    """
+    application = models.OneToOneField(Application, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    candidate_name = models.TextField(blank=True, default='')
+    skills = models.TextField(blank=True, default='')
+    experience = models.TextField(blank=True, default='')
+    education = models.TextField(blank=True, default='')
+    body = models.TextField(blank=True, default='', help_text="Text extracted from the resume file")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Search document for App {self.application_id}"
+
 class ApplicationComment(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='comments')
     text = models.TextField()
@@ -71,3 +193,169 @@ class ApplicationComment(models.Model):
 
     def __str__(self):
         return f"Comment on {self.application} at {self.created_at}"
+
+class ParseJob(models.Model):
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='parse_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='QUEUED')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Earliest time a worker may pick this job up (retry backoff)")
+    last_error = models.TextField(blank=True, default='')
+    batchable = models.BooleanField(default=False, help_text="Bulk job (reparse_applications) that may share an LLM request with other batchable jobs")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='parsejob_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f"Parse job for App {self.application_id} ({self.status})"
+
+class RescoreTask(models.Model):
+    """
+    A slice of a job's applications (ids first..last) whose match scores need recomputing
+    after the job's criteria changed. Run by `manage.py rescore_worker` (candidates/scoring.py).
+    """
+    STATUS_CHOICES = ParseJob.STATUS_CHOICES
+
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='rescore_tasks')
+    first_application_id = models.BigIntegerField()
+    last_application_id = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='QUEUED')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    last_error = models.TextField(blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True, help_text="Claim time, renewed by the worker's heartbeat (the lease)")
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='rescoretask_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Rescore job {self.job_id} apps {self.first_application_id}-{self.last_application_id} ({self.status})"
+
+class ApplicationDailyStat(models.Model):
+    """
+    Application counts per day x job x platform x current status.
+    Kept up to date by the signals in candidates/rollup.py; rebuilt with `manage.py rebuild_analytics_rollup`.
+    """
+    day = models.DateField(help_text="Day the applications were submitted (applied_at)")
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='daily_stats')
+    platform = models.CharField(max_length=50)
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    applications = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'job', 'platform', 'status'], name='dailystat_unique_key'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='dailystat_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} job={self.job_id} {self.platform}/{self.status}: {self.applications}"
+
+
+class AnalyticsVersion(models.Model):
+    """
+    Single row holding the analytics ETag version when ANALYTICS_VERSION_STORE is "db"
+    (see candidates/analytics_cache.py), so a write in one process reaches every other.
+    """
+    value = models.BigIntegerField()
+
+    def __str__(self):
+        return f"Analytics version {self.value}"
+
+
+class ApplicationStatusTransition(models.Model):
+    """
+    Append-only log of application status changes, written by candidates/history.py
+    for saves and bulk QuerySet.update() calls. from_status is empty for the initial
+    status; seconds_in_previous_status is how long the application stayed in from_status.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_transitions')
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='status_transitions')
+    from_status = models.CharField(max_length=20, blank=True, default='', choices=Application.STATUS_CHOICES)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+    seconds_in_previous_status = models.BigIntegerField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'to_status', 'changed_at'], name='transition_job_status_idx'),
+            models.Index(fields=['to_status', 'changed_at'], name='transition_status_idx'),
+            models.Index(fields=['application', 'changed_at'], name='transition_app_idx'),
+        ]
+
+    def __str__(self):
+        return f"App {self.application_id}: {self.from_status or '-'} -> {self.to_status} at {self.changed_at}"
+
+
+class ApplicationEmbedding(models.Model):
+    """Vector of an application's parsed resume, packed float32 (see candidates/embeddings.py)."""
+    application = models.OneToOneField(Application, on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    model = models.CharField(max_length=100, help_text="Embedder that produced the vector")
+    vector = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # The in-memory vector index reloads rows changed since its last refresh
+            models.Index(fields=['model', 'updated_at'], name='appembedding_model_updated_idx'),
+        ]
+
+    def __str__(self):
+        return f"Embedding of App {self.application_id} ({self.model})"
+
+
+class JobEmbedding(models.Model):
+    """Vector of a job's title, skills and description (see candidates/embeddings.py)."""
+    job = models.OneToOneField(JobPosting, on_delete=models.CASCADE, primary_key=True, related_name='embedding')
+    model = models.CharField(max_length=100)
+    vector = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Embedding of Job {self.job_id} ({self.model})"
+
+
+class DashboardEvent(models.Model):
+    """
+    Change feed behind the dashboard push stream (see candidates/events.py).
+    Rows are appended after commit and read by id, so `id` doubles as the SSE event id.
+    """
+    KIND_CHOICES = [
+        ('application.created', 'Application created'),
+        ('application.status_changed', 'Application status changed'),
+        ('parse.finished', 'Resume parse finished'),
+    ]
+
+    kind = models.CharField(max_length=40, choices=KIND_CHOICES)
+    recruiter = models.ForeignKey(Employee, on_delete=models.CASCADE, null=True, blank=True, related_name='dashboard_events')
+    application_id = models.BigIntegerField(null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='dashboardevent_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} (recruiter={self.recruiter_id})"
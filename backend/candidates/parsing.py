@@ -0,0 +1,254 @@
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import embeddings, events, scoring, search
+from .models import Application, ParseJob, ParsedResume, ParsedWorkExperience
+
+
+def get_screening_questions(job):
+    """Returns the plain question strings configured on a job."""
+    if not job.screening_questions:
+        return []
+    return [q.get('question') for q in job.screening_questions if isinstance(q, dict) and q.get('question')]
+
+
+def apply_parsed_resume(application, parsed_data, overwrite=False):
+    """
+    Copies a parse_resume() result onto the application and saves it.
+
+    Background parsing merges skills and keeps answers the candidate typed in;
+    an explicit reparse (overwrite=True) replaces them with the parsed values.
+    """
+    data = parsed_data["data"]
+    application.total_years_experience = data["total_years_experience"]
+
+    if overwrite:
+        application.skills = data["skills"]
+    else:
+        # Merge existing skills with parsed skills to prevent data loss
+        current_skills = set(application.skills or [])
+        new_skills = set(data["skills"] or [])
+        application.skills = list(current_skills.union(new_skills))
+
+    application.education = data["education"]
+    application.certifications = data["certifications"]
+
+    if data.get("screening_answers") and (overwrite or not application.answers):
+        application.answers = data["screening_answers"]
+
+    # The parse lives in ParsedResume; resume_text only holds the JSON of pre-ParsedResume
+    # parses, read by backfill_parsed_resumes
+    resume_text = search.extracted_text(application)
+    with transaction.atomic():
+        application.save()
+        save_parsed_resume(application, parsed_data)
+        document = search.index_application(application, resume_text)
+        embeddings.embed_applications([document])
+        # After the work history is written; runs once the parse commits
+        scoring.schedule_rescore([application.id])
+
+
+def _clean_str(value, max_length):
+    return str(value or '').strip()[:max_length]
+
+
+def _clean_float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _clean_list(value):
+    return value if isinstance(value, list) else []
+
+
+def save_parsed_resume(application, parsed_data):
+    """
+    Stores a parse_resume() result (or the legacy resume_text JSON) as a ParsedResume
+    row with one ParsedWorkExperience row per job, replacing any earlier parse.
+    """
+    data = parsed_data.get('data', parsed_data) if isinstance(parsed_data, dict) else {}
+
+    parsed_resume, _ = ParsedResume.objects.update_or_create(
+        application=application,
+        defaults={
+            'candidate_name': _clean_str(data.get('candidate_name'), 255),
+            'email': _clean_str(data.get('email'), 255),
+            'phone': _clean_str(data.get('phone'), 50),
+            'total_years_experience': _clean_float(data.get('total_years_experience')),
+            'skills': _clean_list(data.get('skills')),
+            'education': _clean_list(data.get('education')),
+            'certifications': _clean_list(data.get('certifications')),
+            'screening_answers': _clean_list(data.get('screening_answers')),
+            'extraction_tier': _clean_str(parsed_data.get('extraction_tier') if isinstance(parsed_data, dict) else None, 20),
+        },
+    )
+
+    parsed_resume.work_experience.all().delete()
+    ParsedWorkExperience.objects.bulk_create([
+        ParsedWorkExperience(
+            parsed_resume=parsed_resume,
+            position=position,
+            company_name=_clean_str(item.get('company_name') or item.get('company'), 255),
+            job_role=_clean_str(item.get('job_role') or item.get('role'), 255),
+            duration=_clean_str(item.get('duration') or item.get('dates'), 100),
+        )
+        for position, item in enumerate(_clean_list(data.get('work_experience')))
+        if isinstance(item, dict)
+    ])
+    return parsed_resume
+
+
+# ------------ PARSE JOB QUEUE ------------
+def enqueue_parse(application):
+    """Queues a background parse for the application's resume."""
+    return ParseJob.objects.create(
+        application=application,
+        max_attempts=settings.PARSE_JOB_MAX_ATTEMPTS,
+    )
+
+
+def claim_next_job(batchable=None):
+    """
+    Atomically moves the oldest runnable job from QUEUED to RUNNING and returns it
+    (only bulk jobs with batchable=True, only interactive ones with False).
+
+    The conditional UPDATE makes claiming safe across several worker processes
+    on both SQLite and PostgreSQL without row locks.
+    """
+    now = timezone.now()
+    runnable = ParseJob.objects.filter(status='QUEUED', run_after__lte=now)
+    if batchable is not None:
+        runnable = runnable.filter(batchable=batchable)
+    candidate_ids = runnable.order_by('run_after', 'id').values_list('id', flat=True)[:10]
+    for job_id in candidate_ids:
+        claimed = ParseJob.objects.filter(id=job_id, status='QUEUED').update(
+            status='RUNNING',
+            attempts=F('attempts') + 1,
+            started_at=now,
+        )
+        if claimed:
+            return ParseJob.objects.select_related('application__job').get(id=job_id)
+    return None
+
+
+def heartbeat_jobs(job_ids):
+    """Renews the lease of RUNNING jobs that a live worker is still parsing."""
+    return ParseJob.objects.filter(id__in=job_ids, status='RUNNING').update(started_at=timezone.now())
+
+
+def requeue_stale_jobs(lease_seconds):
+    """
+    Puts RUNNING jobs whose worker died (no finish or heartbeat within the lease) back in
+    the queue. Jobs that have used all their attempts are marked FAILED instead, so a
+    resume that crashes or hangs the worker is not retried forever.
+    """
+    now = timezone.now()
+    stale = ParseJob.objects.filter(status='RUNNING', started_at__lt=now - datetime.timedelta(seconds=lease_seconds))
+
+    for job in stale.filter(attempts__gte=F('max_attempts')):
+        job.status = 'FAILED'
+        job.last_error = f"Lease expired after {job.attempts} attempt(s): the worker died or hung"
+        job.finished_at = now
+        # Conditional, in case the worker finished it meanwhile
+        if ParseJob.objects.filter(pk=job.pk, status='RUNNING').update(
+            status=job.status, last_error=job.last_error, finished_at=job.finished_at,
+        ):
+            print(f"WARNING: Parsing failed for App ID {job.application_id}: {job.last_error}")
+            events.parse_finished(job)
+
+    return stale.filter(attempts__lt=F('max_attempts')).update(status='QUEUED', run_after=now)
+
+
+def _mark_failed(job, error, backoff_seconds):
+    job.last_error = str(error)
+    if job.attempts < job.max_attempts:
+        # Exponential backoff: base, 2x base, 4x base, ...
+        delay = backoff_seconds * (2 ** (job.attempts - 1))
+        job.status = 'QUEUED'
+        job.run_after = timezone.now() + datetime.timedelta(seconds=delay)
+        print(f"WARNING: Parse attempt {job.attempts} failed for App ID {job.application_id}, retrying in {delay}s: {error}")
+    else:
+        job.status = 'FAILED'
+        job.finished_at = timezone.now()
+        print(f"WARNING: Parsing failed for App ID {job.application_id} after {job.attempts} attempts: {error}")
+    job.save(update_fields=['status', 'run_after', 'last_error', 'finished_at'])
+    if job.status == 'FAILED':
+        events.parse_finished(job)
+
+
+def _mark_done(job):
+    job.status = 'DONE'
+    job.last_error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'last_error', 'finished_at'])
+    events.parse_finished(job)
+    print(f"Background parsing complete for App {job.application_id}")
+
+
+def run_parse_job(job, backoff_seconds=None):
+    """Parses the job's resume, then marks it DONE, schedules a retry, or marks it FAILED."""
+    from screenai.services.resume_parser.parser import parse_resume
+
+    if backoff_seconds is None:
+        backoff_seconds = settings.PARSE_JOB_BACKOFF_SECONDS
+
+    try:
+        application = Application.objects.select_related('job').get(id=job.application_id)
+        questions_list = get_screening_questions(application.job)
+        parsed_data = parse_resume(application.resume.path, custom_questions=questions_list)
+        apply_parsed_resume(application, parsed_data)
+    except Exception as e:
+        _mark_failed(job, e, backoff_seconds)
+        return False
+
+    _mark_done(job)
+    return True
+
+
+def run_parse_jobs_batch(jobs, backoff_seconds=None):
+    """
+    Parses several jobs with batched LLM requests (parse_resume_batch).
+    Jobs are grouped by their screening questions, since a batch shares one prompt.
+    Each job still succeeds, retries or fails on its own.
+    """
+    from screenai.services.resume_parser.parser import parse_resume_batch
+
+    if backoff_seconds is None:
+        backoff_seconds = settings.PARSE_JOB_BACKOFF_SECONDS
+
+    applications = Application.objects.select_related('job').in_bulk([job.application_id for job in jobs])
+    groups = {}
+    for job in jobs:
+        application = applications.get(job.application_id)
+        if application is None:
+            _mark_failed(job, "Application no longer exists", backoff_seconds)
+            continue
+        questions = tuple(get_screening_questions(application.job))
+        groups.setdefault(questions, []).append((job, application))
+
+    for questions, members in groups.items():
+        try:
+            results = parse_resume_batch(
+                [application.resume.path for _, application in members],
+                custom_questions=list(questions),
+            )
+        except Exception as e:
+            for job, _ in members:
+                _mark_failed(job, e, backoff_seconds)
+            continue
+
+        for (job, application), result in zip(members, results):
+            try:
+                if isinstance(result, Exception):
+                    raise result
+                apply_parsed_resume(application, result)
+            except Exception as e:
+                _mark_failed(job, e, backoff_seconds)
+                continue
+            _mark_done(job)
@@ -0,0 +1,121 @@
+"""
+Incremental maintenance of the ApplicationDailyStat rollup.
+
+Every Application is counted in exactly one rollup row: (day applied, job, platform,
+current status). Creating an application adds 1 to its row; changing its status,
+job or platform moves 1 from the old row to the new one; deleting it removes 1.
+The old key is remembered on the instance when it is loaded (post_init), so a
+status change costs two small UPDATEs and no extra read.
+
+QuerySet.update(status=...) is handled by candidates/history.py (apply_deltas). Other
+bulk updates of the key fields and raw SQL bypass both; `manage.py rebuild_analytics_rollup`
+recomputes the table from Application when it may have drifted.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .analytics_cache import invalidate_analytics
+from .models import Application, ApplicationDailyStat
+
+ROLLUP_FIELDS = ('applied_at', 'job_id', 'platform', 'status')
+
+
+def rollup_key(values):
+    """(day, job_id, platform, status) from a dict of field values, None when any is missing."""
+    if any(values.get(field) is None for field in ROLLUP_FIELDS):
+        return None
+    applied_at = values['applied_at']
+    day = timezone.localdate(applied_at) if timezone.is_aware(applied_at) else applied_at.date()
+    return (day, values['job_id'], values['platform'], values['status'])
+
+
+def adjust(key, delta):
+    """Adds delta to the rollup row for key, creating the row on first use."""
+    day, job_id, platform, status = key
+    rows = ApplicationDailyStat.objects.filter(day=day, job_id=job_id, platform=platform, status=status)
+    if rows.update(applications=F('applications') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ApplicationDailyStat.objects.create(
+                day=day, job_id=job_id, platform=platform, status=status, applications=delta,
+            )
+    except IntegrityError:
+        # Another request created the row between our UPDATE and INSERT
+        rows.update(applications=F('applications') + delta)
+
+
+def move(old_key, new_key):
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        adjust(old_key, -1)
+    if new_key is not None:
+        adjust(new_key, 1)
+
+
+def apply_deltas(deltas):
+    """Applies {key: delta} in one UPDATE per changed key (bulk status updates)."""
+    for key, delta in deltas.items():
+        if key is not None and delta:
+            adjust(key, delta)
+
+
+def rebuild():
+    """Recomputes the whole rollup from Application. Returns the number of rows written."""
+    rows = (
+        Application.objects.annotate(day=TruncDate('applied_at'))
+        .values('day', 'job_id', 'platform', 'status')
+        .annotate(applications=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        ApplicationDailyStat.objects.all().delete()
+        created = ApplicationDailyStat.objects.bulk_create(
+            [ApplicationDailyStat(**row) for row in rows.iterator()],
+            batch_size=1000,
+        )
+    invalidate_analytics()
+    return len(created)
+
+
+def _stored_key(pk):
+    values = Application.objects.filter(pk=pk).values(*ROLLUP_FIELDS).first()
+    return rollup_key(values) if values else None
+
+
+# ------------ SIGNALS (connected in CandidatesConfig.ready) ------------
+@receiver(post_init, sender=Application)
+def remember_rollup_key(sender, instance, **kwargs):
+    # Read raw attributes: touching a deferred field here would cost a query per row
+    instance._rollup_key = rollup_key(instance.__dict__)
+
+
+@receiver(pre_save, sender=Application)
+def load_rollup_key(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding or instance._rollup_key is not None or instance.pk is None:
+        return
+    # Loaded with some of the key fields deferred: read what is stored before it changes
+    instance._rollup_key = _stored_key(instance.pk)
+
+
+@receiver(post_save, sender=Application)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_key = rollup_key(instance.__dict__)
+    if new_key is None:
+        new_key = _stored_key(instance.pk)
+    move(None if created else instance._rollup_key, new_key)
+    instance._rollup_key = new_key
+
+
+@receiver(post_delete, sender=Application)
+def update_rollup_on_delete(sender, instance, **kwargs):
+    key = instance._rollup_key or rollup_key(instance.__dict__)
+    if key is not None:
+        adjust(key, -1)
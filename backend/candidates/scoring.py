@@ -0,0 +1,479 @@
+"""
+Bulk candidate-to-job scoring.
+
+AIScreener.analyze_application compares one resume with one job description, so
+ranking a job's applicants meant one call (and one set-splitting pass) per
+applicant. rank_applications() scores every application of a job in one batch:
+
+    skills       share of required_skills the application has, read from the
+                 ApplicationSkill posting lists (candidates/skill_index.py)
+    companies    worked at one of previous_companies (form or parsed work history)
+    roles        held one of previous_roles
+    experience   years / min_experience, capped at 1
+    ctc          1 within expected_ctc_limit, limit / expected above it
+    notice       1 within notice_period_days, days / notice period above it
+
+The score is the weighted sum out of 100. Criteria the job leaves empty are dropped
+and the remaining weights rescaled. Inputs are read as plain columns (values_list,
+no model instances) with one query per criterion. When NumPy is installed the
+arithmetic runs on arrays: the skill matrix is a sparse list of (application, skill)
+pairs, so its row sums are one bincount. Without NumPy the same formulas run in a
+Python loop.
+
+The result is also stored on the application (match_score, score_breakdown) so lists
+can be ordered best match first from an index. An application is rescored once its
+transaction commits when a scored field or its work history changes, or a parse
+completes. A change to a job's criteria queues RescoreTask slices of its applications
+instead, which `manage.py rescore_worker` runs in the background.
+"""
+import datetime
+import heapq
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from jobs.models import JobPosting
+from . import skill_index
+from .models import Application, ApplicationSkill, Experience, ParsedWorkExperience, RescoreTask
+
+WEIGHTS = {'skills': 50, 'companies': 10, 'roles': 10, 'experience': 15, 'ctc': 10, 'notice': 5}
+
+# Component value for a CTC or notice period the candidate did not give
+UNKNOWN = 0.5
+
+ENGINES = ('numpy', 'python')
+
+ScoredApplication = namedtuple('ScoredApplication', 'application_id score breakdown missing_skills')
+Ranking = namedtuple('Ranking', 'results scored engine seconds')
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def available_engine():
+    return 'numpy' if _numpy() is not None else 'python'
+
+
+# ------------ INPUTS ------------
+def job_criteria(job):
+    """{component: parameter} for the criteria the job sets (skills -> [(name, Skill id or None)])."""
+    criteria = {}
+    required = skill_index.resolve(required=job.required_skills)['required']
+    if required:
+        criteria['skills'] = required
+    companies = [str(term).strip() for term in job.previous_companies or [] if str(term).strip()]
+    if companies:
+        criteria['companies'] = companies
+    roles = [str(term).strip() for term in job.previous_roles or [] if str(term).strip()]
+    if roles:
+        criteria['roles'] = roles
+    if job.min_experience and job.min_experience > 0:
+        criteria['experience'] = job.min_experience
+    if job.expected_ctc_limit and job.expected_ctc_limit > 0:
+        criteria['ctc'] = job.expected_ctc_limit
+    if job.notice_period_days is not None and job.notice_period_days >= 0:
+        criteria['notice'] = job.notice_period_days
+    return criteria
+
+
+def component_weights(criteria):
+    total = sum(WEIGHTS[name] for name in criteria)
+    return {name: 100 * WEIGHTS[name] / total for name in criteria}
+
+
+def history_matches(application_ids, terms, experience_field, parsed_field):
+    """Ids of applications with a work history entry (typed or parsed) containing one of terms."""
+    typed, parsed = Q(), Q()
+    for term in terms:
+        typed |= Q(**{f'{experience_field}__icontains': term})
+        parsed |= Q(**{f'{parsed_field}__icontains': term})
+    return set(
+        Experience.objects.filter(typed, application_id__in=application_ids)
+        .values_list('application_id', flat=True).order_by()
+        .union(
+            ParsedWorkExperience.objects.filter(parsed, parsed_resume__application_id__in=application_ids)
+            .values_list('parsed_resume__application_id', flat=True).order_by()
+        )
+    )
+
+
+def load_columns(applications, criteria):
+    """Column lists for the applications, positions aligned with columns['ids']."""
+    rows = list(
+        applications.order_by('id')
+        .values_list('id', 'experience_years', 'total_years_experience', 'expected_ctc', 'notice_period')
+    )
+    ids = [row[0] for row in rows]
+    position = {pk: index for index, pk in enumerate(ids)}
+    columns = {
+        'ids': ids,
+        'years': [typed if typed is not None else parsed for _, typed, parsed, _, _ in rows],
+        'ctc': [row[3] for row in rows],
+        'notice': [row[4] for row in rows],
+    }
+    application_ids = applications.values('id')
+
+    if 'skills' in criteria:
+        # Sparse (application, required skill) matrix: the non-zero cells, read from the posting lists
+        skill_ids = [skill_id for _, skill_id in criteria['skills'] if skill_id is not None]
+        pairs = []
+        if skill_ids:
+            pairs = ApplicationSkill.objects.filter(
+                skill_id__in=skill_ids, application_id__in=application_ids,
+            ).values_list('application_id', 'skill_id')
+        pairs = [(position[pk], skill_id) for pk, skill_id in pairs if pk in position]
+        columns['skill_rows'] = [row for row, _ in pairs]
+        columns['skill_ids'] = [skill_id for _, skill_id in pairs]
+    if 'companies' in criteria:
+        matched = history_matches(application_ids, criteria['companies'], 'company', 'company_name')
+        columns['companies'] = [position[pk] for pk in matched if pk in position]
+    if 'roles' in criteria:
+        matched = history_matches(application_ids, criteria['roles'], 'role', 'job_role')
+        columns['roles'] = [position[pk] for pk in matched if pk in position]
+    return columns
+
+
+# ------------ ENGINES ------------
+def score_numpy(columns, criteria):
+    """{component: array of 0..1 values}, one entry per application."""
+    np = _numpy()
+    n = len(columns['ids'])
+    components = {}
+    if 'skills' in criteria:
+        rows = np.asarray(columns['skill_rows'], dtype=np.int64)
+        components['skills'] = np.bincount(rows, minlength=n) / len(criteria['skills'])
+    for name in ('companies', 'roles'):
+        if name in criteria:
+            matched = np.zeros(n)
+            matched[np.asarray(columns[name], dtype=np.int64)] = 1.0
+            components[name] = matched
+    if 'experience' in criteria:
+        # None becomes NaN in a float array; no years counts as none
+        years = np.nan_to_num(np.array(columns['years'], dtype=float), nan=0.0)
+        components['experience'] = np.minimum(years / criteria['experience'], 1.0)
+    for name in ('ctc', 'notice'):
+        if name in criteria:
+            values, limit = np.array(columns[name], dtype=float), criteria[name]
+            unknown, within = np.isnan(values), values <= limit
+            over = limit / np.where(unknown | within, 1.0, values)
+            components[name] = np.where(unknown, UNKNOWN, np.where(within, 1.0, over))
+    return components
+
+
+def score_python(columns, criteria):
+    """Same as score_numpy, with lists."""
+    n = len(columns['ids'])
+    components = {}
+    if 'skills' in criteria:
+        counts = [0] * n
+        for row in columns['skill_rows']:
+            counts[row] += 1
+        required = len(criteria['skills'])
+        components['skills'] = [count / required for count in counts]
+    for name in ('companies', 'roles'):
+        if name in criteria:
+            matched = [0.0] * n
+            for row in columns[name]:
+                matched[row] = 1.0
+            components[name] = matched
+    if 'experience' in criteria:
+        minimum = criteria['experience']
+        components['experience'] = [min((years or 0) / minimum, 1.0) for years in columns['years']]
+    for name in ('ctc', 'notice'):
+        if name in criteria:
+            limit = criteria[name]
+            components[name] = [
+                UNKNOWN if value is None else 1.0 if value <= limit else limit / value
+                for value in columns[name]
+            ]
+    return components
+
+
+def total_scores(components, weights, n, engine):
+    """Weighted sum of the components per row, out of 100."""
+    if engine == 'numpy':
+        total = _numpy().zeros(n)
+        for name, weight in weights.items():
+            total += components[name] * weight
+        return total.tolist()
+    total = [0.0] * n
+    for name, weight in weights.items():
+        total = [score + value * weight for score, value in zip(total, components[name])]
+    return total
+
+
+def top_rows(total, ids, limit, engine):
+    """Row positions of the best `limit` applications; ties go to the older id."""
+    if engine == 'numpy':
+        np = _numpy()
+        return np.lexsort((np.asarray(ids), -np.asarray(total)))[:limit].tolist()
+    return heapq.nsmallest(limit, range(len(ids)), key=lambda row: (-total[row], ids[row]))
+
+
+def check_engine(engine):
+    engine = engine or available_engine()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown scoring engine: {engine}")
+    if engine == 'numpy' and _numpy() is None:
+        raise ImportError("The numpy scoring engine needs NumPy installed")
+    return engine
+
+
+# ------------ SCORING ------------
+def score_applications(job, applications, limit=None, engine=None):
+    """
+    Scores a queryset of the job's applications. Returns (number scored, [ScoredApplication]),
+    the best `limit` first, or every application in id order when limit is None.
+    """
+    engine = check_engine(engine)
+    criteria = job_criteria(job)
+    weights = component_weights(criteria) if criteria else {}
+    columns = load_columns(applications, criteria)
+    ids = columns['ids']
+
+    components = (score_numpy if engine == 'numpy' else score_python)(columns, criteria)
+    total = total_scores(components, weights, len(ids), engine)
+    rows = range(len(ids)) if limit is None else top_rows(total, ids, limit, engine)
+
+    matched_skills = {}
+    if 'skills' in criteria:
+        wanted = set(rows)
+        for row, skill_id in zip(columns['skill_rows'], columns['skill_ids']):
+            if row in wanted:
+                matched_skills.setdefault(row, set()).add(skill_id)
+
+    results = []
+    for row in rows:
+        breakdown = {name: round(float(components[name][row]) * weight, 1) for name, weight in weights.items()}
+        missing = [
+            name for name, skill_id in criteria.get('skills', [])
+            if skill_id not in matched_skills.get(row, ())
+        ]
+        results.append(ScoredApplication(ids[row], round(total[row], 1), breakdown, missing))
+    return len(ids), results
+
+
+def rank_applications(job, status=None, limit=50, engine=None):
+    """
+    Scores every application of the job (optionally only one status) and returns a
+    Ranking with the best `limit`, each with its points per component and the required
+    skills it lacks. engine: 'numpy', 'python' or None for the fastest available.
+    """
+    engine = check_engine(engine)
+    started = time.perf_counter()
+    applications = Application.objects.filter(job=job)
+    if status:
+        applications = applications.filter(status=status)
+    scored, results = score_applications(job, applications, limit=limit, engine=engine)
+    return Ranking(results, scored, engine, time.perf_counter() - started)
+
+
+# ------------ STORED SCORES ------------
+def store_scores(job, applications):
+    """Writes match_score and score_breakdown for a queryset of the job's applications; returns how many."""
+    _, results = score_applications(job, applications)
+    Application.objects.bulk_update(
+        [
+            Application(
+                pk=scored.application_id,
+                match_score=scored.score,
+                score_breakdown={'points': scored.breakdown, 'missing_skills': scored.missing_skills},
+            )
+            for scored in results
+        ],
+        ['match_score', 'score_breakdown'],
+        batch_size=500,
+    )
+    return len(results)
+
+
+def rescore_applications(application_ids):
+    """Recomputes the stored scores of the given applications, whatever their jobs."""
+    by_job = {}
+    for pk, job_id in Application.objects.filter(pk__in=list(application_ids)).values_list('id', 'job_id'):
+        by_job.setdefault(job_id, []).append(pk)
+    for job in JobPosting.objects.filter(pk__in=list(by_job)):
+        store_scores(job, Application.objects.filter(pk__in=by_job[job.id]))
+
+
+class PendingRescore:
+    """The application ids of one transaction, rescored by its on_commit callback."""
+
+    def __init__(self):
+        self.application_ids = set()
+
+    def __call__(self):
+        if getattr(_pending, 'batch', None) is self:
+            _pending.batch = None
+        rescore_applications(self.application_ids)
+
+
+_pending = threading.local()
+
+
+def _is_queued(connection, batch):
+    """
+    Whether the batch's on_commit callback is still queued on the connection. Django keeps
+    no public API for this, so the check only asks whether an entry holds the batch, and
+    answers False (a fresh batch, at worst one extra rescore) if the internals change.
+    """
+    try:
+        return any(batch in entry for entry in connection.run_on_commit)
+    except (AttributeError, TypeError):
+        return False
+
+
+def schedule_rescore(application_ids):
+    """
+    Rescores the applications once the current transaction commits (right away in
+    autocommit). Several saves in one transaction, e.g. a parse writing the application
+    and then its work history, rescore each application once, with the final data.
+    """
+    connection = transaction.get_connection()
+    batch = getattr(_pending, 'batch', None)
+    # The batch belongs to the current transaction only while its callback is still
+    # queued; a rollback discards the callback, and with it the ids collected so far
+    if batch is None or not connection.in_atomic_block or not _is_queued(connection, batch):
+        batch = _pending.batch = PendingRescore()
+        batch.application_ids.update(application_ids)
+        transaction.on_commit(batch, robust=True)
+    else:
+        batch.application_ids.update(application_ids)
+
+
+# ------------ RESCORE QUEUE ------------
+def enqueue_rescore(job, chunk_size=None):
+    """
+    Replaces the job's queued rescore tasks with one per `chunk_size` of its applications
+    (by id), so several workers can share a large job. Returns the new tasks.
+    """
+    chunk_size = max(1, chunk_size or settings.RESCORE_CHUNK_SIZE)
+    RescoreTask.objects.filter(job=job, status='QUEUED').delete()
+    ids = list(Application.objects.filter(job=job).order_by('id').values_list('id', flat=True))
+    return RescoreTask.objects.bulk_create([
+        RescoreTask(job=job, first_application_id=chunk[0], last_application_id=chunk[-1],
+                    max_attempts=settings.RESCORE_TASK_MAX_ATTEMPTS)
+        for chunk in (ids[start:start + chunk_size] for start in range(0, len(ids), chunk_size))
+    ])
+
+
+def claim_next_task():
+    """Moves the oldest QUEUED task to RUNNING and returns it (conditional UPDATE, as claim_next_job)."""
+    for task_id in RescoreTask.objects.filter(status='QUEUED').order_by('id').values_list('id', flat=True)[:10]:
+        claimed = RescoreTask.objects.filter(id=task_id, status='QUEUED').update(
+            status='RUNNING',
+            attempts=F('attempts') + 1,
+            started_at=timezone.now(),
+        )
+        if claimed:
+            return RescoreTask.objects.select_related('job').get(id=task_id)
+    return None
+
+
+def heartbeat_tasks(task_ids):
+    """Renews the lease of RUNNING tasks that a live worker is still running."""
+    return RescoreTask.objects.filter(id__in=task_ids, status='RUNNING').update(started_at=timezone.now())
+
+
+def requeue_stale_tasks(lease_seconds):
+    """
+    Puts RUNNING tasks whose worker died (no finish or heartbeat within the lease) back in
+    the queue, or marks them FAILED once they have used all their attempts.
+    """
+    now = timezone.now()
+    stale = RescoreTask.objects.filter(status='RUNNING', started_at__lt=now - datetime.timedelta(seconds=lease_seconds))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='FAILED',
+        last_error='Lease expired: the worker died or hung',
+        finished_at=now,
+    )
+    if failed:
+        print(f"WARNING: {failed} rescore task(s) failed after their last attempt expired")
+    return stale.filter(attempts__lt=F('max_attempts')).update(status='QUEUED')
+
+
+def run_rescore_task(task):
+    """Rescores the task's slice of applications with the job's current criteria."""
+    try:
+        with transaction.atomic():
+            count = store_scores(task.job, Application.objects.filter(
+                job_id=task.job_id,
+                id__gte=task.first_application_id,
+                id__lte=task.last_application_id,
+            ))
+    except Exception as e:
+        task.last_error = str(e)
+        if task.attempts < task.max_attempts:
+            task.status = 'QUEUED'
+            print(f"WARNING: Rescore attempt {task.attempts} failed for Job {task.job_id}, retrying: {e}")
+        else:
+            task.status = 'FAILED'
+            print(f"WARNING: Rescoring failed for Job {task.job_id} (apps {task.first_application_id}-{task.last_application_id}): {e}")
+    else:
+        task.status = 'DONE'
+        task.last_error = ''
+        print(f"Rescored {count} application(s) of Job {task.job_id}")
+    task.finished_at = timezone.now() if task.status != 'QUEUED' else None
+    task.save(update_fields=['status', 'last_error', 'finished_at'])
+    return task.status == 'DONE'
+
+
+# ------------ SIGNALS (connected in CandidatesConfig.ready) ------------
+# Application fields the score reads (the skills also go through the skill index, whose
+# post_save receiver is connected first since this module imports it)
+SCORED_FIELDS = ('job_id', 'skills', 'experience_years', 'total_years_experience', 'expected_ctc', 'notice_period')
+CRITERIA_FIELDS = ('required_skills', 'previous_companies', 'previous_roles', 'min_experience',
+                   'expected_ctc_limit', 'notice_period_days')
+
+
+def _snapshot(instance, fields):
+    # Raw attributes (deferred fields are None, not loaded); lists are copied as they can be edited in place
+    values = (instance.__dict__.get(field) for field in fields)
+    return tuple(list(value) if isinstance(value, list) else value for value in values)
+
+
+@receiver(post_init, sender=Application)
+def remember_scored_fields(sender, instance, **kwargs):
+    instance._stored_scored_fields = _snapshot(instance, SCORED_FIELDS)
+
+
+@receiver(post_save, sender=Application)
+def rescore_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = _snapshot(instance, SCORED_FIELDS)
+    if created or current != instance._stored_scored_fields:
+        schedule_rescore([instance.pk])
+    instance._stored_scored_fields = current
+
+
+@receiver(post_save, sender=Experience)
+@receiver(post_delete, sender=Experience)
+def rescore_on_experience_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_rescore([instance.application_id])
+
+
+@receiver(post_init, sender=JobPosting)
+def remember_criteria(sender, instance, **kwargs):
+    instance._stored_criteria = _snapshot(instance, CRITERIA_FIELDS)
+
+
+@receiver(post_save, sender=JobPosting)
+def rescore_on_criteria_change(sender, instance, created, raw=False, **kwargs):
+    current = _snapshot(instance, CRITERIA_FIELDS)
+    if not (raw or created) and current != instance._stored_criteria:
+        enqueue_rescore(instance)
+    instance._stored_criteria = current
@@ -0,0 +1,231 @@
+"""
+Full-text resume search.
+
+Each application has one ApplicationSearchDocument (candidate name, skills, work
+experience, education and the text extracted from the resume file), rewritten by
+index_application() whenever a parse completes. The database indexes that table
+itself (see migration 0026):
+
+    SQLite      FTS5 external-content table, ranked with bm25()
+    PostgreSQL  weighted tsvector column with a GIN index, ranked with ts_rank_cd()
+
+get_backend() picks the implementation for the connection; both return the same
+SearchHit rows, with snippets whose matches are wrapped in <mark> (the rest is
+HTML-escaped). Other databases fall back to a slow icontains scan.
+"""
+import abc
+import html
+import re
+from collections import namedtuple
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import ApplicationSearchDocument
+
+SearchHit = namedtuple('SearchHit', 'application_id rank snippet')
+
+DOCUMENTS = ApplicationSearchDocument._meta.db_table
+APPLICATIONS = 'candidates_application'
+FTS_TABLE = 'candidates_search_fts'
+
+# Match markers inserted by the database, swapped for <mark> after escaping
+MARK_START, MARK_END = '⟦', '⟧'
+
+MAX_BODY_CHARS = 100000
+
+
+def highlight(snippet):
+    escaped = html.escape(snippet or '')
+    return escaped.replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def query_terms(query):
+    """Words of a user query ("kafka + fintech" -> ['kafka', 'fintech']); a trailing * keeps prefix search."""
+    return re.findall(r'[\w#.+-]*\w\*?', query)
+
+
+# ------------ INDEXING ------------
+def _as_text(items):
+    lines = []
+    for item in items or []:
+        if isinstance(item, dict):
+            lines.append(' '.join(str(value) for value in item.values() if value))
+        elif item:
+            lines.append(str(item))
+    return '\n'.join(lines)
+
+
+def build_document(application, resume_text=None):
+    """Field values of the search document for an application (body only when resume_text is given)."""
+    parsed = getattr(application, 'parsed_resume', None)
+    names = [application.candidate.name]
+    skills = list(application.skills or [])
+    experience, education = [], list(application.education or []) + list(application.certifications or [])
+    if parsed is not None:
+        if parsed.candidate_name and parsed.candidate_name not in names:
+            names.append(parsed.candidate_name)
+        skills += [skill for skill in parsed.skills if skill not in skills]
+        experience = [
+            f"{row.job_role} {row.company_name} {row.duration}".strip()
+            for row in parsed.work_experience.all()
+        ]
+
+    fields = {
+        'candidate_name': ' '.join(name for name in names if name),
+        'skills': ', '.join(str(skill) for skill in skills),
+        'experience': '\n'.join(experience),
+        'education': _as_text(education),
+    }
+    if resume_text is not None:
+        fields['body'] = resume_text[:MAX_BODY_CHARS]
+    return fields
+
+
+def index_application(application, resume_text=None):
+    """Creates or refreshes the application's search document; keeps the old body when resume_text is None."""
+    document, _ = ApplicationSearchDocument.objects.update_or_create(
+        application=application,
+        defaults=build_document(application, resume_text),
+    )
+    return document
+
+
+def extracted_text(application):
+    """Text of the application's resume file (from the parse cache after a parse), or None."""
+    from screenai.services.resume_parser.parser import get_resume_text
+
+    try:
+        return get_resume_text(application.resume.path)[1]
+    except Exception as e:
+        print(f"WARNING: No resume text to index for App {application.id}: {e}")
+        return None
+
+
+# ------------ BACKENDS ------------
+class SearchBackend(abc.ABC):
+    """search() returns at most `limit` SearchHit rows, best first, optionally within a job/status."""
+
+    @abc.abstractmethod
+    def search(self, query, limit=20, job_id=None, status=None):
+        """[SearchHit] for the query."""
+
+    @staticmethod
+    def application_filters(job_id, status):
+        sql, params = [], []
+        if job_id:
+            sql.append('a.job_id = %s')
+            params.append(job_id)
+        if status:
+            sql.append('a.status = %s')
+            params.append(status)
+        return ''.join(f' AND {clause}' for clause in sql), params
+
+
+class SqliteSearchBackend(SearchBackend):
+    # bm25 column weights: candidate_name, skills, experience, education, body
+    WEIGHTS = '10.0, 8.0, 4.0, 2.0, 1.0'
+
+    @staticmethod
+    def match_expression(query):
+        # Every word is required; quoting keeps FTS5 operators in user input literal
+        phrases = []
+        for term in query_terms(query):
+            prefix = term.endswith('*')
+            phrases.append('"' + term.rstrip('*').replace('"', '""') + '"' + ('*' if prefix else ''))
+        return ' '.join(phrases)
+
+    def search(self, query, limit=20, job_id=None, status=None):
+        match = self.match_expression(query)
+        if not match:
+            return []
+        filters, params = self.application_filters(job_id, status)
+        sql = f"""
+            SELECT {FTS_TABLE}.rowid,
+                   bm25({FTS_TABLE}, {self.WEIGHTS}) AS score,
+                   snippet({FTS_TABLE}, -1, '{MARK_START}', '{MARK_END}', '…', 16)
+            FROM {FTS_TABLE}
+            JOIN {APPLICATIONS} a ON a.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s{filters}
+            ORDER BY score
+            LIMIT %s
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [match, *params, limit])
+            # bm25 is lower-is-better; flip it so a higher rank is a better match on every backend
+            return [SearchHit(pk, -score, highlight(snippet)) for pk, score, snippet in cursor.fetchall()]
+
+
+class PostgresSearchBackend(SearchBackend):
+    HEADLINE_OPTIONS = f'StartSel={MARK_START}, StopSel={MARK_END}, MaxFragments=2, MaxWords=20, MinWords=6'
+
+    def search(self, query, limit=20, job_id=None, status=None):
+        if not query_terms(query):
+            return []
+        filters, params = self.application_filters(job_id, status)
+        # ts_headline re-parses the text, so it only runs on the rows of the page
+        sql = f"""
+            SELECT hit.application_id, hit.rank, ts_headline('english', hit.doc, hit.q, %s)
+            FROM (
+                SELECT d.application_id, ts_rank_cd(d.search_vector, q) AS rank, q,
+                       concat_ws(' … ', d.candidate_name, d.skills, d.experience, d.education, left(d.body, 20000)) AS doc
+                FROM {DOCUMENTS} d
+                JOIN {APPLICATIONS} a ON a.id = d.application_id,
+                     websearch_to_tsquery('english', %s) q
+                WHERE d.search_vector @@ q{filters}
+                ORDER BY rank DESC
+                LIMIT %s
+            ) hit
+            ORDER BY hit.rank DESC
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [self.HEADLINE_OPTIONS, query, *params, limit])
+            return [SearchHit(pk, rank, highlight(snippet)) for pk, rank, snippet in cursor.fetchall()]
+
+
+class ScanSearchBackend(SearchBackend):
+    """No full-text index available: every word must appear in some field (a full scan, no ranking)."""
+    FIELDS = ('candidate_name', 'skills', 'experience', 'education', 'body')
+
+    def search(self, query, limit=20, job_id=None, status=None):
+        terms = [term.rstrip('*') for term in query_terms(query)]
+        if not terms:
+            return []
+        documents = ApplicationSearchDocument.objects.all()
+        for term in terms:
+            any_field = Q()
+            for field in self.FIELDS:
+                any_field |= Q(**{f'{field}__icontains': term})
+            documents = documents.filter(any_field)
+        if job_id:
+            documents = documents.filter(application__job_id=job_id)
+        if status:
+            documents = documents.filter(application__status=status)
+
+        hits = []
+        for document in documents.order_by('-updated_at')[:limit]:
+            text = ' '.join(getattr(document, field) for field in self.FIELDS)
+            position = text.lower().find(terms[0].lower())
+            snippet = text[max(0, position - 60):position + 100]
+            hits.append(SearchHit(document.application_id, 0, html.escape(snippet)))
+        return hits
+
+
+_fts_available = None
+
+
+def get_backend():
+    global _fts_available
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    if connection.vendor == 'sqlite':
+        if _fts_available is None:
+            # The SQLite build may lack FTS5, in which case migration 0026 skipped the table
+            _fts_available = FTS_TABLE in connection.introspection.table_names()
+        if _fts_available:
+            return SqliteSearchBackend()
+    return ScanSearchBackend()
+
+
+def search_applications(query, limit=20, job_id=None, status=None):
+    return get_backend().search(query, limit=limit, job_id=job_id, status=status)
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Candidate, Application, ApplicationComment, Experience
+from .models import Candidate, Application, ApplicationComment, Experience, ParsedResume
 import json
 
 class ApplicationCommentSerializer(serializers.ModelSerializer):
@@ -18,6 +18,26 @@ class ExperienceSerializer(serializers.ModelSerializer):
         model = Experience
         fields = ['company', 'role', 'duration']
 
+class ApplicationListSerializer(serializers.ModelSerializer):
+    """
+    Compact row for application lists: no nested comments/experiences and no
+    resume_text. comments_count comes from an annotation on the list queryset.
+    """
+    candidate_details = CandidateSerializer(source='candidate', read_only=True)
+    job_title = serializers.CharField(source='job.title', read_only=True)
+    comments_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'job', 'job_title', 'candidate', 'candidate_details', 'resume', 'status',
+            'rejection_reason', 'rejected_stage', 'platform', 'notes', 'experience_years',
+            'current_ctc', 'expected_ctc', 'notice_period', 'applied_at', 'answers',
+            'total_years_experience', 'skills', 'education', 'certifications', 'comments_count',
+            'match_score',
+        ]
+        read_only_fields = fields
+
 class ApplicationSerializer(serializers.ModelSerializer):
     candidate_details = CandidateSerializer(source='candidate', read_only=True)
     job_title = serializers.CharField(source='job.title', read_only=True)
@@ -30,7 +50,8 @@ class ApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Application
         fields = '__all__'
-        read_only_fields = []
+        # Computed by candidates/scoring.py
+        read_only_fields = ['match_score', 'score_breakdown']
 
     def get_work_experience(self, obj):
         # 1. Get Manual Experience (from DB)
@@ -42,39 +63,20 @@ class ApplicationSerializer(serializers.ModelSerializer):
                 "duration": exp.duration
             })
         
-        # 2. Get Parsed Experience (from Resume Text)
+        # 2. Get Parsed Experience (ParsedWorkExperience rows, no JSON decoding)
         parsed_experience = []
-        if obj.resume_text:
-            try:
-                data = json.loads(obj.resume_text)
-                # Helper to handle both nested 'data' key or direct dict
-                resume_data = data.get('data', data) if isinstance(data, dict) else {}
-                
-                raw_parsed = resume_data.get('work_experience', [])
-                if not isinstance(raw_parsed, list):
-                    raw_parsed = []
-
-                # Normalize parsed data to match structure
-                for item in raw_parsed:
-                    if not isinstance(item, dict):
-                        continue
-                        
-                    # Parse returns company_name, job_role. Ensure keys match.
-                    # We use safe .get() and ensure we don't crash on missing keys
-                    # We also fallback to empty strings instead of None to help frontend
-                    company = item.get('company_name') or item.get('company') or "Unknown Company"
-                    role = item.get('job_role') or item.get('role') or "Unknown Role"
-                    duration = item.get('duration') or item.get('dates') or ""
-                    
-                    parsed_experience.append({
-                        "company_name": str(company),
-                        "job_role": str(role),
-                        "duration": str(duration)
-                    })
-            except Exception as e:
-                print(f"Error parsing work experience for App ID {obj.id}: {e}")
-                # Don't crash, just return what we have (or empty parsed)
-                pass
+        try:
+            parsed_resume = obj.parsed_resume
+        except ParsedResume.DoesNotExist:
+            parsed_resume = None
+        if parsed_resume is not None:
+            for exp in parsed_resume.work_experience.all():
+                # Fallback to placeholders instead of empty strings to help frontend
+                parsed_experience.append({
+                    "company_name": exp.company_name or "Unknown Company",
+                    "job_role": exp.job_role or "Unknown Role",
+                    "duration": exp.duration
+                })
 
         # Return combined (Manual first)
         return manual_experience + parsed_experience
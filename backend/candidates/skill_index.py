@@ -0,0 +1,166 @@
+"""
+Normalized skill index.
+
+Application.skills is a free-form JSON list ("ReactJS", "react", "Kafka "). Every
+entry is mapped to a Skill row keyed by its case-folded canonical name (taxonomy
+synonyms collapse onto one skill, see screenai/services/resume_parser/skills.py),
+and ApplicationSkill links the two. The links are rewritten whenever an
+application's skills change: model saves (parse pipeline, manual edits) through the
+signals below, bulk QuerySet.update(skills=...) through ApplicationQuerySet.
+
+all-of / any-of / none-of filters are then "id IN (posting list)" subqueries on
+the (skill, application) index instead of JSON scans in Python.
+`manage.py rebuild_skill_index` recomputes every link (e.g. after a taxonomy change).
+"""
+from django.db.models import Count
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from screenai.services.resume_parser.skills import get_skill_matcher, normalize_term
+from .models import Application, ApplicationSkill, Skill
+
+MAX_NAME_LENGTH = Skill._meta.get_field('name').max_length
+CHUNK_SIZE = 500
+
+
+def skill_key(term):
+    """(lookup key, display name) for a skill as written by a candidate or recruiter, None for blanks."""
+    display = get_skill_matcher().canonical_name(str(term)) or " ".join(str(term).split())
+    key = normalize_term(display)[:MAX_NAME_LENGTH]
+    return (key, display[:MAX_NAME_LENGTH]) if key else None
+
+
+def skill_keys(terms):
+    """{key: display name} for a list of skills, first spelling wins."""
+    keys = {}
+    for term in terms or []:
+        resolved = skill_key(term)
+        if resolved:
+            keys.setdefault(*resolved)
+    return keys
+
+
+def skill_ids(keys, create=False):
+    """{key: Skill id} for the given {key: display name}; unknown keys are created or left out."""
+    if create and keys:
+        Skill.objects.bulk_create(
+            [Skill(name=key, display_name=display) for key, display in keys.items()],
+            ignore_conflicts=True,
+        )
+    return dict(Skill.objects.filter(name__in=list(keys)).values_list('name', 'id'))
+
+
+def sync_skills(application_ids, skills_by_id=None):
+    """
+    Rewrites the ApplicationSkill links of the given applications from their skills
+    lists (read from the database unless skills_by_id already has them).
+    Returns (links added, links removed).
+    """
+    if skills_by_id is None:
+        application_ids = list(application_ids)
+        if len(application_ids) > CHUNK_SIZE:
+            totals = [sync_skills(application_ids[start:start + CHUNK_SIZE])
+                      for start in range(0, len(application_ids), CHUNK_SIZE)]
+            return sum(added for added, _ in totals), sum(removed for _, removed in totals)
+        skills_by_id = dict(Application.objects.filter(pk__in=application_ids).values_list('pk', 'skills'))
+    wanted = {pk: skill_keys(skills) for pk, skills in skills_by_id.items()}
+    all_keys = {}
+    for keys in wanted.values():
+        for key, display in keys.items():
+            all_keys.setdefault(key, display)
+    ids = skill_ids(all_keys, create=True)
+
+    current = {}
+    for application_id, skill_id in ApplicationSkill.objects.filter(application_id__in=list(wanted)).values_list('application_id', 'skill_id'):
+        current.setdefault(application_id, set()).add(skill_id)
+
+    added, removed = [], []
+    for application_id, keys in wanted.items():
+        target = {ids[key] for key in keys}
+        existing = current.get(application_id, set())
+        added += [ApplicationSkill(application_id=application_id, skill_id=skill_id) for skill_id in target - existing]
+        removed += [(application_id, skill_id) for skill_id in existing - target]
+
+    for application_id in {application_id for application_id, _ in removed}:
+        ApplicationSkill.objects.filter(
+            application_id=application_id,
+            skill_id__in=[skill_id for pk, skill_id in removed if pk == application_id],
+        ).delete()
+    ApplicationSkill.objects.bulk_create(added, batch_size=1000, ignore_conflicts=True)
+    return len(added), len(removed)
+
+
+# ------------ FILTERS ------------
+def resolve(**term_sets):
+    """
+    Resolves named skill lists with one query: resolve(all_of=['Python', 'kafka'])
+    -> {'all_of': [('Python', id), ('kafka', None)]}; None marks a skill nobody has.
+    """
+    keys = {name: skill_keys(terms) for name, terms in term_sets.items()}
+    ids = skill_ids({key: display for named in keys.values() for key, display in named.items()})
+    return {
+        name: [(display, ids.get(key)) for key, display in named.items()]
+        for name, named in keys.items()
+    }
+
+
+def posting_list(skill_ids):
+    """application_id subquery for applications having any of the skills."""
+    return ApplicationSkill.objects.filter(skill_id__in=skill_ids).values('application_id')
+
+
+def filter_by_skills(queryset, all_of=(), any_of=(), none_of=()):
+    """
+    Narrows an Application queryset by resolved skills ([(name, id or None)] lists from resolve()).
+    A required skill nobody has matches nothing; unknown any-of/none-of skills are ignored.
+    """
+    if all_of:
+        ids = [skill_id for _, skill_id in all_of]
+        if None in ids:
+            return queryset.none()
+        # Applications in every posting list: group the links of those skills, keep full groups
+        having_all = (
+            ApplicationSkill.objects.filter(skill_id__in=ids)
+            .values('application_id').annotate(matched=Count('skill_id'))
+            .filter(matched=len(set(ids))).values('application_id')
+        )
+        queryset = queryset.filter(id__in=having_all)
+    any_ids = [skill_id for _, skill_id in any_of if skill_id is not None]
+    if any_of:
+        queryset = queryset.filter(id__in=posting_list(any_ids)) if any_ids else queryset.none()
+    none_ids = [skill_id for _, skill_id in none_of if skill_id is not None]
+    if none_ids:
+        queryset = queryset.exclude(id__in=posting_list(none_ids))
+    return queryset
+
+
+def skill_counts(queryset, skills):
+    """[{'skill', 'applications'}]: how many applications of queryset have each skill, in one query."""
+    ids = [skill_id for _, skill_id in skills if skill_id is not None]
+    counts = {}
+    if ids:
+        counts = dict(
+            ApplicationSkill.objects.filter(skill_id__in=ids, application_id__in=queryset.order_by().values('id'))
+            .values('skill_id').annotate(n=Count('application_id')).order_by().values_list('skill_id', 'n')
+        )
+    return [{'skill': name, 'applications': counts.get(skill_id, 0)} for name, skill_id in skills]
+
+
+# ------------ SIGNALS (connected in CandidatesConfig.ready) ------------
+@receiver(post_init, sender=Application)
+def remember_skills(sender, instance, **kwargs):
+    # Copy: callers may edit the list in place before saving
+    skills = instance.__dict__.get('skills')
+    instance._stored_skills = list(skills) if isinstance(skills, list) else skills
+
+
+@receiver(post_save, sender=Application)
+def sync_skills_on_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or 'skills' not in instance.__dict__:
+        return
+    if update_fields is not None and 'skills' not in update_fields:
+        return
+    if instance.skills == ([] if created else instance._stored_skills):
+        return
+    sync_skills([instance.pk], {instance.pk: instance.skills})
+    instance._stored_skills = list(instance.skills or [])
@@ -1,3 +1,981 @@
-from django.test import TestCase
+import datetime
+import json
+import os
+import re
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import transaction
+from django.test import AsyncClient, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from appscreenai.models import Employee
+from jobs.models import JobPosting
+from .management.commands import parse_worker
+from .models import Candidate, Application, ApplicationComment, ApplicationEmbedding, ApplicationSkill, ApplicationDailyStat, ApplicationStatusTransition, DashboardEvent, Experience, JobEmbedding, ParseJob, ParsedResume, RescoreTask, Skill
+from . import vector_index
+from .embeddings import embed_applications, get_embedder
+from .rollup import rebuild
+from .serializers import ApplicationSerializer
+from .parsing import apply_parsed_resume, claim_next_job, enqueue_parse, heartbeat_jobs, requeue_stale_jobs, run_parse_job, save_parsed_resume
+from .scoring import (
+    PendingRescore, _is_queued, available_engine, claim_next_task, heartbeat_tasks, rank_applications, requeue_stale_tasks, run_rescore_task,
+    schedule_rescore,
+)
+from .search import get_backend, index_application
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+PARSED = {
+    "data": {
+        "candidate_name": "Jane Doe",
+        "email": "jane@test.com",
+        "phone": None,
+        "total_years_experience": 4.0,
+        "skills": ["Python"],
+        "education": ["BSc"],
+        "certifications": [],
+        "work_experience": [],
+        "screening_answers": [],
+    }
+}
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ParseJobQueueTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+        self.candidate = Candidate.objects.create(name="Jane Doe", email="jane@test.com")
+        self.application = Application.objects.create(
+            job=self.job,
+            candidate=self.candidate,
+            resume=SimpleUploadedFile("jane.pdf", b"%PDF-1.4"),
+            skills=["Django"],
+        )
+
+    def test_successful_job_updates_application(self):
+        enqueue_parse(self.application)
+        job = claim_next_job()
+        self.assertEqual((job.status, job.attempts), ('RUNNING', 1))
+        self.assertIsNone(claim_next_job())
+
+        with mock.patch("screenai.services.resume_parser.parser.parse_resume", return_value=PARSED):
+            self.assertTrue(run_parse_job(job))
+
+        job.refresh_from_db()
+        self.application.refresh_from_db()
+        self.assertEqual(job.status, 'DONE')
+        self.assertIsNone(self.application.resume_text)
+        self.assertEqual(sorted(self.application.skills), ["Django", "Python"])
+        self.assertEqual(self.application.total_years_experience, 4.0)
+        self.assertEqual(self.application.parsed_resume.candidate_name, "Jane Doe")
+
+    def test_failures_back_off_then_fail(self):
+        enqueue_parse(self.application)
+
+        with mock.patch("screenai.services.resume_parser.parser.parse_resume", side_effect=RuntimeError("boom")):
+            for attempt in range(1, 4):
+                ParseJob.objects.update(run_after=timezone.now())
+                job = claim_next_job()
+                self.assertEqual(job.attempts, attempt)
+                run_parse_job(job, backoff_seconds=10)
+                job.refresh_from_db()
+                if attempt < 3:
+                    self.assertEqual(job.status, 'QUEUED')
+                    # Not runnable again until the backoff expires
+                    self.assertGreater(job.run_after, timezone.now())
+                    self.assertIsNone(claim_next_job())
+
+        self.assertEqual(job.status, 'FAILED')
+        self.assertEqual(job.last_error, "boom")
+
+    def test_heartbeat_keeps_a_slow_job_from_being_requeued(self):
+        enqueue_parse(self.application)
+        job = claim_next_job()
+        ParseJob.objects.update(started_at=timezone.now() - datetime.timedelta(seconds=700))
+
+        self.assertEqual(heartbeat_jobs([job.id]), 1)
+        self.assertEqual(requeue_stale_jobs(600), 0)
+        ParseJob.objects.update(started_at=timezone.now() - datetime.timedelta(seconds=700))
+        self.assertEqual(requeue_stale_jobs(600), 1)
+
+    def test_lease_expiry_fails_jobs_out_of_attempts(self):
+        enqueue_parse(self.application)
+        for attempt in range(1, 4):
+            job = claim_next_job()
+            self.assertEqual(job.attempts, attempt)
+            # The worker died mid-parse
+            ParseJob.objects.update(started_at=timezone.now() - datetime.timedelta(seconds=700))
+            self.assertEqual(requeue_stale_jobs(600), 1 if attempt < 3 else 0)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertIn("Lease expired", job.last_error)
+        self.assertIsNone(claim_next_job())
+
+    def test_parse_status_reports_queued_then_done(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user("recruiter"))
+        url = reverse("application-parse-status")
+
+        response = client.get(url, {"ids": str(self.application.pk)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data[0]["application"], response.data[0]["status"]), (self.application.pk, None))
+
+        enqueue_parse(self.application)
+        response = client.get(url, {"job": self.job.pk})
+        self.assertEqual((response.data[0]["status"], response.data[0]["attempts"]), ("QUEUED", 0))
+
+        with mock.patch("screenai.services.resume_parser.parser.parse_resume", return_value=PARSED):
+            run_parse_job(claim_next_job())
+        status = client.get(url, {"ids": str(self.application.pk)}).data[0]
+        self.assertEqual((status["status"], status["attempts"], status["last_error"]), ("DONE", 1, ""))
+        self.assertIsNotNone(status["finished_at"])
+
+        self.assertEqual(client.get(url).status_code, 400)
+        self.assertEqual(client.get(url, {"ids": "1,x"}).status_code, 400)
+
+    def test_bulk_reparse_jobs_are_claimed_in_batches(self):
+        upload = enqueue_parse(self.application)
+        bulk = [
+            Application.objects.create(job=self.job, candidate=self.candidate, resume=f"resumes/{name}.pdf")
+            for name in ("a", "b", "c")
+        ]
+        # Parsed means a ParsedResume row, whatever resume_text holds
+        parsed = Application.objects.create(job=self.job, candidate=self.candidate, resume="resumes/d.pdf")
+        save_parsed_resume(parsed, PARSED)
+        Application.objects.filter(pk=bulk[0].pk).update(resume_text='{"data": {}}')
+        call_command("reparse_applications", stdout=StringIO())
+        self.assertEqual(ParseJob.objects.filter(batchable=True).count(), 3)
+        self.assertFalse(ParseJob.objects.filter(application=parsed).exists())
+
+        worker = parse_worker.Command()
+        # The upload is parsed on its own, the bulk jobs share one LLM request
+        self.assertEqual([job.id for job in worker._claim(settings.PARSE_WORKER_BATCH_SIZE)], [upload.id])
+        claimed = worker._claim(settings.PARSE_WORKER_BATCH_SIZE)
+        self.assertEqual([job.application_id for job in claimed], [app.id for app in bulk])
+        self.assertEqual(worker._claim(settings.PARSE_WORKER_BATCH_SIZE), [])
+
+
+class ParsedResumeTests(TestCase):
+    def setUp(self):
+        job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+        candidate = Candidate.objects.create(name="Jane Doe", email="jane@test.com")
+        legacy = {"data": dict(PARSED["data"], work_experience=[
+            {"company_name": "Acme", "job_role": "Engineer"},
+            {"company_name": "Globex", "job_role": "Lead"},
+        ])}
+        self.application = Application.objects.create(
+            job=job, candidate=candidate, resume="resumes/jane.pdf", resume_text=json.dumps(legacy),
+        )
+
+    def test_backfill_creates_typed_rows(self):
+        call_command('backfill_parsed_resumes', '--chunk-size', '1', stdout=StringIO())
+        call_command('backfill_parsed_resumes', stdout=StringIO())
+
+        parsed = ParsedResume.objects.get(application=self.application)
+        self.assertEqual(parsed.total_years_experience, 4.0)
+        self.assertEqual(list(parsed.work_experience.values_list('company_name', flat=True)), ["Acme", "Globex"])
+        self.assertTrue(ParsedResume.objects.filter(work_experience__job_role="Lead").exists())
+
+    def test_serializer_reads_rows_not_resume_text(self):
+        call_command('backfill_parsed_resumes', stdout=StringIO())
+        Application.objects.filter(id=self.application.id).update(resume_text="not json")
+
+        data = ApplicationSerializer(Application.objects.get(id=self.application.id)).data
+
+        self.assertEqual([e["company_name"] for e in data["work_experience"]], ["Acme", "Globex"])
+
+    def test_parse_records_the_extraction_tier(self):
+        unknown = Application.objects.create(
+            job=self.application.job, candidate=self.application.candidate, resume="resumes/jane2.pdf",
+        )
+        save_parsed_resume(self.application, dict(PARSED, extraction_tier="layout"))
+        save_parsed_resume(unknown, PARSED)
+
+        self.assertEqual(
+            dict(ParsedResume.objects.values_list('application_id', 'extraction_tier')),
+            {self.application.id: "layout", unknown.id: ""},
+        )
+
+
+class ApplicationQueryBudgetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+        for i in range(5):
+            self.add_application(job, i)
+
+    def add_application(self, job, i):
+        candidate = Candidate.objects.create(name=f"Candidate {i}", email=f"c{i}@test.com")
+        application = Application.objects.create(job=job, candidate=candidate, resume="resumes/c.pdf")
+        ApplicationComment.objects.create(application=application, text="Looks good")
+        Experience.objects.create(application=application, company="Acme", role="Engineer")
+        save_parsed_resume(application, PARSED)
+        return application
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        # One SELECT for the page (keyset pagination runs no COUNT)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('application-list'))
+        self.assertEqual(len(response.json()["results"]), 5)
+        self.assertEqual(response.json()["results"][0]["comments_count"], 1)
+        self.assertNotIn("comments", response.json()["results"][0])
+
+        self.add_application(JobPosting.objects.get(), 5)
+        with self.assertNumQueries(1):
+            self.client.get(reverse('application-list'), {"status": "NEW"})
+
+    def test_detail_keeps_the_full_payload(self):
+        application = Application.objects.first()
+        # Application row + comments + experiences + parsed work experience
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('application-detail', args=[application.id]))
+
+        data = response.json()
+        self.assertEqual(data["comments_count"], 1)
+        self.assertEqual(len(data["comments"]), 1)
+        self.assertEqual(data["work_experience"][0]["company_name"], "Acme")
+
+
+class ApplicationKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+        other_job = JobPosting.objects.create(title="Designer", location="Remote")
+        same_time = timezone.now()
+        for i in range(7):
+            candidate = Candidate.objects.create(name=f"Candidate {i}", email=f"c{i}@test.com")
+            Application.objects.create(job=self.job if i % 3 else other_job, candidate=candidate, resume="resumes/c.pdf")
+        # Ties on applied_at are broken by id
+        Application.objects.update(applied_at=same_time)
+
+    def walk(self, params):
+        ids, url = [], reverse('application-list')
+        response = self.client.get(url, params)
+        while True:
+            data = response.json()
+            ids.extend(row["id"] for row in data["results"])
+            if not data["next"]:
+                return ids, data
+            response = self.client.get(data["next"])
+
+    def test_pages_cover_every_row_once_in_order(self):
+        ids, _ = self.walk({"page_size": 2})
+        self.assertEqual(ids, list(Application.objects.order_by('-applied_at', '-id').values_list('id', flat=True)))
+
+        job_ids, _ = self.walk({"page_size": 2, "job": self.job.id})
+        self.assertEqual(job_ids, list(self.job.applications.order_by('-id').values_list('id', flat=True)))
+
+    def test_new_rows_do_not_shift_later_pages(self):
+        first = self.client.get(reverse('application-list'), {"page_size": 3}).json()
+        candidate = Candidate.objects.create(name="Late", email="late@test.com")
+        Application.objects.create(job=self.job, candidate=candidate, resume="resumes/c.pdf")
+
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+
+        seen = [row["id"] for row in first["results"] + second["results"]]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual([r["id"] for r in back["results"]], [r["id"] for r in first["results"]])
+
+    def test_optional_total(self):
+        data = self.client.get(reverse('application-list'), {"with_total": "true"}).json()
+        self.assertEqual((data["count"], data["count_is_approximate"]), (7, False))
+        self.assertNotIn("count", self.client.get(reverse('application-list')).json())
+        self.assertEqual(self.client.get(reverse('application-list'), {"cursor": "junk"}).status_code, 404)
+
+
+class QueryPlanTests(TestCase):
+    def test_main_queries_use_indexes_on_a_seeded_table(self):
+        out = StringIO()
+        call_command('explain_queries', '--seed', '3000', stdout=out)
+
+        self.assertIn("No full table scans", out.getvalue())
+        # Seeded rows are rolled back
+        self.assertFalse(Application.objects.exists())
+
+
+# Query counts of the analytics sections alone, without the version read of the "db" store
+@override_settings(ANALYTICS_VERSION_STORE="cache")
+class AnalyticsRollupTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+        cache.clear()
+
+    def apply(self, i, platform="LinkedIn"):
+        candidate = Candidate.objects.create(name=f"Candidate {i}", email=f"c{i}@test.com")
+        return Application.objects.create(job=self.job, candidate=candidate, resume="resumes/c.pdf", platform=platform)
+
+    def counts(self):
+        return {
+            (row.platform, row.status): row.applications
+            for row in ApplicationDailyStat.objects.filter(applications__gt=0)
+        }
+
+    def test_writes_keep_the_rollup_in_sync(self):
+        first = self.apply(1)
+        second = self.apply(2)
+        self.apply(3, platform="Indeed")
+        self.assertEqual(self.counts(), {("LinkedIn", "NEW"): 2, ("Indeed", "NEW"): 1})
+
+        first.status = "HIRED"
+        first.save()
+        # Loaded with the key fields deferred: the old row is still found
+        deferred = Application.objects.only('id').get(id=second.id)
+        deferred.status = "REJECTED"
+        deferred.save(update_fields=['status'])
+        Application.objects.get(platform="Indeed").delete()
+
+        expected = {("LinkedIn", "HIRED"): 1, ("LinkedIn", "REJECTED"): 1}
+        self.assertEqual(self.counts(), expected)
+        rebuild()
+        self.assertEqual(self.counts(), expected)
+
+    def test_analytics_reads_the_rollup(self):
+        for i in range(3):
+            self.apply(i)
+        Application.objects.filter(id=Application.objects.first().id).update(status="HIRED")
+        rebuild()
+
+        # One query per section: counts on ApplicationDailyStat, dated metrics on the
+        # status history, plus one for the job counts
+        with self.assertNumQueries(10):
+            data = self.client.get(reverse('analytics')).json()
+
+        self.assertEqual(data["summary"]["total_applications"], 3)
+        self.assertEqual(data["summary"]["total_hired"], 1)
+        self.assertEqual(data["summary"]["total_calls_today"], 3)
+        self.assertEqual(data["platform_performance"], [{"platform": "LinkedIn", "count": 3, "percentage": 33.3}])
+
+    def test_legacy_analytics_functions_use_one_query_each(self):
+        from appscreenai import api_views
+
+        for i in range(2):
+            self.apply(i)
+        user = User.objects.get(username="recruiter")
+
+        def call(view):
+            request = APIRequestFactory().get('/')
+            force_authenticate(request, user)
+            return view(request).data
+
+        with self.assertNumQueries(1):
+            daily = call(api_views.daily_applications)
+        with self.assertNumQueries(1):
+            weeks = call(api_views.weekly_trend)
+        with self.assertNumQueries(1):
+            team = call(api_views.hr_team_performance)
+
+        self.assertEqual(len(daily), 7)
+        self.assertEqual(daily[-1]["count"], 2)
+        self.assertEqual([w["applications"] for w in weeks], [0, 0, 0, 2])
+        self.assertEqual(team[0]["name"], "Unknown Recruiter")
+
+
+class StatusHistoryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+        self.applications = [
+            Application.objects.create(
+                job=self.job,
+                candidate=Candidate.objects.create(name=f"Candidate {i}", email=f"c{i}@test.com"),
+                resume="resumes/c.pdf",
+            )
+            for i in range(3)
+        ]
+
+    def history(self, application):
+        return list(application.status_transitions.order_by('id').values_list('from_status', 'to_status'))
+
+    def test_saves_and_bulk_updates_are_recorded(self):
+        first, second, third = self.applications
+        first.status = "INTERVIEW"
+        first.save()
+        first.save()  # no change, no row
+        Application.objects.filter(id__in=[second.id, third.id]).update(status="REJECTED")
+        Application.objects.filter(id=third.id).update(status="REJECTED")  # already rejected
+
+        self.assertEqual(self.history(first), [("", "NEW"), ("NEW", "INTERVIEW")])
+        self.assertEqual(self.history(third), [("", "NEW"), ("NEW", "REJECTED")])
+        self.assertIsNotNone(first.status_transitions.get(to_status="INTERVIEW").seconds_in_previous_status)
+
+        # The bulk update moved the rollup counts as well
+        counts = {row.status: row.applications for row in ApplicationDailyStat.objects.filter(applications__gt=0)}
+        self.assertEqual(counts, {"INTERVIEW": 1, "REJECTED": 2})
+
+    def test_hired_this_month_uses_the_change_date(self):
+        old, recent, _ = self.applications
+        # Hired long ago: only the transition date says so
+        Application.objects.filter(id=old.id).update(status="HIRED")
+        ApplicationStatusTransition.objects.filter(application=old, to_status="HIRED").update(
+            changed_at=timezone.now() - datetime.timedelta(days=400))
+        recent.status = "OFFER"
+        recent.save()
+
+        data = self.client.get(reverse('analytics')).json()
+
+        self.assertEqual(data["summary"]["hired_this_month"], 1)
+        funnel = {row["status"]: row["applications"] for row in data["funnel"]}
+        self.assertEqual((funnel["NEW"], funnel["OFFER"], funnel["HIRED"]), (3, 1, 0))
+        self.assertEqual([row["status"] for row in data["stage_velocity"]], ["NEW"])
+
+
+class AnalyticsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+
+    def apply(self, i):
+        candidate = Candidate.objects.create(name=f"Candidate {i}", email=f"c{i}@test.com")
+        Application.objects.create(job=self.job, candidate=candidate, resume="resumes/c.pdf")
+
+    @override_settings(ANALYTICS_VERSION_STORE="cache")
+    def test_polling_gets_304_without_queries_until_a_write(self):
+        self.apply(1)
+        first = self.client.get(reverse('analytics'), {"range": "7d"})
+        etag = first["ETag"]
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse('analytics'), {"range": "7d"})
+            not_modified = self.client.get(reverse('analytics'), {"range": "7d"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.json(), first.json())
+        self.assertEqual(not_modified.status_code, 304)
+
+        # Scoped per range and per employee
+        self.assertNotEqual(self.client.get(reverse('analytics'), {"range": "1y"})["ETag"], etag)
+        self.assertNotEqual(self.client.get(reverse('analytics'), {"range": "7d"}, HTTP_X_EMPLOYEE_ID="5")["ETag"], etag)
+
+        self.apply(2)
+        fresh = self.client.get(reverse('analytics'), {"range": "7d"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.json()["summary"]["total_applications"], 2)
+
+    def test_db_version_reaches_processes_with_their_own_cache(self):
+        self.apply(1)
+        etag = self.client.get(reverse('analytics'))["ETag"]
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(reverse('analytics'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A write in another process bumps the shared row, not this process's cache
+        with mock.patch("candidates.analytics_cache.cache.incr") as incr:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.apply(2)
+        incr.assert_not_called()
+
+        fresh = self.client.get(reverse('analytics'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertEqual(fresh.json()["summary"]["total_applications"], 2)
+
+
+class ResumeSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(title="Backend Engineer", location="Remote")
+
+    def apply(self, name, skills, body):
+        candidate = Candidate.objects.create(name=name, email=f"{name.replace(' ', '.').lower()}@test.com")
+        application = Application.objects.create(job=self.job, candidate=candidate, resume="resumes/c.pdf", skills=skills)
+        index_application(application, body)
+        return application
+
+    def search(self, **params):
+        response = self.client.get(reverse('application-search'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_ranked_search_with_snippets(self):
+        self.assertEqual(type(get_backend()).__name__, "SqliteSearchBackend")
+        skilled = self.apply("Ana Kafka", ["Kafka", "Python"], "Payments platform at a fintech startup.")
+        mentioned = self.apply("Ben Ops", ["Go"], "Ran Kafka clusters for a fintech <bank>.")
+        self.apply("Cy Web", ["React"], "Kafka curious frontend developer.")
+        for i in range(4):
+            self.apply(f"Filler {i}", ["Java"], "Warehouse systems.")
+
+        results = self.search(q="kafka + fintech")
+
+        # Both words required; a skills match outranks a mention in the resume body
+        self.assertEqual([r["id"] for r in results], [skilled.id, mentioned.id])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+        self.assertIn("<mark>", results[1]["snippet"])
+        self.assertIn("&lt;bank&gt;", results[1]["snippet"])
+        self.assertEqual(results[0]["candidate_details"]["name"], "Ana Kafka")
+
+        self.assertEqual(self.search(q="kafka", status="HIRED"), [])
+        self.assertEqual(self.client.get(reverse('application-search')).status_code, 400)
+
+    def test_parse_refreshes_the_document(self):
+        application = self.apply("Dee Data", [], "Spark pipelines at a hospital.")
+        self.assertEqual(self.search(q="python"), [])
+
+        apply_parsed_resume(application, PARSED)
+
+        self.assertEqual([r["id"] for r in self.search(q="python")], [application.id])
+        # The resume file could not be read here, so the old body is kept
+        self.assertEqual([r["id"] for r in self.search(q="hospital")], [application.id])
+
+
+class SkillIndexTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(title="Backend Engineer", location="Remote", required_skills=["python", "Kafka"])
+
+    def apply(self, name, skills):
+        candidate = Candidate.objects.create(name=name, email=f"{name.lower()}@test.com")
+        return Application.objects.create(job=self.job, candidate=candidate, resume="resumes/c.pdf", skills=skills)
+
+    def ids(self, **params):
+        response = self.client.get(reverse('application-list'), params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(r["id"] for r in response.json()["results"])
+
+    def test_synonyms_and_case_collapse_to_one_skill(self):
+        self.apply("Ana", ["ReactJS", "Python"])
+        self.apply("Ben", ["react", "python ", "PYTHON"])
+
+        self.assertEqual(Skill.objects.filter(name="react").count(), 1)
+        self.assertEqual(Skill.objects.get(name="react").application_links.count(), 2)
+        self.assertEqual(ApplicationSkill.objects.count(), 4)
+
+    def test_all_any_and_none_filters(self):
+        ana = self.apply("Ana", ["Python", "Kafka", "Docker"])
+        ben = self.apply("Ben", ["Python", "Go"])
+        cy = self.apply("Cy", ["kafka", "python", "k8s"])
+        self.apply("Dee", ["Java"])
+
+        self.assertEqual(self.ids(skills_all="python,kafka"), [ana.id, cy.id])
+        self.assertEqual(self.ids(skills_any="go,docker"), [ana.id, ben.id])
+        self.assertEqual(self.ids(skills_all="python", skills_none="kubernetes"), [ana.id, ben.id])
+        self.assertEqual(self.ids(skills_all="python,cobol"), [])
+        self.assertEqual(self.ids(job=self.job.id, has_required_skills="true"), [ana.id, cy.id])
+
+        response = self.client.get(reverse('application-list'), {"skills_all": "python", "skills_any": "Kafka,cobol"})
+        self.assertEqual(response.json()["skill_counts"], [
+            {"skill": "Python", "applications": 3},
+            {"skill": "Kafka", "applications": 2},
+            {"skill": "cobol", "applications": 0},
+        ])
+        self.assertNotIn("skill_counts", self.client.get(reverse('application-list')).json())
+
+    def test_links_follow_skill_changes(self):
+        application = self.apply("Ana", ["Python"])
+        self.assertEqual(self.ids(skills_all="go"), [])
+
+        application.skills.append("Go")
+        application.save()
+        self.assertEqual(self.ids(skills_all="go,python"), [application.id])
+
+        Application.objects.filter(pk=application.pk).update(skills=["Rust"])
+        self.assertEqual(self.ids(skills_any="go,python"), [])
+        self.assertEqual(self.ids(skills_all="rust"), [application.id])
+
+        apply_parsed_resume(Application.objects.get(pk=application.pk), PARSED)
+        self.assertEqual(self.ids(skills_all="python"), [application.id])
+
+    def test_filtered_list_query_budget(self):
+        self.apply("Ana", ["Python", "Kafka"])
+        # Resolve skills, page, skill counts
+        with self.assertNumQueries(3):
+            self.client.get(reverse('application-list'), {"skills_all": "python", "skills_none": "go"})
+
+
+class RankingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(
+            title="Backend Engineer", location="Remote", required_skills=["Python", "Kafka", "Docker", "AWS"],
+            previous_companies=["Acme"], previous_roles=[], min_experience=4,
+            expected_ctc_limit=20, notice_period_days=30,
+        )
+
+    def apply(self, name, skills, years=None, ctc=None, notice=None, company=None):
+        candidate = Candidate.objects.create(name=name, email=f"{name.lower()}@test.com")
+        application = Application.objects.create(
+            job=self.job, candidate=candidate, resume="resumes/c.pdf", skills=skills,
+            experience_years=years, expected_ctc=ctc, notice_period=notice,
+        )
+        if company:
+            Experience.objects.create(application=application, company=company, role="Engineer")
+        return application
+
+    def test_ranks_every_applicant_with_a_breakdown(self):
+        best = self.apply("Ana", ["python", "Kafka", "docker", "AWS"], years=6, ctc=18, notice=30, company="Acme Corp")
+        middle = self.apply("Ben", ["Python", "Kafka"], years=2, ctc=40, notice=90)
+        worst = self.apply("Cy", ["Java"])
+
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('application-ranking'), {"job": self.job.id})
+        body = response.json()
+
+        self.assertEqual(body["scored"], 3)
+        self.assertEqual([r["id"] for r in body["results"]], [best.id, middle.id, worst.id])
+        self.assertEqual(body["results"][0]["score"], 100.0)
+        self.assertEqual(body["results"][0]["missing_skills"], [])
+        # Weights rescaled without previous_roles: skills 50/90 of the score, half of them matched
+        self.assertEqual(body["results"][1]["breakdown"]["skills"], 27.8)
+        self.assertEqual(body["results"][1]["breakdown"]["ctc"], 5.6)
+        self.assertEqual(body["results"][1]["missing_skills"], ["Docker", "AWS"])
+        self.assertEqual(body["results"][2]["breakdown"]["notice"], 2.8)
+
+        self.assertEqual(self.client.get(reverse('application-ranking')).status_code, 400)
+        self.assertEqual(self.client.get(reverse('application-ranking'), {"job": 999}).status_code, 404)
+
+    @skipIf(available_engine() != "numpy", "NumPy is not installed")
+    def test_engines_agree(self):
+        for i in range(30):
+            self.apply(f"Cand{i}", ["Python", "Kafka", "Docker", "AWS", "Go"][: i % 6], years=i % 8 or None,
+                       ctc=10 + i if i % 4 else None, notice=(i * 15) % 120, company="Acme" if i % 5 == 0 else None)
+
+        numpy_ranking = rank_applications(self.job, limit=30, engine="numpy")
+        python_ranking = rank_applications(self.job, limit=30, engine="python")
+        self.assertEqual(numpy_ranking.results, python_ranking.results)
+
+
+@override_settings(RESCORE_CHUNK_SIZE=2)
+class MatchScoreTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(
+            title="Backend Engineer", location="Remote", required_skills=["Python", "Kafka"],
+            min_experience=2, expected_ctc_limit=20, notice_period_days=30,
+        )
+
+    def apply(self, name, skills, **fields):
+        candidate = Candidate.objects.create(name=name, email=f"{name.lower()}@test.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            return Application.objects.create(job=self.job, candidate=candidate, resume="resumes/c.pdf", skills=skills, **fields)
+
+    def test_scores_follow_application_edits_and_parses(self):
+        application = self.apply("Ana", ["Python"], experience_years=3, expected_ctc=15, notice_period=30)
+        application.refresh_from_db()
+        self.assertEqual(application.match_score, 68.8)  # skills 25 + experience 15 + ctc 10 + notice 5, out of 80
+        self.assertEqual(application.score_breakdown["missing_skills"], ["Kafka"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.skills.append("kafka")
+            application.save()
+        application.refresh_from_db()
+        self.assertEqual(application.match_score, 100.0)
+
+        # Unscored fields do not trigger a rescore
+        with mock.patch("candidates.scoring.rescore_applications") as rescore:
+            with self.captureOnCommitCallbacks(execute=True):
+                Application.objects.filter(pk=application.pk).update(status="INTERVIEW")
+                application.notes = "Strong"
+                application.save()
+        rescore.assert_not_called()
+
+        with mock.patch("candidates.scoring.rescore_applications") as rescore:
+            with self.captureOnCommitCallbacks(execute=True):
+                apply_parsed_resume(Application.objects.get(pk=application.pk), PARSED)
+        rescore.assert_called_once_with({application.pk})
+
+    def test_rolled_back_saves_are_not_rescored_later(self):
+        with mock.patch("candidates.scoring.rescore_applications") as rescore:
+            with self.captureOnCommitCallbacks(execute=True):
+                with self.assertRaises(RuntimeError):
+                    with transaction.atomic():
+                        schedule_rescore([1])
+                        raise RuntimeError("rolled back")
+                schedule_rescore([2])
+                schedule_rescore([3])
+        rescore.assert_called_once_with({2, 3})
+
+    def test_unreadable_commit_queue_starts_a_new_batch(self):
+        batch = PendingRescore()
+        self.assertTrue(_is_queued(mock.Mock(run_on_commit=[(set(), batch, True)]), batch))
+        self.assertFalse(_is_queued(mock.Mock(run_on_commit=[object()]), batch))
+        self.assertFalse(_is_queued(mock.Mock(spec=[]), batch))
+
+    def test_criteria_change_rescores_in_background(self):
+        applications = [self.apply(name, ["Python"], experience_years=5) for name in ("Ana", "Ben", "Cy")]
+
+        self.job.required_skills = ["Go"]
+        self.job.save()
+        self.assertEqual(RescoreTask.objects.filter(status="QUEUED").count(), 2)
+        self.job.save()  # unchanged criteria queue nothing new
+        self.assertEqual(RescoreTask.objects.count(), 2)
+
+        call_command("rescore_worker", "--once", stdout=StringIO())
+
+        self.assertFalse(RescoreTask.objects.exclude(status="DONE").exists())
+        for application in applications:
+            application.refresh_from_db()
+            self.assertEqual(application.score_breakdown["missing_skills"], ["Go"])
+            self.assertEqual(application.score_breakdown["points"]["skills"], 0)
+
+    def test_rescore_tasks_retry_then_fail(self):
+        self.apply("Ana", ["Python"])
+        self.job.required_skills = ["Go"]
+        self.job.save()
+
+        # A crashing chunk is retried, then given up on
+        with mock.patch("candidates.scoring.store_scores", side_effect=RuntimeError("boom")):
+            for attempt in range(1, 4):
+                task = claim_next_task()
+                self.assertEqual(task.attempts, attempt)
+                run_rescore_task(task)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.last_error), ("FAILED", "boom"))
+
+    def test_rescore_lease_heartbeat_and_expiry(self):
+        self.apply("Ana", ["Python"])
+        self.job.required_skills = ["Go"]
+        self.job.save()
+        long_ago = timezone.now() - datetime.timedelta(seconds=400)
+
+        task = claim_next_task()
+        RescoreTask.objects.update(started_at=long_ago)
+        self.assertEqual(heartbeat_tasks([task.id]), 1)
+        self.assertEqual(requeue_stale_tasks(300), 0)
+
+        # A worker that dies on every attempt: requeued until the attempts run out
+        for attempt in range(1, 4):
+            if attempt > 1:
+                task = claim_next_task()
+            RescoreTask.objects.update(started_at=long_ago)
+            self.assertEqual(requeue_stale_tasks(300), 1 if attempt < 3 else 0)
+        task.refresh_from_db()
+        self.assertEqual(task.status, "FAILED")
+        self.assertIn("Lease expired", task.last_error)
+        self.assertIsNone(claim_next_task())
+
+    def test_list_orders_by_match_score(self):
+        low = self.apply("Ana", ["Java"], experience_years=0)
+        high = self.apply("Ben", ["Python", "Kafka"], experience_years=5)
+        middle = self.apply("Cy", ["Python"], experience_years=5)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("application-list"), {"job": self.job.id, "ordering": "-match_score", "page_size": 2})
+        body = response.json()
+        self.assertEqual([r["id"] for r in body["results"]], [high.id, middle.id])
+        self.assertGreater(body["results"][0]["match_score"], body["results"][1]["match_score"])
+
+        next_page = self.client.get(body["next"]).json()
+        self.assertEqual([r["id"] for r in next_page["results"]], [low.id])
+
+
+class EmbeddingTests(TestCase):
+    def setUp(self):
+        vector_index.reset()
+        self.addCleanup(vector_index.reset)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user("recruiter"))
+        self.job = JobPosting.objects.create(
+            title="Platform Engineer", location="Remote", required_skills=["Kubernetes", "Terraform"],
+            description="Run our Kubernetes clusters and Terraform modules on AWS.",
+        )
+        self.other_job = JobPosting.objects.create(title="Frontend Developer", location="Remote")
+
+    def apply(self, name, resume_text, job=None, candidate=None):
+        candidate = candidate or Candidate.objects.create(name=name, email=f"{name.lower()}@test.com")
+        application = Application.objects.create(job=job or self.job, candidate=candidate, resume="resumes/c.pdf")
+        embed_applications([index_application(application, resume_text)])
+        return application
+
+    def test_embedder_is_deterministic_and_matches_synonyms(self):
+        embedder = get_embedder()
+        first, second, unrelated = embedder.embed([
+            "Operated k8s clusters with Helm", "Kubernetes platform engineer", "Watercolour painting classes",
+        ])
+        self.assertEqual(first, embedder.embed(["Operated k8s clusters with Helm"])[0])
+        self.assertAlmostEqual(sum(value * value for value in first), 1.0, places=6)
+        self.assertGreater(
+            sum(x * y for x, y in zip(first, second)), sum(x * y for x, y in zip(first, unrelated)),
+        )
+
+    def test_semantic_search_ranks_candidates_for_a_job(self):
+        ops = self.apply("Ana", "Site reliability engineer running k8s and terraform on AWS", job=self.other_job)
+        frontend = self.apply("Ben", "React and CSS developer building design systems")
+        url = reverse("application-semantic")
+
+        response = self.client.get(url, {"job": self.job.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data["results"]], [ops.id, frontend.id])
+        self.assertGreater(response.data["results"][0]["similarity"], response.data["results"][1]["similarity"])
+
+        response = self.client.get(url, {"job": self.job.id, "applicants_only": "true"})
+        self.assertEqual([row["id"] for row in response.data["results"]], [frontend.id])
+
+        # New vectors are picked up by the already-loaded index
+        devops = self.apply("Cy", "Kubernetes operator and Terraform module author")
+        response = self.client.get(url, {"job": self.job.id, "applicants_only": "true", "limit": 1})
+        self.assertEqual([row["id"] for row in response.data["results"]], [devops.id])
+
+        self.assertEqual(self.client.get(url, {"job": "x"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"job": 0}).status_code, 404)
+
+    def test_similar_candidates_exclude_the_same_person(self):
+        ana = self.apply("Ana", "Kubernetes and Terraform on AWS")
+        self.apply("Ana", "Kubernetes, Helm and Terraform", job=self.other_job, candidate=ana.candidate)
+        ben = self.apply("Ben", "k8s clusters, Terraform and AWS networking")
+        self.apply("Cy", "React and CSS developer", job=self.other_job)
+
+        response = self.client.get(reverse("application-similar", args=[ana.id]), {"limit": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data["results"]], [ben.id])
+
+        unparsed = Application.objects.create(job=self.job, candidate=ben.candidate, resume="resumes/c.pdf")
+        response = self.client.get(reverse("application-similar", args=[unparsed.id]))
+        self.assertEqual(response.status_code, 409)
+
+    def test_refresh_picks_up_rows_committed_after_newer_ones(self):
+        first = self.apply("Ana", "Kubernetes and Terraform on AWS")
+        index = vector_index.get_index()
+        self.assertEqual(index.refresh(), 0)  # re-read rows that are already loaded are skipped
+
+        # A parse that stamped its vector before Ana's but committed after the refresh
+        late = self.apply("Ben", "k8s clusters, Terraform and AWS networking")
+        stamp = ApplicationEmbedding.objects.get(application=first).updated_at - datetime.timedelta(seconds=60)
+        ApplicationEmbedding.objects.filter(application=late).update(updated_at=stamp)
+
+        self.assertEqual(index.refresh(), 1)
+        self.assertIn(late.id, index.position)
+        self.assertEqual(index.refresh(), 0)
+
+    def test_deleted_applications_are_evicted(self):
+        ana = self.apply("Ana", "Kubernetes and Terraform on AWS")
+        ben = self.apply("Ben", "k8s clusters, Terraform and AWS networking")
+        cy = self.apply("Cy", "Terraform modules and Kubernetes operators")
+        index = vector_index.get_index()
+        self.assertEqual(len(vector_index.candidates_for_job(self.job)), 3)
+
+        ben.delete()
+        hits = vector_index.candidates_for_job(self.job)
+        self.assertEqual({application_id for application_id, _ in hits}, {ana.id, cy.id})
+        self.assertNotIn(ben.id, index.position)
+        self.assertEqual([application_id for application_id, _ in vector_index.similar_candidates(ana)], [cy.id])
+        self.assertEqual(len(vector_index.candidates_for_job(self.job, applicants_only=True)), 2)
+
+    def test_rebuild_embeddings_command(self):
+        application = self.apply("Ana", "Kubernetes")
+        ApplicationEmbedding.objects.all().delete()
+        JobEmbedding.objects.all().delete()
+        call_command("rebuild_embeddings", stdout=StringIO())
+        self.assertTrue(ApplicationEmbedding.objects.filter(application=application, model=get_embedder().name).exists())
+        self.assertEqual(JobEmbedding.objects.count(), 2)
+
+
+@override_settings(DASHBOARD_EVENTS_POLL_SECONDS=0.01, DASHBOARD_EVENTS_STREAM_SECONDS=0)
+class DashboardEventTests(TestCase):
+    def setUp(self):
+        alice = Employee.objects.create(email="alice@test.com", password="x")
+        Employee.objects.create(email="bob@test.com", password="x")
+        self.alice_token = Token.objects.create(user=User.objects.create_user("alice@test.com")).key
+        self.bob_token = Token.objects.create(user=User.objects.create_user("bob@test.com")).key
+        self.alice_id = alice.id
+
+        job = JobPosting.objects.create(title="Backend Engineer", location="Remote", recruiter=alice)
+        candidate = Candidate.objects.create(name="Jane Doe", email="jane@test.com")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.application = Application.objects.create(job=job, candidate=candidate, resume="resumes/jane.pdf")
+
+    def test_writes_and_parses_publish_events_for_the_recruiter(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = Application.objects.defer('resume_text').get(pk=self.application.pk)
+            application.notes = "Strong profile"
+            application.save()
+            application.status = 'INTERVIEW'
+            application.save()
+
+        enqueue_parse(self.application)
+        with mock.patch("screenai.services.resume_parser.parser.parse_resume", return_value=PARSED):
+            with self.captureOnCommitCallbacks(execute=True):
+                run_parse_job(claim_next_job())
+
+        events = list(DashboardEvent.objects.order_by('id'))
+        self.assertEqual([e.kind for e in events], ['application.created', 'application.status_changed', 'parse.finished'])
+        self.assertEqual({e.recruiter_id for e in events}, {self.alice_id})
+        self.assertEqual((events[1].payload['from'], events[1].payload['to']), ('NEW', 'INTERVIEW'))
+        self.assertEqual(events[2].payload['status'], 'DONE')
+
+    async def stream(self, **params):
+        response = await AsyncClient().get(reverse('dashboard-events'), params)
+        if response.status_code != 200:
+            return response.status_code, ''
+        return 200, ''.join([chunk.decode() async for chunk in response.streaming_content])
+
+    async def test_stream_is_scoped_to_the_recruiter(self):
+        status_code, body = await self.stream(token=self.alice_token, last_event_id=0)
+        self.assertEqual(status_code, 200)
+        self.assertIn("event: application.created", body)
+        self.assertIn(f'"application_id": {self.application.pk}', body)
+
+        # Bob has no jobs; a new connection without Last-Event-ID starts at the newest event
+        self.assertNotIn("event:", (await self.stream(token=self.bob_token, last_event_id=0))[1])
+        self.assertNotIn("event:", (await self.stream(token=self.alice_token))[1])
+        self.assertEqual((await self.stream())[0], 401)
+
+    async def test_event_between_connections_is_delivered_on_reconnect(self):
+        _, body = await self.stream(token=self.alice_token)
+        self.assertNotIn("event:", body)
+        # The first message carries the starting id even though no event was sent
+        last_id = re.search(r"^id: (\d+)$", body, re.M).group(1)
+
+        await DashboardEvent.objects.acreate(
+            kind="application.status_changed", recruiter_id=self.alice_id,
+            application_id=self.application.pk, payload={"from": "NEW", "to": "INTERVIEW"},
+        )
+        response = await AsyncClient().get(
+            reverse('dashboard-events'), {"token": self.alice_token}, headers={"Last-Event-ID": last_id},
+        )
+        body = ''.join([chunk.decode() async for chunk in response.streaming_content])
+        self.assertIn("event: application.status_changed", body)
+        self.assertIn('"to": "INTERVIEW"', body)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class QuickScanResumeTests(TestCase):
+    def test_scans_upload_without_touching_storage(self):
+        with open(os.path.join(settings.BASE_DIR, "resumes", "eduRESUME.pdf"), "rb") as f:
+            upload = SimpleUploadedFile("eduRESUME.pdf", f.read(), content_type="application/pdf")
+
+        response = self.client.post(reverse('resume-quick-scan'), {"resume": upload})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("email", response.json()["data"])
+        self.assertFalse(os.path.exists(os.path.join(MEDIA_ROOT, "temp")))
+
+    def test_unsupported_formats_are_rejected(self):
+        response = self.client.post(reverse('resume-quick-scan'), {"resume": SimpleUploadedFile("cv.doc", b"Jane Doe")})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Legacy .doc format not supported", response.json()["error"])
+
+        response = self.client.post(reverse('resume-quick-scan'), {"resume": SimpleUploadedFile("cv.txt", b"Jane Doe")})
+        self.assertEqual(response.status_code, 400)
+
+
+class StartupImportTests(SimpleTestCase):
+    def test_web_app_boots_without_the_parsing_stack(self):
+        out = StringIO()
+        call_command('startup_benchmark', '--subsystem', 'web', '--repeat', '1', '--json', stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())['web']['heavy_loaded'], [])
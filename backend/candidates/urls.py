@@ -1,14 +1,20 @@
 from django.urls import path
-from .views import ApplicationListCreateView, ApplicationDetailView, AddCommentView, DashboardStatsView, ParseApplicationResumeView, PreviewResumeView, AnalyticsView, QuickScanResumeView
+from .views import ApplicationListCreateView, ApplicationDetailView, AddCommentView, DashboardStatsView, ParseApplicationResumeView, PreviewResumeView, AnalyticsView, QuickScanResumeView, ParseStatusView, DashboardEventStreamView, ApplicationSearchView, ApplicationRankingView, SemanticCandidatesView, SimilarCandidatesView
 
 urlpatterns = [
     path('applications/', ApplicationListCreateView.as_view(), name='application-list'),
     path('applications/<int:pk>/', ApplicationDetailView.as_view(), name='application-detail'),
     path('applications/<int:pk>/parse/', ParseApplicationResumeView.as_view(), name='application-parse'),
     path('applications/<int:pk>/comments/', AddCommentView.as_view(), name='add-comment'),
+    path('applications/<int:pk>/similar/', SimilarCandidatesView.as_view(), name='application-similar'),
+    path('applications/search/', ApplicationSearchView.as_view(), name='application-search'),
+    path('applications/ranking/', ApplicationRankingView.as_view(), name='application-ranking'),
+    path('applications/semantic/', SemanticCandidatesView.as_view(), name='application-semantic'),
+    path('applications/parse-status/', ParseStatusView.as_view(), name='application-parse-status'),
     path('applications/preview/', PreviewResumeView.as_view(), name='resume-preview'),
     path('applications/quick-scan/', QuickScanResumeView.as_view(), name='resume-quick-scan'),
     path('dashboard/stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
     path('analytics/', AnalyticsView.as_view(), name='analytics'),
+    path('events/', DashboardEventStreamView.as_view(), name='dashboard-events'),
 ]
 
@@ -0,0 +1,268 @@
+"""
+In-memory nearest-neighbour index over the stored application embeddings.
+
+Each process keeps one VectorIndex per embedder, loaded from ApplicationEmbedding on
+first use. Every query first reads the rows written since the previous one, minus a
+safety window for transactions that commit late (an indexed (model, updated_at)
+range), so new parses show up without a reload. Vectors are unit length, so similarity is a dot product:
+
+    NumPy       exact search, one matrix-vector product over the pool (the default)
+    hnswlib     approximate HNSW graph once the pool reaches EMBEDDING_HNSW_MIN_ITEMS
+    neither     exact search in pure Python (slow on large pools, but works)
+
+Queries limited to one job's applicants always run exactly over that subset. Results
+keep the best application per candidate. Hits are checked against Application in one
+query, and rows of applications deleted since they were loaded are evicted.
+"""
+import datetime
+import importlib
+import threading
+
+from django.conf import settings
+
+from .embeddings import get_embedder, job_vector, unpack
+from .models import Application, ApplicationEmbedding
+
+# Extra neighbours fetched so that de-duplicating candidates still fills the page
+OVERFETCH = 3
+
+
+def _optional(module):
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        return None
+
+
+class VectorIndex:
+    def __init__(self, model, dimensions):
+        self.model = model
+        self.dimensions = dimensions
+        self.np = _optional('numpy')
+        self.hnswlib = _optional('hnswlib')
+        self.lock = threading.Lock()
+        self.watermark = None
+        # application_id -> updated_at of the loaded vector
+        self.stamps = {}
+        self.position = {}
+        self.ids, self.job_ids, self.candidate_ids = [], [], []
+        self.size = 0
+        self.matrix = self.np.zeros((0, dimensions), dtype=self.np.float32) if self.np else []
+        # False for rows of deleted applications
+        self.alive = self.np.zeros(0, dtype=bool) if self.np else []
+        self.evicted = 0
+        self.graph = None
+
+    @property
+    def engine(self):
+        if self.graph is not None:
+            return 'hnsw'
+        return 'numpy' if self.np else 'python'
+
+    # ------------ LOADING ------------
+    def refresh(self):
+        """Loads the embeddings written since the last refresh (all of them the first time)."""
+        with self.lock:
+            rows = ApplicationEmbedding.objects.filter(model=self.model)
+            if self.watermark is not None:
+                # updated_at is stamped when the row is written, not when its transaction
+                # commits: a parse that stamped earlier can commit after a newer row was
+                # loaded. Re-read a window of EMBEDDING_REFRESH_LAG_SECONDS behind the newest
+                # row so it is still picked up; rows already loaded with that stamp are skipped.
+                lag = datetime.timedelta(seconds=settings.EMBEDDING_REFRESH_LAG_SECONDS)
+                rows = rows.filter(updated_at__gte=self.watermark - lag)
+            rows = rows.order_by('updated_at').values_list(
+                'application_id', 'application__job_id', 'application__candidate_id', 'vector', 'updated_at',
+            )
+            changed = []
+            for application_id, job_id, candidate_id, vector, updated_at in rows.iterator(chunk_size=2000):
+                if self.watermark is None or updated_at > self.watermark:
+                    self.watermark = updated_at
+                if self.stamps.get(application_id) == updated_at:
+                    continue
+                self.stamps[application_id] = updated_at
+                changed.append((application_id, job_id, candidate_id, unpack(vector)))
+            if changed:
+                self._upsert(changed)
+            return len(changed)
+
+    def _upsert(self, rows):
+        new = [row for row in rows if row[0] not in self.position]
+        if self.np:
+            grow = self.size + len(new) - len(self.matrix)
+            if grow > 0:
+                extra = max(grow, len(self.matrix) // 2)
+                self.matrix = self.np.vstack([self.matrix, self.np.zeros((extra, self.dimensions), dtype=self.np.float32)])
+                self.alive = self.np.concatenate([self.alive, self.np.zeros(extra, dtype=bool)])
+        for application_id, job_id, candidate_id, vector in rows:
+            row = self.position.get(application_id)
+            if row is None:
+                row = self.position[application_id] = self.size
+                self.ids.append(application_id)
+                self.job_ids.append(job_id)
+                self.candidate_ids.append(candidate_id)
+                if self.np:
+                    self.alive[row] = True
+                else:
+                    self.matrix.append(vector)
+                    self.alive.append(True)
+                self.size += 1
+            else:
+                self.job_ids[row], self.candidate_ids[row] = job_id, candidate_id
+                if not self.np:
+                    self.matrix[row] = vector
+            if self.np:
+                self.matrix[row] = self.np.frombuffer(vector.tobytes(), dtype=self.np.float32)
+        self._update_graph(rows)
+
+    def _update_graph(self, rows):
+        if self.hnswlib is None or self.np is None or self.size < settings.EMBEDDING_HNSW_MIN_ITEMS:
+            return
+        if self.graph is None:
+            # Inner product on unit vectors: distance = 1 - cosine similarity
+            self.graph = self.hnswlib.Index(space='ip', dim=self.dimensions)
+            self.graph.init_index(max_elements=max(len(self.matrix), 1024), ef_construction=200, M=16)
+            self.graph.set_ef(settings.EMBEDDING_HNSW_EF)
+            rows = range(self.size)
+        else:
+            rows = [self.position[row[0]] for row in rows]
+        if self.size > self.graph.get_max_elements():
+            self.graph.resize_index(len(self.matrix))
+        rows = self.np.asarray(list(rows), dtype=self.np.int64)
+        if len(rows):
+            # Labels are row positions; adding an existing label replaces its vector
+            self.graph.add_items(self.matrix[rows], rows)
+
+    def evict(self, application_ids):
+        """Drops the rows of deleted applications."""
+        with self.lock:
+            for application_id in application_ids:
+                row = self.position.pop(application_id, None)
+                if row is None:
+                    continue
+                self.alive[row] = False
+                self.evicted += 1
+                if self.graph is not None:
+                    self.graph.mark_deleted(row)
+
+    # ------------ SEARCH ------------
+    def _scores(self, query, rows):
+        """Similarity of query to the given rows (None: every row)."""
+        if self.np:
+            matrix = self.matrix[:self.size] if rows is None else self.matrix[rows]
+            return matrix @ self.np.asarray(query, dtype=self.np.float32)
+        vectors = self.matrix if rows is None else [self.matrix[row] for row in rows]
+        return [sum(a * b for a, b in zip(vector, query)) for vector in vectors]
+
+    def _nearest(self, query, count, rows=None):
+        """[(row, similarity)] of the best `count` rows, best first."""
+        if rows is None and self.graph is not None:
+            if self.size == self.evicted:
+                return []
+            labels, distances = self.graph.knn_query(self.np.asarray(query, dtype=self.np.float32), k=min(count, self.size - self.evicted))
+            return [(int(row), 1.0 - float(distance)) for row, distance in zip(labels[0], distances[0])]
+
+        scores = self._scores(query, rows)
+        rows = range(self.size) if rows is None else rows
+        if self.np:
+            scores = self.np.asarray(scores)
+            count = min(count, len(scores))
+            if count == 0:
+                return []
+            best = self.np.argpartition(-scores, count - 1)[:count]
+            best = best[self.np.argsort(-scores[best], kind='stable')]
+            return [(int(rows[index]), float(scores[index])) for index in best]
+        ranked = sorted(zip(rows, scores), key=lambda pair: -pair[1])
+        return ranked[:count]
+
+    def search(self, query, limit=20, job_id=None, exclude_candidate=None):
+        """[(application_id, similarity)]: the best application of each of the `limit` nearest candidates."""
+        # Under the writers' lock: refresh() may grow (replace) the matrix or rewrite rows
+        with self.lock:
+            return self._search(query, limit, job_id, exclude_candidate)
+
+    def vector(self, application_id):
+        """A copy of the application's stored vector, None if it is not loaded."""
+        with self.lock:
+            row = self.position.get(application_id)
+            if row is None:
+                return None
+            return self.matrix[row].copy() if self.np else list(self.matrix[row])
+
+    def _search(self, query, limit, job_id, exclude_candidate):
+        rows = None
+        if job_id is not None:
+            if self.np:
+                rows = self.np.flatnonzero((self.np.asarray(self.job_ids) == job_id) & self.alive[:self.size])
+            else:
+                rows = [row for row, row_job_id in enumerate(self.job_ids) if row_job_id == job_id and self.alive[row]]
+        elif self.evicted and self.graph is None:
+            # The HNSW graph skips rows marked deleted itself
+            if self.np:
+                rows = self.np.flatnonzero(self.alive[:self.size])
+            else:
+                rows = [row for row in range(self.size) if self.alive[row]]
+
+        count = (limit + 1) * OVERFETCH
+        while True:
+            hits = self._nearest(query, count, rows)
+            results, seen = [], {exclude_candidate}
+            for row, similarity in hits:
+                candidate_id = self.candidate_ids[row]
+                if candidate_id in seen:
+                    continue
+                seen.add(candidate_id)
+                results.append((self.ids[row], round(similarity, 4)))
+                if len(results) == limit:
+                    return results
+            available = self.size - self.evicted if rows is None else len(rows)
+            if len(hits) >= available or count >= available:
+                return results
+            count *= 2
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index():
+    """The process's index for the current embedder, refreshed with the latest embeddings."""
+    embedder = get_embedder()
+    with _indexes_lock:
+        index = _indexes.get(embedder.name)
+        if index is None:
+            index = _indexes[embedder.name] = VectorIndex(embedder.name, embedder.dimensions)
+    index.refresh()
+    return index
+
+
+def reset():
+    """Drops the loaded indexes (tests, or after rebuild_embeddings in a long-lived shell)."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+# ------------ QUERIES ------------
+def search_existing(index, query, limit, **filters):
+    """index.search() minus applications deleted since their rows were loaded (evicted, then searched again)."""
+    while True:
+        hits = index.search(query, limit, **filters)
+        ids = [application_id for application_id, _ in hits]
+        missing = set(ids) - set(Application.objects.filter(pk__in=ids).values_list('id', flat=True))
+        if not missing:
+            return hits
+        index.evict(missing)
+
+
+def candidates_for_job(job, limit=20, applicants_only=False):
+    """[(application_id, similarity)] of the candidates closest to the job's description."""
+    return search_existing(get_index(), job_vector(job), limit, job_id=job.id if applicants_only else None)
+
+
+def similar_candidates(application, limit=10):
+    """[(application_id, similarity)] of other candidates closest to this application, or None if it has no vector."""
+    index = get_index()
+    vector = index.vector(application.id)
+    if vector is None:
+        return None
+    return search_existing(index, vector, limit, exclude_candidate=application.candidate_id)
@@ -1,27 +1,54 @@
 from rest_framework import generics, status, views
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db.models import Count, Q
-from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
-from django.db.models import F
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 import datetime
-from .models import Candidate, Application, ApplicationComment
+from django.utils import timezone
+from .models import Candidate, Application, ApplicationComment, ParseJob
+from . import analytics, skill_index
+from .analytics_cache import cached_analytics
+from .parsing import apply_parsed_resume, enqueue_parse, get_screening_questions
 from jobs.models import JobPosting
-from .serializers import ApplicationSerializer, CandidateSerializer, ApplicationCommentSerializer
-from screenai.services.resume_parser.parser import parse_resume
+from screenai.pagination import ApplicationKeysetPagination
+from .serializers import ApplicationSerializer, ApplicationListSerializer, CandidateSerializer, ApplicationCommentSerializer
 from django.views.decorators.csrf import csrf_exempt
-from django.core.files.storage import default_storage
-from django.http import JsonResponse
-import os
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.views import View
+from rest_framework.authtoken.models import Token
+from appscreenai.models import Employee
+from .events import event_stream, latest_event_id
+from .scoring import rank_applications
+from .search import search_applications
+from .vector_index import candidates_for_job, similar_candidates
+from django.conf import settings
 import json
 
-from screenai.services.resume_parser.parser import parse_resume
 
 
+def application_rows():
+    """
+    Applications as ApplicationListSerializer shows them, in one query: related rows joined,
+    resume blob skipped. The comment count is a correlated subquery, not a JOIN + GROUP BY,
+    so a page is read in index order.
+    """
+    comments_count = (
+        ApplicationComment.objects.filter(application=OuterRef('pk'))
+        .order_by().values('application').annotate(count=Count('id')).values('count')
+    )
+    return (
+        Application.objects.select_related('candidate', 'job')
+        .annotate(comments_count=Coalesce(Subquery(comments_count), 0))
+        .defer('resume_text', 'score_breakdown')
+    )
+
 
 class ApplicationListCreateView(generics.ListAPIView):
-    # Standard ListAPIView settings
-    serializer_class = ApplicationSerializer
+    # Standard ListAPIView settings (compact rows; the full payload is on the detail view)
+    serializer_class = ApplicationListSerializer
+    # Newest first; ?ordering=-match_score for best match first (app_job_score_idx with ?job=)
+    pagination_class = ApplicationKeysetPagination
     
     def get_permissions(self):
         if self.request.method == 'POST':
@@ -34,7 +61,7 @@ class ApplicationListCreateView(generics.ListAPIView):
     parser_classes = (MultiPartParser, FormParser)
 
     def get_queryset(self):
-        queryset = Application.objects.select_related('candidate', 'job').all().order_by('-applied_at')
+        queryset = application_rows().order_by('-applied_at')
         
         # 1. Multi-tenant Filter
         # employee_id = self.request.headers.get('X-Employee-Id')
@@ -52,9 +79,43 @@ class ApplicationListCreateView(generics.ListAPIView):
         platform_param = self.request.query_params.get('platform')
         if platform_param:
             queryset = queryset.filter(platform=platform_param)
+
+        # 2. Skill filters on the normalized skill index (candidates/skill_index.py)
+        self.skill_filters = self.get_skill_filters(job_id)
+        self.skill_base_queryset = None
+        if self.skill_filters:
+            self.skill_base_queryset = queryset
+            queryset = skill_index.filter_by_skills(queryset, **self.skill_filters)
             
         return queryset
 
+    def get_skill_filters(self, job_id):
+        """
+        ?skills_all=python,kafka&skills_any=...&skills_none=... (comma separated);
+        ?has_required_skills=true with ?job= adds the job's required_skills to skills_all.
+        """
+        params = self.request.query_params
+        term_sets = {
+            name: [term for term in params.get(param, '').split(',') if term.strip()]
+            for name, param in (('all_of', 'skills_all'), ('any_of', 'skills_any'), ('none_of', 'skills_none'))
+        }
+        if job_id and params.get('has_required_skills', '').lower() == 'true':
+            required = JobPosting.objects.filter(pk=job_id).values_list('required_skills', flat=True).first()
+            term_sets['all_of'] += [str(term) for term in required or []]
+        if not any(term_sets.values()):
+            return None
+        return skill_index.resolve(**term_sets)
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if self.skill_base_queryset is not None:
+            # How many of the job/status/platform matches have each requested skill
+            requested = list(dict.fromkeys(
+                self.skill_filters['all_of'] + self.skill_filters['any_of'] + self.skill_filters['none_of']
+            ))
+            response.data['skill_counts'] = skill_index.skill_counts(self.skill_base_queryset, requested)
+        return response
+
     def post(self, request, *args, **kwargs):
         # 1. Extract Candidate Data
         candidate_data = {
@@ -136,47 +197,8 @@ class ApplicationListCreateView(generics.ListAPIView):
                 skills=skills_list
             )
 
-            # 👇 Non-blocking Parsing (Threaded)
-            def run_background_parsing(app_id, file_path):
-                import json
-                from screenai.services.resume_parser.parser import parse_resume
-                try:
-                    # Re-fetch because threads might have race conditions if we pass obj
-                    app = Application.objects.get(id=app_id)
-                    
-                    # Get Screening Questions from Job
-                    questions_list = []
-                    if app.job.screening_questions:
-                         questions_list = [q.get('question') for q in app.job.screening_questions if isinstance(q, dict) and q.get('question')]
-
-                    parsed_data = parse_resume(file_path, custom_questions=questions_list)
-
-                    # Update fields (Merge skills)
-                    app.total_years_experience = parsed_data["data"]["total_years_experience"]
-                    
-                    # Merge existing skills with parsed skills to prevent data loss
-                    current_skills = set(app.skills or [])
-                    new_skills = set(parsed_data["data"]["skills"] or [])
-                    app.skills = list(current_skills.union(new_skills))
-                    
-                    app.education = parsed_data["data"]["education"]
-                    app.certifications = parsed_data["data"]["certifications"]
-                    
-                    # Save Answers (Only if not already answered manually?)
-                    # Strategy: If manual answers exist, keep them. If parsed answers exist, append/merge?
-                    # For now: If manual answers are empty, fill with parsed.
-                    if not app.answers and parsed_data["data"].get("screening_answers"):
-                         app.answers = parsed_data["data"]["screening_answers"]
-
-                    app.resume_text = json.dumps(parsed_data, indent=2)
-                    app.save()
-                    print(f"Background parsing complete for App {app_id}")
-                except Exception as e:
-                    print(f"WARNING: Background parsing failed for App ID {app_id}: {e}")
-
-            # Start Thread
-            import threading
-            threading.Thread(target=run_background_parsing, args=(application.id, application.resume.path)).start()
+            # 👇 Non-blocking Parsing (picked up by `manage.py parse_worker`)
+            enqueue_parse(application)
             
         except Exception as e:
             import traceback
@@ -189,7 +211,10 @@ class ApplicationListCreateView(generics.ListAPIView):
 
 
 class ApplicationDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Application.objects.all()
+    queryset = (
+        Application.objects.select_related('candidate', 'job', 'parsed_resume')
+        .prefetch_related('comments', 'experiences', 'parsed_resume__work_experience')
+    )
     serializer_class = ApplicationSerializer
 
     def perform_update(self, serializer):
@@ -244,27 +269,16 @@ class ParseApplicationResumeView(views.APIView):
         if not application.resume:
             return Response({"error": "No resume file to parse"}, status=status.HTTP_400_BAD_REQUEST)
 
+        # The parser stack is heavy, import it only in the views that parse
+        from screenai.services.resume_parser.parser import parse_resume
+
         try:
             # Re-run parser
-            questions_list = []
-            if application.job.screening_questions:
-                    questions_list = [q.get('question') for q in application.job.screening_questions if isinstance(q, dict) and q.get('question')]
-            
+            questions_list = get_screening_questions(application.job)
             parsed_data = parse_resume(application.resume.path, custom_questions=questions_list)
             
-            # Update fields
-            application.total_years_experience = parsed_data["data"]["total_years_experience"]
-            application.skills = parsed_data["data"]["skills"]
-            application.education = parsed_data["data"]["education"]
-            application.certifications = parsed_data["data"]["certifications"]
-            
-            # Update answers (Overwrite on reparse?) - YES, explicitly requested action
-            if parsed_data["data"].get("screening_answers"):
-                application.answers = parsed_data["data"]["screening_answers"]
-            
-            application.resume_text = json.dumps(parsed_data, indent=2)
-            
-            application.save()
+            # Update fields (Overwrite on reparse - explicitly requested action)
+            apply_parsed_resume(application, parsed_data, overwrite=True)
             
             return Response({
                 "message": "Resume parsed successfully",
@@ -274,32 +288,63 @@ class ParseApplicationResumeView(views.APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class ParseStatusView(views.APIView):
+    """Reports the latest background parse state for each requested application."""
+
+    def get(self, request):
+        apps_query = Application.objects.all()
+
+        ids_param = request.query_params.get('ids')
+        job_id = request.query_params.get('job')
+        if ids_param:
+            try:
+                ids = [int(i) for i in ids_param.split(',') if i.strip()]
+            except ValueError:
+                return Response({"error": "ids must be a comma separated list of integers"}, status=status.HTTP_400_BAD_REQUEST)
+            apps_query = apps_query.filter(id__in=ids)
+        elif job_id:
+            apps_query = apps_query.filter(job_id=job_id)
+        else:
+            return Response({"error": "Provide 'ids' or 'job'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        app_ids = list(apps_query.values_list('id', flat=True))
+
+        # Ordered by id, so the newest job for each application wins
+        latest = {}
+        for job in ParseJob.objects.filter(application_id__in=app_ids).order_by('id'):
+            latest[job.application_id] = job
+
+        results = []
+        for app_id in app_ids:
+            job = latest.get(app_id)
+            results.append({
+                "application": app_id,
+                "status": job.status if job else None,
+                "attempts": job.attempts if job else 0,
+                "last_error": job.last_error if job else "",
+                "queued_at": job.created_at if job else None,
+                "finished_at": job.finished_at if job else None,
+            })
+        return Response(results)
+
 class DashboardStatsView(views.APIView):
+    @cached_analytics('dashboard-stats')
     def get(self, request):
         employee_id = request.headers.get('X-Employee-Id')
         
-        apps_query = Application.objects.all()
+        # Read from the daily rollup, so the cost doesn't grow with the number of applications
+        stats_query = analytics.stats_queryset()
         # if employee_id:
-        #     apps_query = apps_query.filter(job__recruiter_id=employee_id)
+        #     stats_query = analytics.stats_queryset(employee_id)
             
-        total = apps_query.count()
-        today = apps_query.filter(applied_at__date__gte=datetime.date.today()).count()
-        
-        # Status counts
-        status_counts = apps_query.values('status').annotate(count=Count('status'))
-
-        # Platform counts
-        platform_counts = apps_query.values('platform').annotate(count=Count('platform'))
-        
-        # Job counts
-        total_jobs = JobPosting.objects.count()
-        active_jobs = JobPosting.objects.filter(is_active=True).count()
+        summary = analytics.summary_counts(stats_query)
+        total_jobs, active_jobs = analytics.job_counts()
         
         return Response({
-            "total_candidates": total,
-            "today_candidates": today,
-            "status_breakdown": status_counts,
-            "platform_breakdown": platform_counts,
+            "total_candidates": summary['total'],
+            "today_candidates": summary['today'],
+            "status_breakdown": analytics.counts_by(stats_query, 'status'),
+            "platform_breakdown": analytics.counts_by(stats_query, 'platform'),
             "total_jobs": total_jobs,
             "active_jobs": active_jobs
         })
@@ -315,17 +360,11 @@ class PreviewResumeView(views.APIView):
         if not resume_file:
             return Response({"error": "No resume file uploaded"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Save temporarily
-        temp_path = default_storage.save(f"temp/{resume_file.name}", resume_file)
-        full_path = default_storage.path(temp_path)
+        from screenai.services.resume_parser.parser import parse_resume
 
         try:
-            parsed_data = parse_resume(full_path)
-            
-            # Cleanup
-            default_storage.delete(temp_path)
-            if os.path.exists(full_path):
-                os.remove(full_path)
+            # Parse straight from the upload buffer, nothing is written to storage
+            parsed_data = parse_resume(resume_file, hedge_after=settings.RESUME_PREVIEW_HEDGE_AFTER)
 
             return Response({
                 "message": "Resume parsed successfully",
@@ -335,11 +374,6 @@ class PreviewResumeView(views.APIView):
 
 
         except Exception as e:
-            # Cleanup on error
-            if os.path.exists(full_path):
-                try: os.remove(full_path)
-                except: pass
-            
             error_msg = str(e).lower()
             
             # LOGGING
@@ -366,163 +400,113 @@ class PreviewResumeView(views.APIView):
 
 
 class AnalyticsView(views.APIView):
+    @cached_analytics('analytics')
     def get(self, request):
         try:
             employee_id = request.headers.get('X-Employee-Id')
             
-            # Base query
-            apps_query = Application.objects.all()
-            if employee_id:
-                apps_query = apps_query.filter(job__recruiter_id=employee_id)
-            
-            # 1. Summary Stats
-            total_applications = apps_query.count()
-            
-            # Fix: "Hired This Month" - Count applications from this month that are HIRED/OFFER
-            # Note: Ideally we'd use updated_at, but applied_at is our best proxy without schema changes.
-            this_month_hired = apps_query.filter(
-                applied_at__month=datetime.date.today().month,
-                status__in=['OFFER', 'HIRED']
-            ).count()
-
-            # Fix: "Active Jobs" -> "Total Jobs" (including closed)
-            total_jobs_count = JobPosting.objects.count()
-            active_jobs_count = JobPosting.objects.filter(is_active=True).count()
-
-            # Separate "Total Hired" (Strictly HIRED status)
-            total_hired_count = apps_query.filter(status='HIRED').count()
-            
-            # Count Rejected
-            rejected_count = apps_query.filter(status='REJECTED').count()
+            # Base query: the day x job x platform x status rollup (see candidates/rollup.py),
+            # so every section below reads a table that grows with days, not applications
+            stats_query = analytics.stats_queryset(employee_id)
             
-            # Fix: "Applications Today" (formerly calls)
-            today_applications = apps_query.filter(applied_at__date=datetime.date.today()).count()
-            
-            # Conversion rate (OFFER/HIRED / total)
-            hired_total_count = apps_query.filter(status__in=['OFFER', 'HIRED']).count()
-            conversion_rate = round((hired_total_count / total_applications * 100), 1) if total_applications > 0 else 0
+            # Status history (see candidates/history.py): when applications actually changed stage
+            transitions = analytics.transitions_queryset(employee_id)
+
+            # 1. Summary Stats (one query; see candidates/analytics.py)
+            today = timezone.localdate()
+            summary = analytics.summary_counts(stats_query, today)
+            # Applications that reached OFFER/HIRED this month, by the date of the change
+            hired_this_month = analytics.entered_count(transitions, analytics.HIRED_STATUSES, today.replace(day=1))
+            total_applications = summary['total']
+            total_jobs_count, active_jobs_count = analytics.job_counts()
+            conversion_rate = analytics.percentage(summary['offer_or_hired'], total_applications)
             
             # 2. Application Trend (Dynamic Range)
-            today = datetime.date.today()
             range_param = request.query_params.get('range', '4w')
             
             if range_param == '7d':
                 start_date = today - datetime.timedelta(days=7)
-                trunc_func = TruncDate('applied_at')
+                period = 'day'
                 date_fmt = '%a' # Mon, Tue
             elif range_param == '3m':
                 start_date = today - datetime.timedelta(days=90)
-                trunc_func = TruncWeek('applied_at')
+                period = 'week'
                 date_fmt = 'Week %W'
             elif range_param == '1y':
                 start_date = today - datetime.timedelta(days=365)
-                trunc_func = TruncMonth('applied_at')
+                period = 'month'
                 date_fmt = '%b %Y' # Jan 2024
             else: # 4w
                 start_date = today - datetime.timedelta(weeks=4)
-                trunc_func = TruncWeek('applied_at')
+                period = 'week'
                 date_fmt = 'Week %W'
 
-            trend_data = apps_query.filter(applied_at__date__gte=start_date).annotate(
-                period=trunc_func
-            ).values('period').annotate(
-                applications=Count('id'),
-                hired=Count('id', filter=Q(status__in=['OFFER', 'HIRED']))
-            ).order_by('period')
-            
-            # Format trend data
-            weekly_trend = []
-            for item in trend_data:
-                label = item['period'].strftime(date_fmt) if item['period'] else "Unknown"
-                weekly_trend.append({
-                    'week': label, # Processed label (Frontend uses 'week' key)
-                    'applications': item['applications'],
+            weekly_trend = [
+                {
+                    'week': item['period'].strftime(date_fmt) if item['period'] else "Unknown", # Frontend uses 'week' key
+                    'applications': item['total'],
                     'hired': item['hired']
-                })
+                }
+                for item in analytics.trend(stats_query, start_date, period)
+            ]
             
             # 3. Pipeline Status Distribution
-            pipeline_distribution = list(apps_query.values('status').annotate(count=Count('status')))
+            pipeline_distribution = analytics.counts_by(stats_query, 'status')
             
-            # 4. Daily Applications (last 7 days)
-            seven_days_ago = today - datetime.timedelta(days=7)
-            daily_data = apps_query.filter(applied_at__date__gte=seven_days_ago).annotate(
-                day=TruncDate('applied_at')
-            ).values('day').annotate(
-                count=Count('id')
-            ).order_by('day')
-            
-            daily_applications = []
-            for i in range(7):
-                date = seven_days_ago + datetime.timedelta(days=i)
-                day_name = date.strftime('%a')
-                count = next((d['count'] for d in daily_data if d['day'] == date), 0)
-                daily_applications.append({
-                    'day': day_name,
-                    'count': count
-                })
+            # 4. Daily Applications (the 7 days before today)
+            daily_applications = [
+                {'day': day.strftime('%a'), 'count': count}
+                for day, count in analytics.daily_counts(stats_query, today - datetime.timedelta(days=7), 7)
+            ]
             
             # 5. Platform Performance
-            platform_stats = apps_query.values('platform').annotate(
-                count=Count('id'),
-                hired=Count('id', filter=Q(status__in=['OFFER', 'HIRED']))
-            )
-            
-            platform_performance = []
-            for platform in platform_stats:
-                count = platform['count']
-                hired = platform['hired']
-                percentage = round((hired / count * 100), 1) if count > 0 else 0
-                platform_performance.append({
+            platform_performance = [
+                {
                     'platform': platform['platform'] or 'Website',
-                    'count': count,
-                    'percentage': percentage
-                })
+                    'count': platform['count'],
+                    'percentage': analytics.percentage(platform['hired'], platform['count'])
+                }
+                for platform in analytics.platform_counts(stats_query)
+            ]
 
             # 6. HR Team Performance
-            hr_stats = apps_query.values(
-                'job__recruiter__id',
-                'job__recruiter__email'
-            ).annotate(
-                shortlisted=Count('id', filter=Q(status__in=['INTERVIEW', 'SCREENED'])),
-                rejected=Count('id', filter=Q(status='REJECTED')),
-                hired=Count('id', filter=Q(status__in=['OFFER', 'HIRED']))
-            )
-
             hr_team_performance = []
-            for hr in hr_stats:
+            for hr in analytics.recruiter_counts(stats_query):
                 total_decisions = hr['shortlisted'] + hr['rejected'] + hr['hired']
-                total_local = total_decisions if total_decisions > 0 else 1
-                conversion = round((hr['hired'] / total_local * 100), 1)
-
-                # Employee model only has email
-                name = hr['job__recruiter__email'] or 'Unknown Recruiter'
 
                 hr_team_performance.append({
-                    'name': name,
+                    # Employee model only has email
+                    'name': hr['job__recruiter__email'] or 'Unknown Recruiter',
                     'email': hr['job__recruiter__email'],
                     'calls_today': 0, 
                     'shortlisted': hr['shortlisted'],
                     'rejected': hr['rejected'],
                     'hired': hr['hired'],
-                    'conversion': conversion
+                    'conversion': analytics.percentage(hr['hired'], total_decisions or 1)
                 })
 
+            # 7. Funnel and time in stage over the selected range
+            funnel = analytics.funnel(transitions, start_date)
+            stage_velocity = analytics.stage_velocity(transitions, start_date)
+
             return Response({
                 'summary': {
                     'total_applications': total_applications,
-                    'total_hired': total_hired_count,
+                    'total_hired': summary['hired'],
                     'total_jobs': total_jobs_count,
                     'active_jobs': active_jobs_count,
-                    'hired_this_month': this_month_hired,
-                    'rejected_count': rejected_count,
-                    'total_calls_today': today_applications, # Actually New Apps Today
+                    'hired_this_month': hired_this_month,
+                    'rejected_count': summary['rejected'],
+                    'total_calls_today': summary['today'], # Actually New Apps Today
                     'conversion_rate': conversion_rate
                 },
                 'weekly_trend': weekly_trend,
                 'pipeline_distribution': pipeline_distribution,
                 'daily_applications': daily_applications,
                 'platform_performance': platform_performance,
-                'hr_team_performance': hr_team_performance
+                'hr_team_performance': hr_team_performance,
+                'funnel': funnel,
+                'stage_velocity': stage_velocity
             })
         except Exception as e:
             import traceback
@@ -539,7 +523,9 @@ class AnalyticsView(views.APIView):
                 'pipeline_distribution': [],
                 'daily_applications': [],
                 'platform_performance': [],
-                'hr_team_performance': []
+                'hr_team_performance': [],
+                'funnel': [],
+                'stage_velocity': []
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
@@ -552,40 +538,212 @@ class QuickScanResumeView(views.APIView):
             
             resume_file = request.FILES['resume']
             
-            # Save temporarily
-            file_name = default_storage.save(f"temp/quick_{resume_file.name}", resume_file)
-            full_path = default_storage.path(file_name)
+            # Extract Text Only (straight from the upload buffer, no temp file)
+            from screenai.services.resume_parser.parser import get_resume_text, scan_resume_regex
             
             try:
-                # Extract Text Only
-                from screenai.services.resume_parser.parser import extract_pdf_text, extract_docx_text, scan_resume_regex
-                
-                ext = os.path.splitext(full_path)[1].lower()
-                text = ""
-                if ext == '.pdf':
-                    text = extract_pdf_text(full_path)
-                elif ext in ['.docx', '.doc']:
-                    text = extract_docx_text(full_path)
-                
-                # Regex Scan
-                data = scan_resume_regex(text)
+                _, text = get_resume_text(resume_file)
+            except ValueError as e:
+                # Unsupported format (e.g. legacy .doc), as the parser reports it
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            
+            # Regex Scan
+            data = scan_resume_regex(text)
                 
-                # Cleanup
-                default_storage.delete(file_name)
-                if os.path.exists(full_path):
-                    os.remove(full_path)
-                    
-                return Response({"data": data}, status=status.HTTP_200_OK)
-
-            except Exception as e:
-                # Cleanup
-                if os.path.exists(full_path):
-                    try: os.remove(full_path) 
-                    except: pass
-                raise e
+            return Response({"data": data}, status=status.HTTP_200_OK)
 
         except Exception as e:
             import traceback
             traceback.print_exc()
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+
+
+class ApplicationSearchView(views.APIView):
+    """
+    Ranked full-text search over resumes (candidates/search.py):
+    GET ?q=kafka fintech[&job=&status=&limit=20]. Every word must match; results carry
+    the list row fields plus `rank` and an HTML `snippet` with the matches in <mark>.
+    """
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Provide a search query 'q'"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), 100))
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = search_applications(
+            query,
+            limit=limit,
+            job_id=request.query_params.get('job'),
+            status=request.query_params.get('status'),
+        )
+        rows = application_rows().in_bulk([hit.application_id for hit in hits])
+
+        results = []
+        for hit in hits:
+            application = rows.get(hit.application_id)
+            if application is None:
+                continue
+            item = ApplicationListSerializer(application, context={'request': request}).data
+            item['rank'] = hit.rank
+            item['snippet'] = hit.snippet
+            results.append(item)
+        return Response({"query": query, "count": len(results), "results": results})
+
+
+class ApplicationRankingView(views.APIView):
+    """
+    Ranks every application of a job against its criteria in one batch (candidates/scoring.py):
+    GET ?job=<id>[&status=&limit=50]. Results carry the list row fields plus `score`
+    (out of 100), its `breakdown` per criterion and the `missing_skills`.
+    """
+
+    def get(self, request):
+        job_id = request.query_params.get('job')
+        if not job_id:
+            return Response({"error": "Provide a job id 'job'"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 50)), 500))
+            job = JobPosting.objects.get(pk=int(job_id))
+        except ValueError:
+            return Response({"error": "job and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        except JobPosting.DoesNotExist:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        ranking = rank_applications(job, status=request.query_params.get('status'), limit=limit)
+        rows = application_rows().in_bulk([scored.application_id for scored in ranking.results])
+
+        results = []
+        for scored in ranking.results:
+            application = rows.get(scored.application_id)
+            if application is None:
+                continue
+            item = ApplicationListSerializer(application, context={'request': request}).data
+            item['score'] = scored.score
+            item['breakdown'] = scored.breakdown
+            item['missing_skills'] = scored.missing_skills
+            results.append(item)
+        return Response({
+            "job": job.id,
+            "scored": ranking.scored,
+            "engine": ranking.engine,
+            "seconds": round(ranking.seconds, 3),
+            "results": results,
+        })
+
+
+def semantic_results(request, hits):
+    """List rows for [(application_id, similarity)] hits, in order, each with its `similarity`."""
+    rows = application_rows().in_bulk([application_id for application_id, _ in hits])
+    results = []
+    for application_id, similarity in hits:
+        application = rows.get(application_id)
+        if application is None:
+            continue
+        item = ApplicationListSerializer(application, context={'request': request}).data
+        item['similarity'] = similarity
+        results.append(item)
+    return results
+
+
+def semantic_limit(request, default):
+    return max(1, min(int(request.query_params.get('limit', default)), 100))
+
+
+class SemanticCandidatesView(views.APIView):
+    """
+    Candidates whose resumes are closest in meaning to a job (candidates/vector_index.py):
+    GET ?job=<id>[&applicants_only=true&limit=20]. Searches every candidate unless
+    applicants_only; one row per candidate, each with a cosine `similarity`.
+    """
+
+    def get(self, request):
+        try:
+            job = JobPosting.objects.get(pk=int(request.query_params.get('job', '')))
+            limit = semantic_limit(request, 20)
+        except ValueError:
+            return Response({"error": "Provide an integer job id 'job' (and limit)"}, status=status.HTTP_400_BAD_REQUEST)
+        except JobPosting.DoesNotExist:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        applicants_only = request.query_params.get('applicants_only', '').lower() == 'true'
+        hits = candidates_for_job(job, limit=limit, applicants_only=applicants_only)
+        results = semantic_results(request, hits)
+        return Response({"job": job.id, "count": len(results), "results": results})
+
+
+class SimilarCandidatesView(views.APIView):
+    """Other candidates closest in meaning to this application's resume: GET [?limit=10]."""
+
+    def get(self, request, pk):
+        application = Application.objects.filter(pk=pk).only('id', 'candidate_id').first()
+        if application is None:
+            return Response({"error": "Application not found"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            limit = semantic_limit(request, 10)
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        hits = similar_candidates(application, limit=limit)
+        if hits is None:
+            return Response({"error": "This resume has not been parsed yet"}, status=status.HTTP_409_CONFLICT)
+        results = semantic_results(request, hits)
+        return Response({"application": application.id, "count": len(results), "results": results})
+
+
+class DashboardEventStreamView(View):
+    """
+    Server-Sent Events stream of application-created, status-changed and parse-finished
+    events for the authenticated recruiter's jobs (admins receive every event).
+
+    EventSource cannot send an Authorization header, so the DRF token is also accepted
+    as ?token=. Resume after a reconnect with the Last-Event-ID header (sent by the
+    browser automatically) or ?last_event_id=.
+
+    Under ASGI (screenai/asgi.py) the connection stays open for
+    DASHBOARD_EVENTS_STREAM_SECONDS. A WSGI server cannot hold it open without
+    blocking a worker, so there the response carries the pending events and ends,
+    and the client reconnects after DASHBOARD_EVENTS_WSGI_RETRY_SECONDS (polling).
+    """
+
+    async def get(self, request):
+        key = request.GET.get('token', '')
+        header = request.headers.get('Authorization', '')
+        if not key and header.startswith('Token '):
+            key = header[len('Token '):].strip()
+        token = await Token.objects.select_related('user').filter(key=key).afirst() if key else None
+        if token is None or not token.user.is_active:
+            return JsonResponse({"error": "Authentication credentials were not provided or are invalid."}, status=401)
+
+        # Logins map an Employee to a User with username = email (see login_employee_api)
+        employee = await Employee.objects.filter(email=token.user.username).afirst()
+        if employee is not None and not employee.is_admin:
+            scope = {'recruiter_id': employee.id}
+        elif (employee is not None and employee.is_admin) or token.user.is_staff:
+            scope = {}
+        else:
+            return JsonResponse({"error": "No recruiter account for this user"}, status=403)
+
+        last_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+        try:
+            last_id = int(last_id) if last_id else await latest_event_id()
+        except ValueError:
+            return JsonResponse({"error": "Last-Event-ID must be an integer"}, status=400)
+
+        if isinstance(request, ASGIRequest):
+            duration, retry_ms = settings.DASHBOARD_EVENTS_STREAM_SECONDS, 1000
+        else:
+            duration, retry_ms = 0, int(settings.DASHBOARD_EVENTS_WSGI_RETRY_SECONDS * 1000)
+
+        response = StreamingHttpResponse(
+            event_stream(scope, last_id, duration, retry_ms),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
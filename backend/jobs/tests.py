@@ -65,3 +65,17 @@ class JobIsolationTests(TestCase):
         
         # Should see both jobs
         self.assertEqual(len(results), 2)
+
+    def test_list_jobs_cursor_pages(self):
+        """
+        Jobs are paged by (created_at, id) cursors; filters carry over into the next link.
+        """
+        response = self.client.get(self.url, {'page_size': 1, 'include_closed': 'true'})
+        first = response.data['results']
+        self.assertIn('include_closed=true', response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        second = response.data['results']
+
+        self.assertEqual([first[0]['title'], second[0]['title']], [self.job2.title, self.job1.title])
+        self.assertIsNone(response.data['next'])
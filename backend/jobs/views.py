@@ -1,9 +1,11 @@
 from rest_framework import generics, permissions
 from .models import JobPosting
 from .serializers import JobPostingSerializer
+from screenai.pagination import JobKeysetPagination
 
 class JobListView(generics.ListCreateAPIView):
     serializer_class = JobPostingSerializer
+    pagination_class = JobKeysetPagination
 
     def get_permissions(self):
         if self.request.method == 'GET':
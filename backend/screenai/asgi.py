@@ -2,6 +2,8 @@
 ASGI config for screenai project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it (e.g. ``uvicorn screenai.asgi:application``) to keep the dashboard
+event stream (/api/v1/events/) open; under WSGI that endpoint falls back to long polling.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -0,0 +1,166 @@
+import base64
+import json
+
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def approximate_count(queryset, exact_below=10000):
+    """
+    Returns (count, is_approximate). On PostgreSQL the planner's row estimate is
+    used once it exceeds exact_below; small results and other databases get an exact COUNT.
+    """
+    queryset = queryset.order_by()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]['Plan']['Plan Rows'])
+        if estimate > exact_below:
+            return estimate, True
+    return queryset.count(), False
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on a (timestamp, id) key.
+
+    Each page is one indexed range query ("rows before the last one seen"), so page
+    100 costs the same as page 1, and rows inserted while a user scrolls don't shift
+    the pages. The cursor is an opaque token holding the key of the boundary row;
+    other query params (filters) are carried over into the next/previous links.
+
+    Totals cost a COUNT, so they are only returned with ?with_total=true, as a
+    planner estimate on large PostgreSQL tables (see approximate_count).
+
+    Subclasses may offer other keys through ?ordering= (see `orderings`); each needs
+    its own index for pages to stay range queries. Unknown values use the default.
+    """
+    ordering = ('-created_at', '-id')
+    orderings = {}
+    ordering_query_param = 'ordering'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    total_query_param = 'with_total'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request):
+        return self.orderings.get(request.query_params.get(self.ordering_query_param), self.ordering)
+
+    def encode_cursor(self, row, reverse):
+        field = self.ordering[0].lstrip('-')
+        value = getattr(row, field)
+        payload = {'v': value.isoformat() if hasattr(value, 'isoformat') else value, 'id': row.pk, 'r': reverse}
+        token = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token.rstrip('='))
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            field = model._meta.get_field(self.ordering[0].lstrip('-'))
+            return field.to_python(payload['v']), int(payload['id']), bool(payload['r'])
+        except Exception:
+            raise NotFound('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request)
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = cursor[2] if cursor else False
+
+        field = self.ordering[0].lstrip('-')
+        descending = self.ordering[0].startswith('-')
+        ordering = self.ordering
+        if reverse:
+            # Walking back towards the start: flip the order, then flip the page back
+            ordering = [name[1:] if name.startswith('-') else '-' + name for name in ordering]
+
+        paged = queryset.order_by(*ordering)
+        if cursor:
+            value, pk, _ = cursor
+            op = 'lt' if descending != reverse else 'gt'
+            paged = paged.filter(Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'pk__{op}': pk}))
+
+        rows = list(paged[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = cursor is not None if reverse else has_more
+        self.has_previous = has_more if reverse else cursor is not None
+        self.page = rows
+
+        self.total = None
+        if request.query_params.get(self.total_query_param, '').lower() == 'true':
+            self.total = approximate_count(queryset)
+        return rows
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.total is not None:
+            payload['count'], payload['count_is_approximate'] = self.total
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer'},
+                'count_is_approximate': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
+
+
+class ApplicationKeysetPagination(KeysetPagination):
+    ordering = ('-applied_at', '-id')
+    orderings = {
+        '-applied_at': ('-applied_at', '-id'),
+        '-match_score': ('-match_score', '-id'),
+    }
+
+
+class JobKeysetPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
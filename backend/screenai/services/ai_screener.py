@@ -8,12 +8,8 @@ class AIScreener:
     def extract_text_from_pdf(self, pdf_path):
         """Extracts text from a PDF file."""
         try:
-            from pypdf import PdfReader
-            reader = PdfReader(pdf_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() or ""
-            return text
+            from screenai.services.resume_parser.extraction import extract_pdf
+            return extract_pdf(pdf_path).text
         except Exception as e:
             print(f"Error reading PDF: {e}")
             return ""
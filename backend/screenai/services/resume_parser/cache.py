@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_digest(source):
+    """Returns the SHA-256 hex digest of a file path or seekable file-like object."""
+    sha = hashlib.sha256()
+    if hasattr(source, "read"):
+        source.seek(0)
+        for chunk in iter(lambda: source.read(1024 * 1024), b""):
+            sha.update(chunk)
+        source.seek(0)
+    else:
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(chunk)
+    return sha.hexdigest()
+
+
+class ParseCache:
+    """
+    Size-bounded LRU cache of resume parsing work, keyed by the SHA-256 of the file.
+
+    Each entry holds the extracted text, the extraction tier that produced it, and the
+    parsed FinalOutput dicts for that file (one per set of screening questions, since the
+    questions change the LLM answer).
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.text_hits = 0
+        self.text_misses = 0
+        self.evictions = 0
+
+    def _entry(self, digest, create=False):
+        entry = self._entries.get(digest)
+        if entry is not None:
+            self._entries.move_to_end(digest)
+        elif create:
+            entry = {"text": None, "tier": None, "results": {}}
+            self._entries[digest] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def get_text(self, digest):
+        with self._lock:
+            entry = self._entry(digest)
+            if entry is None or entry["text"] is None:
+                self.text_misses += 1
+                return None
+            self.text_hits += 1
+            return entry["text"]
+
+    def set_text(self, digest, text, tier=None):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            entry = self._entry(digest, create=True)
+            entry["text"], entry["tier"] = text, tier
+
+    def get_tier(self, digest):
+        """Extraction tier of the cached text (None when unknown); not counted as a hit or miss."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            return entry["tier"] if entry else None
+
+    def get_result(self, digest, questions=()):
+        with self._lock:
+            entry = self._entry(digest)
+            result = entry["results"].get(tuple(questions)) if entry else None
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # Callers may mutate the dict they get back, so never hand out the cached one
+        return copy.deepcopy(result)
+
+    def set_result(self, digest, questions, result):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entry(digest, create=True)["results"][tuple(questions)] = copy.deepcopy(result)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.text_hits = self.text_misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "text_hits": self.text_hits,
+                "text_misses": self.text_misses,
+                "evictions": self.evictions,
+            }
+
+
+# Process-wide cache shared by every parsing path (views, background parsing)
+parse_cache = ParseCache(max_entries=int(os.getenv("RESUME_PARSE_CACHE_SIZE", "256")))
@@ -0,0 +1,157 @@
+"""
+Resume text compaction before it goes into an LLM prompt.
+
+normalize_text() removes what carries no information (whitespace runs, page
+numbers, repeated headers/footers). compact_resume_text() also trims the text
+to a token budget, keeping the contact block, experience, skills and education
+sections first when something has to go.
+"""
+import math
+import os
+import re
+import unicodedata
+
+TOKEN_BUDGET = int(os.getenv("RESUME_PROMPT_TOKEN_BUDGET", "3000"))
+
+# Rough size of a token for English text with Gemini/GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+SECTION_HEADINGS = {
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "career history", "professional background", "internships", "internship"],
+    "skills": ["skills", "technical skills", "key skills", "core skills", "core competencies", "competencies",
+               "technologies", "tools", "tech stack", "skills & tools", "skills and tools"],
+    "education": ["education", "academic background", "academics", "qualifications", "educational qualifications",
+                  "academic qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "courses", "training"],
+    "summary": ["summary", "profile", "professional summary", "about me", "objective", "career objective"],
+    "projects": ["projects", "academic projects", "personal projects", "key projects"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"],
+    "languages": ["languages"],
+    "interests": ["interests", "hobbies", "hobbies and interests", "extracurricular activities"],
+    "references": ["references", "declaration", "personal details", "personal information"],
+}
+
+# What survives trimming first. "contact" is the block before the first heading.
+SECTION_PRIORITY = ["contact", "experience", "skills", "education", "certifications", "summary",
+                    "projects", "achievements", "languages", "other", "interests", "references"]
+
+_HEADING_LOOKUP = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+_PAGE_NUMBER = re.compile(r'^(?:page\s*)?[-–]?\s*\d{1,3}\s*(?:(?:of|/)\s*\d{1,3})?\s*[-–]?$', re.IGNORECASE)
+# Lines this close to a page break can be running headers/footers
+EDGE_LINES = 2
+
+_HEADER_HINT = re.compile(r'@|https?://|www\.|linkedin|\+?\d[\d\s().-]{7,}\d|curriculum vitae|resume|confidential', re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def normalize_text(text):
+    """Whitespace and boilerplate cleanup that never drops real content."""
+    text = unicodedata.normalize("NFKC", text)
+
+    # Page breaks: form feeds from the extractor, and the page-number lines dropped here
+    lines, breaks = [], []
+    for raw in re.split(r'\r\n|\r|\n', text):
+        for number, line in enumerate(raw.split("\f")):
+            if number:
+                breaks.append(len(lines))
+            line = re.sub(r'[ \t]+', ' ', line).strip()
+            if _PAGE_NUMBER.match(line):
+                breaks.append(len(lines))
+                continue
+            lines.append(line)
+
+    # Non-blank lines before each index, to measure how far a line is from a page break
+    filled = [0]
+    for line in lines:
+        filled.append(filled[-1] + bool(line))
+
+    def at_page_edge(index):
+        for position in [0, *breaks, len(lines)]:
+            if position <= index and filled[index] - filled[position] < EDGE_LINES:
+                return True
+            if position > index and filled[position] - filled[index + 1] < EDGE_LINES:
+                return True
+        return False
+
+    # Headers/footers repeat on every page: drop later copies of a line only when it looks
+    # like page furniture (contact details, "Resume") or every copy of it sits next to a
+    # page break. Role titles and bullets that recur between jobs are content and stay.
+    seen, edge_only = set(), set()
+    kept = []
+    for index, line in enumerate(lines):
+        edge = at_page_edge(index)
+        if line and line in seen and (_HEADER_HINT.search(line) or (edge and line in edge_only)):
+            continue
+        if line not in seen and edge:
+            edge_only.add(line)
+        elif not edge:
+            edge_only.discard(line)
+        seen.add(line)
+        kept.append(line)
+
+    # Collapse blank-line runs
+    text = re.sub(r'\n{3,}', '\n\n', "\n".join(kept))
+    return text.strip()
+
+
+def heading_section(line):
+    """Section name when the line is a known heading (e.g. 'WORK EXPERIENCE:'), else None."""
+    if not line or len(line) > 40:
+        return None
+    key = re.sub(r'[^a-z& ]', '', line.lower()).strip()
+    return _HEADING_LOOKUP.get(key)
+
+
+def split_sections(text):
+    """Returns [(section, text)] in document order; text before the first heading is 'contact'."""
+    sections = [["contact", []]]
+    for line in text.split("\n"):
+        section = heading_section(line)
+        if section:
+            sections.append([section, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(name, "\n".join(body).strip()) for name, body in sections if "\n".join(body).strip()]
+
+
+def compact_resume_text(text, token_budget=None):
+    """
+    Normalized resume text that fits token_budget. Text that already fits keeps
+    its original order; otherwise sections are taken in SECTION_PRIORITY order
+    and the last one that fits only partially is cut at a line boundary.
+    """
+    if token_budget is None:
+        token_budget = TOKEN_BUDGET
+
+    text = normalize_text(text)
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    def priority(item):
+        name = item[1][0]
+        rank = SECTION_PRIORITY.index(name) if name in SECTION_PRIORITY else SECTION_PRIORITY.index("other")
+        return (rank, item[0])
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    parts = []
+    used = 0
+    for _, (name, body) in sorted(enumerate(split_sections(text)), key=priority):
+        remaining = budget_chars - used
+        if remaining <= 0:
+            break
+        if len(body) + 2 > remaining:
+            cut = body[:remaining]
+            body = cut[:cut.rfind("\n")] if "\n" in cut else cut
+        if body:
+            parts.append(body)
+            used += len(body) + 2
+    return "\n\n".join(parts)
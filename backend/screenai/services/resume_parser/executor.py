@@ -0,0 +1,129 @@
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+# ------------ PAGE RANGE EXTRACTION ------------
+def extract_pdf_pages(pdf_path, start=0, end=None):
+    """Extracts the text of pages [start, end) with pdfplumber from a path, bytes or file-like."""
+    import pdfplumber
+
+    if isinstance(pdf_path, (bytes, bytearray)):
+        pdf_path = io.BytesIO(pdf_path)
+
+    text = ""
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages[start:end]:
+            t = page.extract_text()
+            if t:
+                text += t + "\n"
+    return text
+
+def count_pdf_pages(pdf_path):
+    """Page count from the PDF's page tree (pypdf); pdfplumber only when pypdf is missing."""
+    if isinstance(pdf_path, (bytes, bytearray)):
+        pdf_path = io.BytesIO(pdf_path)
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            return len(pdf.pages)
+    return len(PdfReader(pdf_path).pages)
+
+
+# ------------ EXECUTORS ------------
+class InlineExtractionExecutor:
+    """Extracts on the calling thread (the original behaviour)."""
+
+    def extract_pdf(self, pdf_path):
+        return extract_pdf_pages(pdf_path)
+
+    def shutdown(self):
+        pass
+
+
+class ProcessPoolExtractionExecutor:
+    """
+    Runs pdfplumber in worker processes so concurrent extractions use every core.
+
+    Long PDFs are split into page ranges that are extracted in parallel and
+    joined back in page order.
+    """
+
+    def __init__(self, max_workers, pages_per_task=4):
+        self.max_workers = max_workers
+        self.pages_per_task = max(1, pages_per_task)
+        # "spawn" keeps workers safe to start from threaded processes (web server, parse_worker)
+        self._pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def page_ranges(self, page_count):
+        return [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+
+    def extract_pdf(self, pdf_path):
+        if hasattr(pdf_path, "read") or isinstance(pdf_path, (bytes, bytearray)):
+            # File objects can't cross the process boundary, and bytes would be pickled
+            # into every task: spool them to one temporary file the workers share
+            data = pdf_path.read() if hasattr(pdf_path, "read") else pdf_path
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spooled:
+                spooled.write(data)
+            try:
+                return self._extract_path(spooled.name)
+            finally:
+                os.remove(spooled.name)
+        return self._extract_path(os.fspath(pdf_path))
+
+    def _extract_path(self, path):
+        page_count = count_pdf_pages(path)
+        if page_count <= self.pages_per_task:
+            return self._pool.submit(extract_pdf_pages, path).result()
+
+        futures = [
+            self._pool.submit(extract_pdf_pages, path, start, end)
+            for start, end in self.page_ranges(page_count)
+        ]
+        return "".join(f.result() for f in futures)
+
+    def shutdown(self):
+        self._pool.shutdown(cancel_futures=True)
+
+
+# ------------ PROCESS-WIDE EXECUTOR ------------
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_extraction_executor():
+    """
+    Returns the configured executor. RESUME_EXTRACT_WORKERS=0 (default) extracts
+    inline; any positive value starts a process pool of that size on first use.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(os.getenv("RESUME_EXTRACT_WORKERS", "0"))
+                if workers > 0:
+                    pages_per_task = int(os.getenv("RESUME_EXTRACT_PAGES_PER_TASK", "4"))
+                    _executor = ProcessPoolExtractionExecutor(workers, pages_per_task=pages_per_task)
+                else:
+                    _executor = InlineExtractionExecutor()
+    return _executor
+
+def set_extraction_executor(executor):
+    """Swaps the process-wide executor (e.g. for tests or a custom backend)."""
+    global _executor
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    if previous is not None and previous is not executor:
+        previous.shutdown()
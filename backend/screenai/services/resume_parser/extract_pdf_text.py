@@ -1,17 +1,6 @@
-import pdfplumber
-import pytesseract
-from PIL import Image
+from screenai.services.resume_parser.extraction import extract_pdf
+
 
 def extract_pdf_text(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text and page_text.strip():
-                text += page_text + "\n"
-            else:
-                # OCR fallback for scanned pages
-                im = page.to_image(resolution=300).original
-                ocr_text = pytesseract.image_to_string(im)
-                text += ocr_text + "\n"
-    return text
+    # Same tiered engine as the parser, with OCR allowed for scanned pages
+    return extract_pdf(pdf_path, allow_ocr=True).text
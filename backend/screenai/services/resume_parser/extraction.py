@@ -0,0 +1,163 @@
+"""
+Tiered PDF text extraction.
+
+Tries the cheapest extractor first and only escalates when its output looks poor:
+
+1. text_layer - pypdf reads the embedded text layer (fast, fine for born-digital PDFs)
+2. layout     - pdfplumber layout-aware pass (through the extraction executor)
+3. ocr        - tesseract on pages with no text layer (scanned resumes, opt-in)
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from screenai.services.resume_parser.executor import get_extraction_executor
+
+TIER_TEXT_LAYER = "text_layer"
+TIER_LAYOUT = "layout"
+TIER_OCR = "ocr"
+TIERS = (TIER_TEXT_LAYER, TIER_LAYOUT, TIER_OCR)
+
+MIN_CHARS_PER_PAGE = int(os.getenv("RESUME_EXTRACT_MIN_CHARS_PER_PAGE", "200"))
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    tier: str
+    pages: int
+    seconds: float
+
+
+# ------------ QUALITY CHECK ------------
+def is_text_usable(text, page_count, min_chars_per_page=None):
+    """
+    Heuristic check that extracted text is worth sending to the parser:
+    enough characters per page, mostly letters, no glyph-id soup and
+    words that are not all glued together.
+    """
+    if min_chars_per_page is None:
+        min_chars_per_page = MIN_CHARS_PER_PAGE
+
+    visible = [c for c in text if not c.isspace()]
+    if not visible or len(visible) < min_chars_per_page * max(page_count, 1):
+        return False
+
+    # Unmapped fonts come out as "(cid:123)" or U+FFFD replacement characters
+    garbage = text.count("(cid:") * 6 + text.count("\ufffd")
+    if garbage / len(visible) > 0.05:
+        return False
+
+    letters = sum(1 for c in visible if c.isalpha())
+    if letters / len(visible) < 0.5:
+        return False
+
+    words = text.split()
+    if sum(len(w) for w in words) / len(words) > 20:
+        return False
+
+    return True
+
+
+# ------------ TIERS ------------
+def _rewind(source):
+    # File-like sources are read by several tiers in turn
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+def _extract_text_layer(pdf_path):
+    """Returns (text, page_count), or None when pypdf is unavailable or fails."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+
+    try:
+        reader = PdfReader(_rewind(pdf_path))
+        text = ""
+        for page in reader.pages:
+            t = page.extract_text()
+            if t:
+                text += t + "\n"
+        return text, len(reader.pages)
+    except Exception as e:
+        print(f"DEBUG: Text layer extraction failed, escalating: {e}")
+        return None
+
+def _extract_layout(pdf_path):
+    return get_extraction_executor().extract_pdf(_rewind(pdf_path))
+
+def _extract_ocr(pdf_path):
+    """pdfplumber per page, with tesseract OCR for pages that have no text layer."""
+    import pdfplumber
+    import pytesseract
+
+    text = ""
+    with pdfplumber.open(_rewind(pdf_path)) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text and page_text.strip():
+                text += page_text + "\n"
+            else:
+                im = page.to_image(resolution=300).original
+                text += pytesseract.image_to_string(im) + "\n"
+    return text
+
+
+# ------------ ENGINE ------------
+class ExtractionStats:
+    """Per-tier document counts and time spent, to see the extraction cost split."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.documents = {tier: 0 for tier in TIERS}
+        self.seconds = {tier: 0.0 for tier in TIERS}
+
+    def record(self, result):
+        with self._lock:
+            self.documents[result.tier] += 1
+            self.seconds[result.tier] += result.seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                tier: {"documents": self.documents[tier], "seconds": round(self.seconds[tier], 3)}
+                for tier in TIERS
+            }
+
+
+extraction_stats = ExtractionStats()
+
+
+def extract_pdf(pdf_path, allow_ocr=False):
+    """
+    Extracts PDF text using the cheapest tier that produces usable text.
+    Accepts a path or a seekable file-like object.
+    """
+    started = time.perf_counter()
+    tier = TIER_TEXT_LAYER
+    page_count = 0
+
+    fast = _extract_text_layer(pdf_path)
+    if fast is not None:
+        text, page_count = fast
+    if fast is None or not is_text_usable(text, page_count):
+        tier = TIER_LAYOUT
+        text = _extract_layout(pdf_path)
+        if allow_ocr and not is_text_usable(text, page_count or 1):
+            try:
+                tier = TIER_OCR
+                text = _extract_ocr(pdf_path)
+            except ImportError:
+                # OCR stack (pytesseract/Pillow) not installed, keep the layout text
+                tier = TIER_LAYOUT
+
+    result = ExtractionResult(text=text, tier=tier, pages=page_count, seconds=time.perf_counter() - started)
+    extraction_stats.record(result)
+    print(f"DEBUG: PDF extracted via '{tier}' tier in {result.seconds:.3f}s")
+    return result
@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+
+
+# ------------ ERROR CLASSIFICATION ------------
+def is_rate_limit_error(error):
+    msg = str(error).lower()
+    return "429" in msg or "quota" in msg or "resource_exhausted" in msg or "rate limit" in msg
+
+def is_auth_error(error):
+    msg = str(error).lower()
+    return "api key not valid" in msg or "api_key_invalid" in msg or "valid api key" in msg or "403" in msg or "permission" in msg
+
+def is_model_missing_error(error):
+    msg = str(error).lower()
+    return "404" in msg or "not found" in msg
+
+
+# ------------ CIRCUIT BREAKER ------------
+class CircuitState:
+    """Failure bookkeeping for one (key, model) pair, one key, or one model."""
+
+    def __init__(self):
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.last_error = ""
+
+    def as_dict(self, now):
+        return {
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "open": self.open_until > now,
+            "retry_in": max(0.0, round(self.open_until - now, 1)),
+            "last_error": self.last_error,
+        }
+
+
+class LLMClientRegistry:
+    """
+    Process-wide pool of reusable LLM clients with a circuit breaker per key and model.
+
+    - Clients are built once per (model, key) by client_factory and reused.
+    - A (key, model) pair opens after failure_threshold consecutive failures, or
+      immediately on a 429/quota error, and is skipped until its cooldown passes.
+    - Invalid keys open for every model; missing models open for every key.
+
+    client_factory(model_name, api_key) must return an object with .invoke(prompt),
+    so tests can pass a local stub instead of ChatGoogleGenerativeAI.
+    """
+
+    def __init__(self, client_factory, failure_threshold=3, cooldown_seconds=60,
+                 rate_limit_cooldown_seconds=300, clock=time.monotonic):
+        self.client_factory = client_factory
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.rate_limit_cooldown_seconds = rate_limit_cooldown_seconds
+        self.clock = clock
+        self._clients = {}
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, key, model):
+        state = self._circuits.get((key, model))
+        if state is None:
+            state = self._circuits[(key, model)] = CircuitState()
+        return state
+
+    def get_client(self, model, api_key):
+        with self._lock:
+            client = self._clients.get((model, api_key))
+        if client is None:
+            client = self.client_factory(model_name=model, api_key=api_key)
+            with self._lock:
+                client = self._clients.setdefault((model, api_key), client)
+        return client
+
+    def is_available(self, model, api_key):
+        now = self.clock()
+        with self._lock:
+            for scope in ((api_key, model), (api_key, None), (None, model)):
+                state = self._circuits.get(scope)
+                if state is not None and state.open_until > now:
+                    return False
+        return True
+
+    def available_pairs(self, models, api_keys):
+        """(model, key) pairs in priority order, skipping open circuits."""
+        return [(m, k) for m in models for k in api_keys if self.is_available(m, k)]
+
+    def record_success(self, model, api_key):
+        with self._lock:
+            state = self._circuit(api_key, model)
+            state.successes += 1
+            state.consecutive_failures = 0
+            state.open_until = 0.0
+
+    def record_failure(self, model, api_key, error):
+        now = self.clock()
+        with self._lock:
+            state = self._circuit(api_key, model)
+            state.failures += 1
+            state.consecutive_failures += 1
+            state.last_error = str(error)[:200]
+
+            if is_auth_error(error):
+                scope = self._circuit(api_key, None)
+                scope.last_error = state.last_error
+                scope.open_until = now + self.rate_limit_cooldown_seconds
+            elif is_model_missing_error(error):
+                scope = self._circuit(None, model)
+                scope.last_error = state.last_error
+                scope.open_until = now + self.rate_limit_cooldown_seconds
+            elif is_rate_limit_error(error):
+                state.open_until = now + self.rate_limit_cooldown_seconds
+            elif state.consecutive_failures >= self.failure_threshold:
+                state.open_until = now + self.cooldown_seconds
+                # Half-open after the cooldown: one more failure re-opens straight away
+                state.consecutive_failures = self.failure_threshold - 1
+
+    def reset(self):
+        with self._lock:
+            self._clients.clear()
+            self._circuits.clear()
+
+    def health_snapshot(self):
+        """Circuit state per scope, with API keys masked."""
+        now = self.clock()
+
+        def mask(key):
+            if key is None:
+                return "*"
+            return f"...{key[-4:]}" if len(key) > 4 else "INVALID"
+
+        with self._lock:
+            return {
+                f"{mask(key)}/{model or '*'}": state.as_dict(now)
+                for (key, model), state in self._circuits.items()
+            }
+
+
+def registry_settings():
+    return {
+        "failure_threshold": int(os.getenv("LLM_FAILURE_THRESHOLD", "3")),
+        "cooldown_seconds": float(os.getenv("LLM_COOLDOWN_SECONDS", "60")),
+        "rate_limit_cooldown_seconds": float(os.getenv("LLM_RATE_LIMIT_COOLDOWN_SECONDS", "300")),
+    }
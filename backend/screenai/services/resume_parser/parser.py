@@ -1,35 +1,23 @@
 from math import lcm
-import pdfplumber
-import docx
 import datetime
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel
 from typing import List, Optional
 from dotenv import load_dotenv
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
+
+from screenai.services.resume_parser.cache import parse_cache, file_digest
+from screenai.services.resume_parser.compaction import compact_resume_text
+from screenai.services.resume_parser.extraction import extract_pdf
+from screenai.services.resume_parser.llm_pool import LLMClientRegistry, registry_settings
+from screenai.services.resume_parser.skills import get_skill_matcher
 
 load_dotenv()
 
-# ------------ CONSTANTS ------------
-SKILL_KEYWORDS = [
-    # Languages
-    "python", "java", "javascript", "typescript", "c++", "c#", "ruby", "php", "swift", "kotlin", "go", "rust",
-    # Web
-    "react", "angular", "vue", "html", "css", "django", "flask", "fastapi", "spring", "node.js", "express",
-    # Data/AI
-    "sql", "postgresql", "mysql", "mongodb", "redis", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "keras", "openai", "llm", "rag",
-    # Tools/Cloud
-    "git", "docker", "kubernetes", "aws", "azure", "gcp", "linux", "jenkins", "jira", "agile", "scrum",
-    # Microsoft
-    "excel", "microsoft excel", "powerbi", "power bi", "word", "powerpoint",
-    # Mobile/Other
-    "flutter", "dart", "react native", "ios", "android", "swift", "kotlin", "unity",
-    # New additions based on feedback
-    "machine learning", "ml", "deep learning", "nlp", "computer vision", "statistics", "mathematics"
-]
+# docx, langchain and the Gemini client are imported on first use (see startup_benchmark):
+# most processes that import this module never parse a resume.
 
 # ------------ SCHEMA ------------
 class WorkExperience(BaseModel):
@@ -55,26 +43,77 @@ class ResumeData(BaseModel):
 class FinalOutput(BaseModel):
     data: ResumeData
 
-parser = PydanticOutputParser(pydantic_object=FinalOutput)
+@lru_cache(maxsize=None)
+def get_output_parser():
+    from langchain_core.output_parsers import PydanticOutputParser
+    return PydanticOutputParser(pydantic_object=FinalOutput)
 
 # ------------ PDF TEXT EXTRACTION ------------
-def extract_pdf_text(pdf_path):
-    text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            t = page.extract_text()
-            if t:
-                text += t + "\n"
-    return text
+def extract_pdf_text(pdf_file):
+    # Cheap text layer first, pdfplumber layout pass only when that looks poor
+    return extract_pdf(pdf_file).text
 
 # ------------ DOCX TEXT EXTRACTION ------------
-def extract_docx_text(docx_path):
-    doc = docx.Document(docx_path)
+def extract_docx_text(docx_file):
+    if hasattr(docx_file, "seek"):
+        docx_file.seek(0)
+    import docx
+
+    doc = docx.Document(docx_file)
     text = []
     for para in doc.paragraphs:
         text.append(para.text)
     return '\n'.join(text)
 
+# ------------ TEXT EXTRACTION (CACHED) ------------
+def get_source_name(source, filename=None):
+    """File name used to pick the extractor: explicit name, upload name, or the path itself."""
+    if filename:
+        return filename
+    if hasattr(source, "read"):
+        return getattr(source, "name", "") or ""
+    return os.fspath(source)
+
+def extract_resume(source, filename=None):
+    """
+    Extracts (text, tier) from a resume given as a path or a file-like object
+    (e.g. an InMemoryUploadedFile), without writing it to storage. The tier is the
+    PDF extraction tier that served the document, or "docx".
+    """
+    ext = os.path.splitext(get_source_name(source, filename))[1].lower()
+
+    if ext == '.pdf':
+        result = extract_pdf(source)
+        return result.text, result.tier
+    elif ext in ['.docx', '.doc']:
+        if ext == '.doc':
+             raise ValueError("Legacy .doc format not supported. Please convert to .docx or .pdf")
+        return extract_docx_text(source), "docx"
+    else:
+        raise ValueError(f"Unsupported file format: {ext}")
+
+def extract_resume_text(source, filename=None):
+    return extract_resume(source, filename)[0]
+
+def get_resume_text(source, filename=None):
+    """
+    Returns (digest, text) for a resume path or file-like object, reusing the
+    extracted text when the same file bytes were already seen.
+    """
+    digest = file_digest(source)
+    text = parse_cache.get_text(digest)
+    if text is None:
+        text, tier = extract_resume(source, filename)
+        parse_cache.set_text(digest, text, tier)
+    return digest, text
+
+def with_extraction_tier(result, digest):
+    """Adds the tier that extracted the file (see extraction.py) to a parse result, when known."""
+    tier = parse_cache.get_tier(digest)
+    if tier and isinstance(result, dict):
+        result["extraction_tier"] = tier
+    return result
+
 # ------------ API KEYS MANAGMENT ------------
 def get_available_api_keys():
     """Returns a list of available API keys from environment variables."""
@@ -104,18 +143,26 @@ def get_llm(model_name="gemini-2.5-flash", api_key=None):
     if not api_key:
         raise RuntimeError("No API Key provided")
 
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
     return ChatGoogleGenerativeAI(
         model=model_name,
         temperature=0,
         google_api_key=api_key
     )
 
-# ------------ PROMPT ------------
-parse_prompt = PromptTemplate(
-    template="""
-Extract the following fields from the resume and return JSON in EXACT FORMAT:
+MODELS_TO_TRY = [
+    "gemini-1.5-flash",        # <--- FASTEST & STABLE. Prioritize this.
+    "gemini-2.0-flash-exp",    # New fast model
+    "gemini-1.5-pro",          # Good fallback
+    "gemini-pro"               # Legacy
+]
+
+# Reusable clients + per key/model circuit breakers, shared by every thread in the process
+llm_registry = LLMClientRegistry(client_factory=lambda **kw: get_llm(**kw), **registry_settings())
 
-- candidate_name (Extract the full name of the candidate)
+# ------------ PROMPT ------------
+RESUME_FIELDS = """- candidate_name (Extract the full name of the candidate)
 - email
 - phone
 - total_years_experience (Numeric float value, e.g. 2.5)
@@ -124,116 +171,211 @@ Extract the following fields from the resume and return JSON in EXACT FORMAT:
 - skills (List of strings)
 - education (List of strings)
 - certifications (List of strings)
+"""
+
+@lru_cache(maxsize=None)
+def get_parse_prompt():
+    from langchain_core.prompts import PromptTemplate
+
+    return PromptTemplate(
+        template="""
+Extract the following fields from the resume and return JSON in EXACT FORMAT:
 
+""" + RESUME_FIELDS + """
 {format_instructions}
 
 Resume Text:
 {resume_text}
 """,
-    input_variables=["resume_text"],
-    partial_variables={"format_instructions": parser.get_format_instructions()}
-)
-
-# ------------ PARSER FUNCTION ------------
-def parse_resume(file_path, custom_questions: List[str] = None):
-    ext = os.path.splitext(file_path)[1].lower()
-    
-    if ext == '.pdf':
-        text = extract_pdf_text(file_path)
-    elif ext in ['.docx', '.doc']:
-        if ext == '.doc':
-             raise ValueError("Legacy .doc format not supported. Please convert to .docx or .pdf")
-        text = extract_docx_text(file_path)
-    else:
-        raise ValueError(f"Unsupported file format: {ext}")
+        input_variables=["resume_text"],
+        partial_variables={"format_instructions": get_output_parser().get_format_instructions()}
+    )
 
-    # Inject Custom Questions if provided
+def get_questions_section(custom_questions):
     questions_section = ""
     if custom_questions and len(custom_questions) > 0:
         questions_section = "\nAlso answer these specific screening questions based on the resume content:\n"
         for q in custom_questions:
             questions_section += f"- {q}\n"
+    return questions_section
 
-    final_prompt = parse_prompt.template.replace("{resume_text}", f"{{resume_text}}\n{questions_section}")
-    # Re-create prompt object with injection
-    active_prompt = PromptTemplate(
-        template=final_prompt,
-        input_variables=["resume_text"],
-        partial_variables={"format_instructions": parser.get_format_instructions()}
-    )
+_RESUME_TEXT_SLOT = "\x00RESUME_TEXT\x00"
 
-    prompt = active_prompt.format(resume_text=text)
-    print(f"DEBUG: Extracted text length: {len(text)} chars")
+@lru_cache(maxsize=256)
+def get_prompt_parts(questions=()):
+    """
+    The parse prompt rendered once per screening-question set, split around the
+    resume text slot. Building a prompt is then a plain string concatenation.
+    """
+    # Inject Custom Questions if provided
+    questions_section = get_questions_section(questions)
+    rendered = get_parse_prompt().format(resume_text=_RESUME_TEXT_SLOT)
+    head, tail = rendered.split(_RESUME_TEXT_SLOT)
+    return head, f"\n{questions_section}" + tail
+
+def build_prompt(text, custom_questions=None):
+    head, tail = get_prompt_parts(tuple(custom_questions or ()))
+    return head + compact_resume_text(text) + tail
+
+# ------------ LLM CALL ------------
+PROJECT_KEYWORDS = ["project", "study", "prediction", "thesis", "clone", "detection", "semester", "mca", "btech", "degree", "bachelor", "master", "student", "class", "course", "college", "school", "university", "campus"]
+
+def _invoke_llm(model, api_key, prompt, key_idx=0):
+    """One model/key round trip. Records the outcome in llm_registry and returns the raw content."""
+    # Mask key for logging
+    masked_key = f"...{api_key[-4:]}" if len(api_key) > 4 else "INVALID"
+    print(f"Trying model: {model} with Key #{key_idx + 1} ({masked_key})")
+
+    try:
+        llm = llm_registry.get_client(model, api_key)
+        response = llm.invoke(prompt)
+    except Exception as e:
+        llm_registry.record_failure(model, api_key, e)
+        raise
+    # The key/model answered; a malformed answer is not a health problem
+    llm_registry.record_success(model, api_key)
+    return response.content
+
+def _filter_work_experience(resume_data):
+    # --- POST PROCESSING FILTER ---
+    # Strictly remove academic projects that LLM might have let through
+    # Remove "system", "app" to allow real jobs
+    # Add Education terms
+    filtered_exp = []
+    for exp in resume_data.work_experience:
+        c = (exp.company_name or "").lower()
+        r = (exp.job_role or "").lower()
+        
+        is_bad = False
+        for pk in PROJECT_KEYWORDS:
+            # Check specific whole words or very strong signals
+            if f" {pk} " in f" {c} " or f" {pk} " in f" {r} ":
+                 is_bad = True
+                 break
+        
+        if not is_bad:
+            filtered_exp.append(exp)
+            
+    resume_data.work_experience = filtered_exp
+    # -------------------------------
+
+def _call_llm(model, api_key, prompt, key_idx=0):
+    """One model/key attempt, returns the parsed and filtered FinalOutput dict."""
+    parsed = get_output_parser().parse(_invoke_llm(model, api_key, prompt, key_idx))
+    _filter_work_experience(parsed.data)
+    return parsed.dict()
+
+def _call_llm_serial(prompt, api_keys):
+    """Models in priority order, each tried with ALL healthy keys. Returns None if all fail."""
+    for model in MODELS_TO_TRY:
+        for key_idx, api_key in enumerate(api_keys):
+            # Keys/models whose circuit is open (recent failures, 429s) are skipped without a round trip
+            if not llm_registry.is_available(model, api_key):
+                continue
+            try:
+                return _call_llm(model, api_key, prompt, key_idx)
+            except Exception as e:
+                print(f"Model {model} with Key #{key_idx + 1} failed: {e}")
+    return None
+
+# Shared by all hedged calls; losers keep running here until their HTTP call returns
+_hedge_pool = ThreadPoolExecutor(max_workers=int(os.getenv("LLM_HEDGE_WORKERS", "8")), thread_name_prefix="llm-hedge")
+
+def _call_llm_hedged(prompt, api_keys, hedge_after):
+    """
+    Hedged fallback: start the primary attempt, and every time the in-flight attempts
+    exceed the hedge_after budget (or one fails) start the next one. Attempts go
+    key by key across models, so the backup for a slow model is the next model.
+    The first valid result wins; attempts that have not started are cancelled and
+    running ones are abandoned (their result is ignored).
+    """
+    def next_attempts():
+        for key_idx, api_key in enumerate(api_keys):
+            for model in MODELS_TO_TRY:
+                # Checked lazily, so a failure during hedging closes the door for later attempts
+                if llm_registry.is_available(model, api_key):
+                    yield model, api_key, key_idx
+
+    attempts = next_attempts()
+    pending = {}
+
+    def launch():
+        attempt = next(attempts, None)
+        if attempt is None:
+            return False
+        model, api_key, key_idx = attempt
+        pending[_hedge_pool.submit(_call_llm, model, api_key, prompt, key_idx)] = (model, key_idx)
+        return True
+
+    launch()
+    while pending:
+        done, _ = wait(pending, timeout=hedge_after, return_when=FIRST_COMPLETED)
+        if not done:
+            print(f"DEBUG: No answer within {hedge_after}s, hedging to the next model")
+            launch()
+            continue
+
+        for future in done:
+            model, key_idx = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Model {model} with Key #{key_idx + 1} failed: {e}")
+                launch()
+                continue
+            for other in pending:
+                other.cancel()
+            print(f"DEBUG: Hedged call won by {model} with Key #{key_idx + 1}")
+            return result
+    return None
+
+# ------------ PARSER FUNCTION ------------
+def parse_resume(source, custom_questions: List[str] = None, filename=None, hedge_after=None):
+    """
+    Parses a resume path or uploaded file-like object into a FinalOutput dict.
+
+    hedge_after: None tries models one after another (bulk/background parsing).
+    A number of seconds enables hedging for latency-sensitive callers: if the
+    in-flight request has not answered within that budget, the next model is
+    started in parallel and the first valid answer wins.
+    """
+    digest, text = get_resume_text(source, filename)
+
+    # Same file bytes + same questions -> same answer, skip the LLM entirely
+    questions_key = tuple(custom_questions or ())
+    cached = parse_cache.get_result(digest, questions_key)
+    if cached is not None:
+        print(f"DEBUG: Parse cache hit for {digest[:12]}")
+        return with_extraction_tier(cached, digest)
+
+    prompt = build_prompt(text, custom_questions)
+    print(f"DEBUG: Extracted text length: {len(text)} chars, prompt length: {len(prompt)} chars")
 
-    models_to_try = [
-        "gemini-1.5-flash",        # <--- FASTEST & STABLE. Prioritize this.
-        "gemini-2.0-flash-exp",    # New fast model
-        "gemini-1.5-pro",          # Good fallback
-        "gemini-pro"               # Legacy
-    ]
-    
     # 2. Get Keys
     api_keys = get_available_api_keys()
     if not api_keys:
         raise RuntimeError("No 'GOOGLE_API_KEY' or 'GEMINI_API_KEY' found in environment.")
     
-    last_exception = None
-    import time
-    
-    for model in models_to_try:
-        # For each model, try ALL available keys
-        for key_idx, api_key in enumerate(api_keys):
-            try:
-                # Mask key for logging
-                masked_key = f"...{api_key[-4:]}" if len(api_key) > 4 else "INVALID"
-                print(f"Trying model: {model} with Key #{key_idx + 1} ({masked_key})")
-                
-                # Force set env var for Langchain/GenerativeAI robustness
-                os.environ["GOOGLE_API_KEY"] = api_key
-                os.environ["GEMINI_API_KEY"] = api_key
-                
-                llm = get_llm(model_name=model, api_key=api_key)
-                response = llm.invoke(prompt)
-                parsed = parser.parse(response.content)
-                
-                # --- POST PROCESSING FILTER ---
-                # Strictly remove academic projects that LLM might have let through
-                # Remove "system", "app" to allow real jobs
-                # Add Education terms
-                project_keywords = ["project", "study", "prediction", "thesis", "clone", "detection", "semester", "mca", "btech", "degree", "bachelor", "master", "student", "class", "course", "college", "school", "university", "campus"]
-                filtered_exp = []
-                for exp in parsed.data.work_experience:
-                    c = (exp.company_name or "").lower()
-                    r = (exp.job_role or "").lower()
-                    
-                    is_bad = False
-                    for pk in project_keywords:
-                        # Check specific whole words or very strong signals
-                        if f" {pk} " in f" {c} " or f" {pk} " in f" {r} ":
-                             is_bad = True
-                             break
-                    
-                    if not is_bad:
-                        filtered_exp.append(exp)
-                        
-                parsed.data.work_experience = filtered_exp
-                # -------------------------------
-                
-                return parsed.dict()
-                
-            except Exception as e:
-                msg = f"Model {model} with Key #{key_idx + 1} failed: {e}"
-                print(msg)
-                
-                last_exception = e
-                # Don't sleep if it's a key error, just switch fast. 
-                # time.sleep(0.5) 
-                continue
-            
+    if hedge_after is None:
+        result = _call_llm_serial(prompt, api_keys)
+    else:
+        result = _call_llm_hedged(prompt, api_keys, hedge_after)
+
+    if result is not None:
+        # Only LLM results are cached; the regex fallback below should be retried next time
+        parse_cache.set_result(digest, questions_key, result)
+        return with_extraction_tier(result, digest)
             
     # If all models AND all keys fail, use Regex Fallback
     print("WARNING: All LLM models failed. Attempting Regex fallback...")
-    
+    return with_extraction_tier(parse_resume_regex(text), digest)
+
+
+def parse_resume_regex(text):
+    """
+    Best-effort extraction without an LLM (contact info, keyword skills, dated experience).
+    Returns the same {'data': {...}} structure as an LLM parse.
+    """
     import re
     email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
     phone_pattern = r'(\+?\d{1,4}[-.\s]?)?(\(?\d{3}\)?[-.\s]?)?\d{3}[-.\s]?\d{4}'
@@ -273,15 +415,11 @@ def parse_resume(file_path, custom_questions: List[str] = None):
     # .dict() on that object returns {'data': {...}}
     
     # Heuristic for Skills
-    found_skills = []
     text_lower = text.lower()
-    
-    # 1. Keyword Scan
-    for skill in SKILL_KEYWORDS:
-        # Simple whole word match ideally, but simple substring for now is okay for fallback
-        # Better: use regex for word boundary
-        if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
-            found_skills.append(skill.title())  # Capitalize for display
+    matcher = get_skill_matcher()
+
+    # 1. Keyword Scan (one pass over the text, synonyms mapped to canonical names)
+    found_skills = matcher.find_skills(text)
 
     # 2. Section Scraper (Greedy Search)
     # Look for "SKILLS" header and grab lines until next empty line or header
@@ -308,8 +446,9 @@ def parse_resume(file_path, custom_questions: List[str] = None):
                 p_clean = p.strip('•-–* ')
                 if 2 < len(p_clean) < 30: # Reasonable skill length
                      # Add if not already found (and not super generic words)
-                     if p_clean.title() not in found_skills:
-                         found_skills.append(p_clean.title())
+                     skill_name = matcher.canonical_name(p_clean) or p_clean.title()
+                     if skill_name not in found_skills:
+                         found_skills.append(skill_name)
 
     # Heuristic for Work Experience
     found_experience = []
@@ -382,6 +521,124 @@ def parse_resume(file_path, custom_questions: List[str] = None):
     }
 
 
+# ------------ BATCH PARSING ------------
+class BatchItem(BaseModel):
+    index: int
+    data: ResumeData
+
+class BatchOutput(BaseModel):
+    results: List[BatchItem]
+
+@lru_cache(maxsize=None)
+def get_batch_output_parser():
+    from langchain_core.output_parsers import PydanticOutputParser
+    return PydanticOutputParser(pydantic_object=BatchOutput)
+
+BATCH_SIZE = int(os.getenv("RESUME_PARSE_BATCH_SIZE", "5"))
+
+@lru_cache(maxsize=256)
+def get_batch_prompt_head(count, questions=()):
+    return (
+        f"\nBelow are {count} resumes, each starting with a line \"=== RESUME <index> ===\".\n"
+        "For EACH resume extract the following fields. Return ONE JSON object whose \"results\" list "
+        "has exactly one entry per resume, with its \"index\" and the fields under \"data\":\n\n"
+        + RESUME_FIELDS
+        + get_questions_section(questions)
+        + "\n" + get_batch_output_parser().get_format_instructions()
+        + "\n\n"
+    )
+
+def build_batch_prompt(texts, custom_questions=None):
+    resumes = "\n".join(f"=== RESUME {i} ===\n{compact_resume_text(text)}\n" for i, text in enumerate(texts))
+    return get_batch_prompt_head(len(texts), tuple(custom_questions or ())) + resumes
+
+def _call_llm_batch(texts, custom_questions, api_keys):
+    """
+    One structured request for several resumes. Returns a FinalOutput dict per text,
+    None when no model/key answered, and raises when the answer does not validate.
+    """
+    prompt = build_batch_prompt(texts, custom_questions)
+    for model, api_key in llm_registry.available_pairs(MODELS_TO_TRY, api_keys):
+        try:
+            content = _invoke_llm(model, api_key, prompt, api_keys.index(api_key))
+        except Exception as e:
+            print(f"Model {model} failed on a batch of {len(texts)}: {e}")
+            continue
+
+        parsed = get_batch_output_parser().parse(content)
+        by_index = {item.index: item.data for item in parsed.results}
+        if sorted(by_index) != list(range(len(texts))):
+            raise ValueError(f"Batch answer covered resumes {sorted(by_index)}, expected 0..{len(texts) - 1}")
+
+        results = []
+        for i in range(len(texts)):
+            _filter_work_experience(by_index[i])
+            results.append(FinalOutput(data=by_index[i]).dict())
+        return results
+    return None
+
+def _parse_texts_batched(texts, custom_questions, api_keys):
+    """Batch request with split-on-failure: an invalid answer retries each half on its own."""
+    if len(texts) == 1:
+        return [_call_llm_serial(build_prompt(texts[0], custom_questions), api_keys)]
+
+    try:
+        results = _call_llm_batch(texts, custom_questions, api_keys)
+    except Exception as e:
+        print(f"DEBUG: Batch of {len(texts)} failed validation ({e}), splitting")
+        mid = len(texts) // 2
+        return (_parse_texts_batched(texts[:mid], custom_questions, api_keys)
+                + _parse_texts_batched(texts[mid:], custom_questions, api_keys))
+
+    # No model answered at all; splitting would only repeat the same failures
+    return results if results is not None else [None] * len(texts)
+
+def parse_resume_batch(sources, custom_questions: List[str] = None, batch_size=None):
+    """
+    Parses many resumes (paths or file-like objects) sharing the same screening questions,
+    packing up to batch_size resume texts into each LLM request.
+
+    Returns one entry per source, in order: the FinalOutput dict, or the exception
+    raised while reading that source (so one bad file doesn't sink the batch).
+    """
+    batch_size = batch_size or BATCH_SIZE
+    questions_key = tuple(custom_questions or ())
+    results = [None] * len(sources)
+    pending = []
+
+    for i, source in enumerate(sources):
+        try:
+            digest, text = get_resume_text(source)
+        except Exception as e:
+            results[i] = e
+            continue
+        cached = parse_cache.get_result(digest, questions_key)
+        if cached is not None:
+            results[i] = with_extraction_tier(cached, digest)
+        else:
+            pending.append((i, digest, text))
+
+    if not pending:
+        return results
+
+    api_keys = get_available_api_keys()
+    if not api_keys:
+        raise RuntimeError("No 'GOOGLE_API_KEY' or 'GEMINI_API_KEY' found in environment.")
+
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        parsed = _parse_texts_batched([text for _, _, text in chunk], custom_questions, api_keys)
+        for (i, digest, text), result in zip(chunk, parsed):
+            if result is None:
+                print("WARNING: All LLM models failed for a batched resume. Attempting Regex fallback...")
+                result = parse_resume_regex(text)
+            else:
+                parse_cache.set_result(digest, questions_key, result)
+            results[i] = with_extraction_tier(result, digest)
+
+    return results
+
+
 def scan_resume_regex(text):
     """
     Perform a quick regex-based scan for contact info and basic details.
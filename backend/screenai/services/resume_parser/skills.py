@@ -0,0 +1,144 @@
+"""
+Skill taxonomy and single-pass skill matching.
+
+The taxonomy maps a canonical display name to its synonyms ("React": ["reactjs", ...]).
+All names and synonyms are compiled once into a single alternation regex, longest
+term first, so one scan over the text finds every skill and maps it to its
+canonical name.
+
+A custom taxonomy can be supplied as JSON ({"Canonical": ["synonym", ...]}) via
+RESUME_SKILL_TAXONOMY; the matcher is rebuilt only when that file changes, and
+set_skill_taxonomy() installs one in memory.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+DEFAULT_TAXONOMY = {
+    # Languages
+    "Python": [], "Java": [], "JavaScript": ["js", "ecmascript"], "TypeScript": [],
+    "C++": ["cpp"], "C#": ["c sharp", "csharp"], "Ruby": [], "PHP": [], "Swift": [], "Kotlin": [],
+    "Go": ["golang"], "Rust": [],
+    # Web
+    "React": ["reactjs", "react.js"], "Angular": ["angularjs", "angular.js"], "Vue": ["vue.js", "vuejs"],
+    "HTML": ["html5"], "CSS": ["css3"], "Django": [], "Flask": [], "FastAPI": [],
+    "Spring": ["spring boot", "springboot"], "Node.js": ["nodejs", "node js"], "Express": ["express.js", "expressjs"],
+    # Data/AI
+    "SQL": [], "PostgreSQL": ["postgres"], "MySQL": [], "MongoDB": ["mongo"], "Redis": [],
+    "Pandas": [], "NumPy": [], "Scikit-Learn": ["sklearn", "scikit learn"], "TensorFlow": [], "PyTorch": [],
+    "Keras": [], "OpenAI": [], "LLM": ["llms", "large language models"], "RAG": ["retrieval augmented generation"],
+    # Tools/Cloud
+    "Git": [], "Docker": [], "Kubernetes": ["k8s"], "AWS": ["amazon web services"], "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"], "Linux": [], "Jenkins": [], "Jira": [], "Agile": [], "Scrum": [],
+    # Microsoft
+    "Excel": ["microsoft excel", "ms excel"], "Power BI": ["powerbi"], "Word": ["microsoft word", "ms word"],
+    "PowerPoint": ["microsoft powerpoint", "ms powerpoint"],
+    # Mobile/Other
+    "Flutter": [], "Dart": [], "React Native": [], "iOS": [], "Android": [], "Unity": [],
+    "Machine Learning": ["ml"], "Deep Learning": [], "NLP": ["natural language processing"],
+    "Computer Vision": [], "Statistics": [], "Mathematics": [],
+}
+
+
+def normalize_term(term):
+    """Case-folded, single-spaced form used for lookups."""
+    return " ".join(term.casefold().split())
+
+
+class SkillMatcher:
+    def __init__(self, taxonomy):
+        self.taxonomy = taxonomy
+        self._canonical = {}
+        for canonical, synonyms in taxonomy.items():
+            for term in [canonical, *synonyms]:
+                self._canonical.setdefault(normalize_term(term), canonical)
+
+        # Longest first, so "react native" wins over "react" at the same position
+        terms = sorted(self._canonical, key=len, reverse=True)
+        alternation = "|".join(re.escape(t).replace(r"\ ", r"\s+") for t in terms)
+        # Word-ish boundaries that also work for "c++", "c#" and "node.js"
+        self._pattern = re.compile(r"(?<!\w)(?:" + alternation + r")(?![\w+#])", re.IGNORECASE)
+
+    def canonical_name(self, term):
+        """Canonical name for a skill or synonym, None when it is not in the taxonomy."""
+        return self._canonical.get(normalize_term(term))
+
+    def find_skills(self, text):
+        """Canonical names of every taxonomy skill in text, in order of first mention."""
+        found = {}
+        for match in self._pattern.finditer(text):
+            canonical = self._canonical[normalize_term(match.group(0))]
+            found.setdefault(canonical, None)
+        return list(found)
+
+
+def taxonomy_fingerprint(taxonomy):
+    return hashlib.sha256(json.dumps(taxonomy, sort_keys=True).encode()).hexdigest()
+
+
+_matcher = None
+_matcher_fingerprint = None
+_matcher_path = None
+_checked_at = 0.0
+_inline_matcher = None
+_matcher_lock = threading.Lock()
+
+# How often get_skill_matcher() stats the taxonomy file for changes
+SOURCE_CHECK_SECONDS = float(os.getenv("RESUME_SKILL_TAXONOMY_CHECK_SECONDS", "30"))
+
+def load_taxonomy():
+    """The taxonomy from RESUME_SKILL_TAXONOMY (JSON file) or the built-in one."""
+    path = os.getenv("RESUME_SKILL_TAXONOMY")
+    if not path:
+        return DEFAULT_TAXONOMY
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _source_fingerprint():
+    # File mtime/size is a cheap change check; the taxonomy itself is only hashed on rebuild
+    path = os.getenv("RESUME_SKILL_TAXONOMY")
+    if not path:
+        return "default"
+    stat = os.stat(path)
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+def get_skill_matcher(reload=False):
+    """
+    Process-wide matcher. The taxonomy file is checked for changes at most every
+    SOURCE_CHECK_SECONDS (immediately with reload=True or when the configured path
+    changes); an inline taxonomy from set_skill_taxonomy() wins until it is cleared.
+    """
+    global _matcher, _matcher_fingerprint, _matcher_path, _checked_at
+    inline = _inline_matcher
+    if inline is not None:
+        return inline
+
+    path = os.getenv("RESUME_SKILL_TAXONOMY") or None
+    now = time.monotonic()
+    matcher = _matcher
+    if matcher is not None and not reload and path == _matcher_path and now - _checked_at < SOURCE_CHECK_SECONDS:
+        return matcher
+
+    with _matcher_lock:
+        fingerprint = _source_fingerprint()
+        if _matcher is None or fingerprint != _matcher_fingerprint:
+            _matcher = SkillMatcher(load_taxonomy())
+            _matcher_fingerprint = fingerprint
+        _matcher_path, _checked_at = path, now
+        return _matcher
+
+def set_skill_taxonomy(taxonomy):
+    """
+    Installs an in-memory taxonomy that overrides RESUME_SKILL_TAXONOMY (a no-op when
+    it matches the current one); None goes back to the configured source.
+    """
+    global _inline_matcher
+    with _matcher_lock:
+        if taxonomy is None:
+            _inline_matcher = None
+        elif _inline_matcher is None or taxonomy_fingerprint(taxonomy) != taxonomy_fingerprint(_inline_matcher.taxonomy):
+            _inline_matcher = SkillMatcher(taxonomy)
+    return get_skill_matcher()
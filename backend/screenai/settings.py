@@ -85,6 +85,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'screenai.wsgi.application'
+ASGI_APPLICATION = 'screenai.asgi.application'
 
 
 # -------------------------------------------------------------------
@@ -103,6 +104,33 @@ db_from_env = dj_database_url.config(conn_max_age=600)
 DATABASES['default'].update(db_from_env)
 
 
+# -------------------------------------------------------------------
+# Cache
+# -------------------------------------------------------------------
+# Local memory by default; set REDIS_URL so every worker shares one cache
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ["REDIS_URL"],
+        }
+    }
+
+# Seconds an analytics response stays cached when nothing is written (writes invalidate it earlier)
+ANALYTICS_CACHE_TIMEOUT = int(os.environ.get("ANALYTICS_CACHE_TIMEOUT", "300"))
+# Where the analytics ETag version lives: "cache" (no query per poll, needs a shared cache)
+# or "db" (one indexed read per poll, seen by every process); defaults to "db" without REDIS_URL
+ANALYTICS_VERSION_STORE = os.environ.get("ANALYTICS_VERSION_STORE") or ("cache" if os.environ.get("REDIS_URL") else "db")
+
+# Dashboard push stream (GET /api/v1/events/, see candidates/events.py)
+DASHBOARD_EVENTS_POLL_SECONDS = float(os.environ.get("DASHBOARD_EVENTS_POLL_SECONDS", "1"))
+DASHBOARD_EVENTS_HEARTBEAT_SECONDS = float(os.environ.get("DASHBOARD_EVENTS_HEARTBEAT_SECONDS", "15"))
+DASHBOARD_EVENTS_STREAM_SECONDS = float(os.environ.get("DASHBOARD_EVENTS_STREAM_SECONDS", "300"))
+# Reconnect interval when the stream cannot be held open (WSGI); the old dashboard polled every 30s
+DASHBOARD_EVENTS_WSGI_RETRY_SECONDS = float(os.environ.get("DASHBOARD_EVENTS_WSGI_RETRY_SECONDS", "30"))
+DASHBOARD_EVENTS_RETENTION_HOURS = int(os.environ.get("DASHBOARD_EVENTS_RETENTION_HOURS", "24"))
+
+
 # -------------------------------------------------------------------
 # Password validation
 # -------------------------------------------------------------------
@@ -142,6 +170,7 @@ CORS_ALLOW_ALL_ORIGINS = True   # Allow all origins (React frontend)
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_HEADERS = ['*']
 CORS_ALLOW_METHODS = ['*']
+CORS_EXPOSE_HEADERS = ['ETag']
 
 
 # Default primary key field type
@@ -160,3 +189,37 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
 }
+
+# -------------------------------------------------------------------
+# Resume Parse Queue (see `manage.py parse_worker`)
+# -------------------------------------------------------------------
+PARSE_WORKER_CONCURRENCY = int(os.environ.get("PARSE_WORKER_CONCURRENCY", "2"))
+PARSE_JOB_MAX_ATTEMPTS = int(os.environ.get("PARSE_JOB_MAX_ATTEMPTS", "3"))
+PARSE_JOB_BACKOFF_SECONDS = int(os.environ.get("PARSE_JOB_BACKOFF_SECONDS", "30"))
+PARSE_JOB_LEASE_SECONDS = int(os.environ.get("PARSE_JOB_LEASE_SECONDS", "600"))
+# Resumes per LLM request for bulk (reparse_applications) jobs; uploads are parsed one at a time
+PARSE_WORKER_BATCH_SIZE = int(os.environ.get("PARSE_WORKER_BATCH_SIZE", "5"))
+
+# -------------------------------------------------------------------
+# Match Score Rescoring (see `manage.py rescore_worker`)
+# -------------------------------------------------------------------
+# Applications per rescore task when a job's criteria change
+RESCORE_CHUNK_SIZE = int(os.environ.get("RESCORE_CHUNK_SIZE", "1000"))
+RESCORE_TASK_LEASE_SECONDS = int(os.environ.get("RESCORE_TASK_LEASE_SECONDS", "300"))
+RESCORE_TASK_MAX_ATTEMPTS = int(os.environ.get("RESCORE_TASK_MAX_ATTEMPTS", "3"))
+
+# -------------------------------------------------------------------
+# Semantic Candidate Retrieval (see candidates/embeddings.py, candidates/vector_index.py)
+# -------------------------------------------------------------------
+# Dotted path to the embedder class; the default hashes n-grams locally (no model, no network)
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "candidates.embeddings.HashedNgramEmbedder")
+EMBEDDING_DIMENSIONS = int(os.environ.get("EMBEDDING_DIMENSIONS", "256"))
+# Pool size from which an HNSW graph (hnswlib, if installed) replaces exact search
+EMBEDDING_HNSW_MIN_ITEMS = int(os.environ.get("EMBEDDING_HNSW_MIN_ITEMS", "50000"))
+EMBEDDING_HNSW_EF = int(os.environ.get("EMBEDDING_HNSW_EF", "100"))
+# Index refreshes re-read this far behind the newest embedding: longer than any parse transaction
+EMBEDDING_REFRESH_LAG_SECONDS = int(os.environ.get("EMBEDDING_REFRESH_LAG_SECONDS", "300"))
+
+# Seconds the interactive resume preview waits on one LLM model before
+# hedging to the next one in parallel (bulk/background parsing never hedges)
+RESUME_PREVIEW_HEDGE_AFTER = float(os.environ.get("RESUME_PREVIEW_HEDGE_AFTER", "4"))
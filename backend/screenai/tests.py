@@ -0,0 +1,390 @@
+import io
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from screenai.services.resume_parser import parser as resume_parser
+from screenai.services.resume_parser.cache import ParseCache
+from screenai.services.resume_parser.compaction import compact_resume_text, normalize_text
+from screenai.services.resume_parser.executor import ProcessPoolExtractionExecutor, count_pdf_pages
+from screenai.services.resume_parser.extraction import ExtractionResult, is_text_usable
+from screenai.services.resume_parser.llm_pool import LLMClientRegistry
+from screenai.services.resume_parser import skills
+
+
+class ParseCacheTests(SimpleTestCase):
+    def test_lru_eviction_and_counters(self):
+        cache = ParseCache(max_entries=2)
+        cache.set_text("a", "text a")
+        cache.set_text("b", "text b")
+        cache.get_text("a")  # touch "a" so "b" is the least recently used
+        cache.set_text("c", "text c")
+
+        self.assertIsNone(cache.get_text("b"))
+        self.assertEqual(cache.get_text("a"), "text a")
+        stats = cache.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["text_hits"], 2)
+        self.assertEqual(stats["text_misses"], 1)
+
+    def test_results_are_keyed_by_questions(self):
+        cache = ParseCache()
+        cache.set_result("a", ("Q1",), {"data": {"skills": ["Python"]}})
+
+        self.assertIsNone(cache.get_result("a"))
+        hit = cache.get_result("a", ["Q1"])
+        hit["data"]["skills"].append("Go")
+        # Mutating a returned result must not leak back into the cache
+        self.assertEqual(cache.get_result("a", ["Q1"]), {"data": {"skills": ["Python"]}})
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+
+class ParseResumeCacheTests(SimpleTestCase):
+    def setUp(self):
+        resume_parser.parse_cache.clear()
+        resume_parser.llm_registry.reset()
+        fd, self.path = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"%PDF-1.4 same bytes")
+
+    def tearDown(self):
+        os.remove(self.path)
+        resume_parser.parse_cache.clear()
+        resume_parser.llm_registry.reset()
+
+    def test_repeat_upload_skips_extraction_and_llm(self):
+        llm = mock.Mock()
+        llm.invoke.return_value.content = '{"data": {"candidate_name": "Jane Doe", "skills": ["Python"]}}'
+
+        extracted = ExtractionResult(text="Jane Doe\nPython", tier="text_layer", pages=1, seconds=0.01)
+        with mock.patch.object(resume_parser, "extract_pdf", return_value=extracted) as extract, \
+             mock.patch.object(resume_parser, "get_available_api_keys", return_value=["test-key"]), \
+             mock.patch.object(resume_parser, "get_llm", return_value=llm):
+            first = resume_parser.parse_resume(self.path)
+            second = resume_parser.parse_resume(self.path)
+
+        self.assertEqual(first, second)
+        # The tier that extracted the file travels with every parse of it, cached or not
+        self.assertEqual(second["extraction_tier"], "text_layer")
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(llm.invoke.call_count, 1)
+        self.assertEqual(resume_parser.parse_cache.stats()["hits"], 1)
+
+
+class ExtractionQualityTests(SimpleTestCase):
+    def test_born_digital_text_is_usable(self):
+        text = "Jane Doe\nSenior Python Developer with Django and AWS experience.\n" * 10
+        self.assertTrue(is_text_usable(text, page_count=1))
+
+    def test_poor_text_escalates(self):
+        self.assertFalse(is_text_usable("Jane Doe\n", page_count=1))
+        self.assertFalse(is_text_usable("(cid:12)(cid:40) Jane " * 50, page_count=1))
+        self.assertFalse(is_text_usable("JaneDoeSeniorPythonDeveloperDjangoAWS " * 20, page_count=1))
+
+
+def make_pdf(page_texts):
+    """Minimal PDF with one line of Helvetica text per page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf, offsets = b"%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return pdf
+
+
+class ExtractionExecutorTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.executor = ProcessPoolExtractionExecutor(2, pages_per_task=1)
+        cls.addClassCleanup(cls.executor.shutdown)
+        cls.pdf = make_pdf([f"Page {number} marker" for number in range(1, 6)])
+
+    def assertInPageOrder(self, text):
+        self.assertEqual([line for line in text.splitlines() if line], [f"Page {n} marker" for n in range(1, 6)])
+
+    def test_page_ranges_are_rejoined_in_order(self):
+        self.assertEqual(count_pdf_pages(self.pdf), 5)
+        self.assertEqual(self.executor.page_ranges(5), [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)])
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(self.pdf)
+        self.addCleanup(os.remove, f.name)
+        with mock.patch.object(self.executor, "_pool", wraps=self.executor._pool) as pool:
+            self.assertInPageOrder(self.executor.extract_pdf(f.name))
+        self.assertEqual(pool.submit.call_count, 5)
+
+    def test_file_objects_are_shared_through_one_path(self):
+        spooled = []
+        with mock.patch.object(self.executor, "_pool", wraps=self.executor._pool) as pool:
+            self.assertInPageOrder(self.executor.extract_pdf(io.BytesIO(self.pdf)))
+        for call in pool.submit.call_args_list:
+            self.assertIsInstance(call.args[1], str)
+            spooled.append(call.args[1])
+        self.assertEqual(len(set(spooled)), 1)
+        self.assertFalse(os.path.exists(spooled[0]))
+
+
+class StubLLM:
+    """Local stand-in for ChatGoogleGenerativeAI: raises `error` or answers with `content`."""
+
+    def __init__(self, content='{"data": {"candidate_name": "Jane Doe"}}', error=None, delay=0):
+        self.content = content
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return mock.Mock(content=self.content)
+
+
+class LLMClientRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.stubs = {
+            ("flash", "dead-key"): StubLLM(error=RuntimeError("429 Resource has been exhausted (quota)")),
+            ("flash", "good-key"): StubLLM(),
+        }
+        self.registry = LLMClientRegistry(
+            client_factory=lambda model_name, api_key: self.stubs[(model_name, api_key)],
+            failure_threshold=2,
+            cooldown_seconds=10,
+            rate_limit_cooldown_seconds=60,
+            clock=lambda: self.now,
+        )
+
+    def test_clients_are_reused(self):
+        self.assertIs(self.registry.get_client("flash", "good-key"), self.registry.get_client("flash", "good-key"))
+
+    def test_rate_limited_key_is_skipped_until_cooldown(self):
+        self.registry.record_failure("flash", "dead-key", RuntimeError("429 quota exceeded"))
+        self.assertEqual(self.registry.available_pairs(["flash"], ["dead-key", "good-key"]), [("flash", "good-key")])
+
+        self.now += 61
+        self.assertTrue(self.registry.is_available("flash", "dead-key"))
+
+    def test_consecutive_failures_open_the_circuit(self):
+        self.registry.record_failure("flash", "good-key", RuntimeError("timeout"))
+        self.assertTrue(self.registry.is_available("flash", "good-key"))
+        self.registry.record_failure("flash", "good-key", RuntimeError("timeout"))
+        self.assertFalse(self.registry.is_available("flash", "good-key"))
+
+    def test_invalid_key_opens_for_every_model(self):
+        self.registry.record_failure("flash", "dead-key", RuntimeError("API key not valid"))
+        self.assertFalse(self.registry.is_available("pro", "dead-key"))
+
+    def test_parse_resume_skips_open_circuits(self):
+        resume_parser.parse_cache.clear()
+        with mock.patch.object(resume_parser, "llm_registry", self.registry), \
+             mock.patch.object(resume_parser, "MODELS_TO_TRY", ["flash"]), \
+             mock.patch.object(resume_parser, "get_available_api_keys", return_value=["dead-key", "good-key"]), \
+             mock.patch.object(resume_parser, "get_resume_text", side_effect=[("a", "Jane Doe"), ("b", "John Doe")]):
+            resume_parser.parse_resume("a.pdf")
+            resume_parser.parse_resume("b.pdf")
+        resume_parser.parse_cache.clear()
+
+        # The 429 on the first parse keeps the second one off the dead key
+        self.assertEqual(self.stubs[("flash", "dead-key")].calls, 1)
+        self.assertEqual(self.stubs[("flash", "good-key")].calls, 2)
+
+
+class HedgedParseTests(SimpleTestCase):
+    def setUp(self):
+        self.stubs = {
+            "slow": StubLLM(content='{"data": {"candidate_name": "Slow"}}', delay=1.0),
+            "fast": StubLLM(content='{"data": {"candidate_name": "Fast"}}'),
+        }
+        registry = LLMClientRegistry(client_factory=lambda model_name, api_key: self.stubs[model_name])
+        self.patches = [
+            mock.patch.object(resume_parser, "llm_registry", registry),
+            mock.patch.object(resume_parser, "MODELS_TO_TRY", ["slow", "fast"]),
+            mock.patch.object(resume_parser, "get_available_api_keys", return_value=["key"]),
+            mock.patch.object(resume_parser, "get_resume_text", return_value=("digest", "Jane Doe")),
+        ]
+        for patch in self.patches:
+            patch.start()
+        resume_parser.parse_cache.clear()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        resume_parser.parse_cache.clear()
+
+    def test_backup_model_wins_after_latency_budget(self):
+        started = time.monotonic()
+        result = resume_parser.parse_resume("a.pdf", hedge_after=0.05)
+
+        self.assertEqual(result["data"]["candidate_name"], "Fast")
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    def test_no_hedging_waits_for_primary(self):
+        self.stubs["slow"].delay = 0.1
+        result = resume_parser.parse_resume("a.pdf")
+
+        self.assertEqual(result["data"]["candidate_name"], "Slow")
+        self.assertEqual(self.stubs["fast"].calls, 0)
+
+
+class BatchParseTests(SimpleTestCase):
+    def setUp(self):
+        self.prompts = []
+
+        def factory(model_name, api_key):
+            return mock.Mock(invoke=self.answer)
+
+        self.patches = [
+            mock.patch.object(resume_parser, "llm_registry", LLMClientRegistry(client_factory=factory)),
+            mock.patch.object(resume_parser, "MODELS_TO_TRY", ["flash"]),
+            mock.patch.object(resume_parser, "get_available_api_keys", return_value=["key"]),
+            mock.patch.object(resume_parser, "get_resume_text",
+                              side_effect=lambda source: (source, f"Resume of {source}")),
+        ]
+        for patch in self.patches:
+            patch.start()
+        resume_parser.parse_cache.clear()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        resume_parser.parse_cache.clear()
+
+    def answer(self, prompt):
+        self.prompts.append(prompt)
+        names = [line for line in prompt.splitlines() if line.startswith("Resume of ")]
+        if "=== RESUME" in prompt:
+            items = [{"index": i, "data": {"candidate_name": n}} for i, n in enumerate(names)]
+            if len(names) > 2:
+                items = items[:1]  # drop results so the batch fails validation
+            return mock.Mock(content=json.dumps({"results": items}))
+        return mock.Mock(content=json.dumps({"data": {"candidate_name": names[0]}}))
+
+    def test_one_request_per_batch(self):
+        results = resume_parser.parse_resume_batch(["a", "b"], batch_size=2)
+
+        self.assertEqual([r["data"]["candidate_name"] for r in results], ["Resume of a", "Resume of b"])
+        self.assertEqual(len(self.prompts), 1)
+
+    def test_invalid_batch_is_split(self):
+        results = resume_parser.parse_resume_batch(["a", "b", "c", "d"], batch_size=4)
+
+        self.assertEqual([r["data"]["candidate_name"] for r in results],
+                         ["Resume of a", "Resume of b", "Resume of c", "Resume of d"])
+        # 1 failed batch of 4, then two valid batches of 2
+        self.assertEqual(len(self.prompts), 3)
+
+
+class PromptCompactionTests(SimpleTestCase):
+    RESUME = (
+        "Jane Doe\njane@test.com | +91 98765 43210\n\n\n"
+        "Summary\n" + "".join(f"Built   service number {i} end to end.\n" for i in range(40)) +
+        "Page 1 of 2\njane@test.com | +91 98765 43210\n"
+        "Work Experience\nBackend Engineer, Acme (2020 - Present)\n"
+        "Skills\nPython, Django, Kafka\n"
+        "Education\nBSc Computer Science\n"
+        "Hobbies\nChess\n"
+    )
+
+    def test_normalize_drops_boilerplate(self):
+        text = normalize_text(self.RESUME)
+
+        self.assertEqual(text.count("jane@test.com"), 1)
+        self.assertNotIn("Page 1 of 2", text)
+        self.assertNotIn("   ", text)
+        self.assertNotIn("\n\n\n", text)
+
+    def test_normalize_keeps_repeated_content_lines(self):
+        jobs = "".join(
+            f"Software Engineer\n{company} (2018 - 2020)\nBuilt payment services in Go and Python.\nOwned the on-call rotation.\n"
+            for company in ("Acme", "Globex", "Initech")
+        )
+        text = normalize_text(
+            "Jane Doe - Backend Engineer\nWork Experience\n" + jobs +
+            "\fJane Doe - Backend Engineer\nEducation\nBSc\n2\nJane Doe - Backend Engineer\nSkills\nGo\n"
+        )
+
+        self.assertEqual(text.count("Software Engineer"), 3)
+        self.assertEqual(text.count("Owned the on-call rotation."), 3)
+        # The running header is repeated at the page breaks only
+        self.assertEqual(text.count("Jane Doe - Backend Engineer"), 1)
+
+    def test_budget_keeps_priority_sections(self):
+        text = compact_resume_text(self.RESUME, token_budget=60)
+
+        for kept in ("Jane Doe", "Acme", "Kafka", "BSc Computer Science"):
+            self.assertIn(kept, text)
+        self.assertNotIn("Chess", text)
+        self.assertLessEqual(len(text), 60 * 4)
+
+    def test_prompt_template_is_compiled_once_per_question_set(self):
+        resume_parser.get_prompt_parts.cache_clear()
+        resume_parser.build_prompt("Jane Doe", ["Q1"])
+        prompt = resume_parser.build_prompt("John Doe", ["Q1"])
+
+        self.assertIn("John Doe", prompt)
+        self.assertIn("- Q1", prompt)
+        self.assertEqual(resume_parser.get_prompt_parts.cache_info().misses, 1)
+
+
+class SkillMatcherTests(SimpleTestCase):
+    def test_synonyms_map_to_canonical_names_in_one_pass(self):
+        matcher = skills.SkillMatcher(skills.DEFAULT_TAXONOMY)
+        text = "Built ReactJS and React Native apps in C++ and c#, deployed on k8s. Node.js, ML."
+
+        self.assertEqual(
+            matcher.find_skills(text),
+            ["React", "React Native", "C++", "C#", "Kubernetes", "Node.js", "Machine Learning"],
+        )
+        self.assertEqual(matcher.find_skills("javascripting html5x"), [])
+
+    def test_matcher_rebuilds_only_when_taxonomy_file_changes(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"Terraform": ["tf"]}, f)
+        self.addCleanup(os.remove, f.name)
+
+        with mock.patch.dict(os.environ, {"RESUME_SKILL_TAXONOMY": f.name}):
+            first = skills.get_skill_matcher()
+            # Within SOURCE_CHECK_SECONDS the file is not even stat'ed
+            with mock.patch("screenai.services.resume_parser.skills.os.stat") as stat:
+                self.assertIs(skills.get_skill_matcher(), first)
+            stat.assert_not_called()
+            self.assertEqual(first.find_skills("tf and Python"), ["Terraform"])
+
+            with open(f.name, "w") as out:
+                json.dump({"Terraform": ["tf"], "Python": []}, out)
+            os.utime(f.name, ns=(time.time_ns(), time.time_ns() + 10**9))
+            self.assertEqual(skills.get_skill_matcher(reload=True).find_skills("tf and Python"), ["Terraform", "Python"])
+
+        self.assertEqual(skills.get_skill_matcher().taxonomy, skills.DEFAULT_TAXONOMY)
+
+    def test_inline_taxonomy_overrides_the_source_until_cleared(self):
+        self.addCleanup(skills.set_skill_taxonomy, None)
+        skills.set_skill_taxonomy({"Kafka": ["apache kafka"]})
+
+        self.assertEqual(skills.get_skill_matcher(reload=True).canonical_name("apache kafka"), "Kafka")
+        self.assertEqual(skills.get_skill_matcher().find_skills("Apache Kafka and Python"), ["Kafka"])
+
+        skills.set_skill_taxonomy(None)
+        self.assertIsNone(skills.get_skill_matcher().canonical_name("apache kafka"))
+        self.assertEqual(skills.get_skill_matcher().taxonomy, skills.DEFAULT_TAXONOMY)
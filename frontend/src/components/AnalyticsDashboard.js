@@ -15,7 +15,7 @@ import {
   Target,
   Award
 } from "lucide-react";
-import { getAnalyticsData } from "../services/api";
+import { getAnalyticsData, subscribeDashboardEvents } from "../services/api";
 
 // Google Data Viz Colors
 const COLORS = ["#4285F4", "#DB4437", "#F4B400", "#0F9D58", "#AB47BC", "#00ACC1"];
@@ -63,8 +63,18 @@ export default function AnalyticsDashboard() {
 
   useEffect(() => {
     fetchAnalytics();
-    const interval = setInterval(fetchAnalytics, 30000); // Poll slower (30s)
-    return () => clearInterval(interval);
+    // Re-fetch when the server pushes a change; fall back to polling without EventSource
+    let refetchTimer = null;
+    const source = subscribeDashboardEvents(() => {
+      clearTimeout(refetchTimer);
+      refetchTimer = setTimeout(fetchAnalytics, 1000); // Coalesce bursts (bulk imports)
+    });
+    const interval = source ? null : setInterval(fetchAnalytics, 30000);
+    return () => {
+      if (source) source.close();
+      clearTimeout(refetchTimer);
+      clearInterval(interval);
+    };
   }, [timeRange]); // Re-fetch on timeRange change
 
   const fetchAnalytics = async () => {
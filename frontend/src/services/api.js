@@ -184,4 +184,47 @@ export const getAnalyticsData = async (params = {}) => {
     return response.data;
 };
 
+// Ranked full-text resume search; each result has the list fields plus `rank` and an HTML `snippet`
+export const searchApplications = async (query, params = {}) => {
+    const queryString = new URLSearchParams({ ...params, q: query }).toString();
+    const response = await api.get(`/applications/search/?${queryString}`);
+    return response.data;
+};
+
+// All applicants of a job scored against its criteria; each result has the list fields plus
+// `score` (out of 100), `breakdown` per criterion and `missing_skills`
+export const rankApplications = async (jobId, params = {}) => {
+    const queryString = new URLSearchParams({ ...params, job: jobId }).toString();
+    const response = await api.get(`/applications/ranking/?${queryString}`);
+    return response.data;
+};
+
+// Candidates closest in meaning to a job's description; params: applicants_only, limit
+export const getSemanticCandidates = async (jobId, params = {}) => {
+    const queryString = new URLSearchParams({ ...params, job: jobId }).toString();
+    const response = await api.get(`/applications/semantic/?${queryString}`);
+    return response.data;
+};
+
+export const getSimilarApplications = async (id, params = {}) => {
+    const queryString = new URLSearchParams(params).toString();
+    const response = await api.get(`/applications/${id}/similar/?${queryString}`);
+    return response.data;
+};
+
+export const DASHBOARD_EVENT_TYPES = ['application.created', 'application.status_changed', 'parse.finished'];
+
+// Server-Sent Events push stream; EventSource cannot set headers, so the token goes in the query.
+// Returns null when the browser has no EventSource or the user is not logged in.
+export const subscribeDashboardEvents = (onEvent) => {
+    const token = localStorage.getItem('token');
+    if (!token || typeof EventSource === 'undefined') return null;
+
+    const source = new EventSource(`${API_BASE_URL}/events/?token=${encodeURIComponent(token)}`);
+    DASHBOARD_EVENT_TYPES.forEach((type) => {
+        source.addEventListener(type, (message) => onEvent(type, JSON.parse(message.data)));
+    });
+    return source;
+};
+
 export default api;